@@ -0,0 +1,104 @@
+"""实体解码基准: 普通 dataclass + data_class(**item) vs __slots__ dataclass + 生成的解码函数
+
+运行: python -m benchmarks.bench_entity_decode [记录数]
+"""
+import dataclasses
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from entity.api_asset.api_asset import ApiAssetRecord
+from utils.decorator_tools.decorator_utils import build_decoder
+
+# 与改造前一致的普通 dataclass(无 __slots__, 不含服务端新增字段)
+LegacyApiAssetRecord = dataclasses.make_dataclass(
+    "LegacyApiAssetRecord",
+    [
+        (f.name, f.type)
+        for f in dataclasses.fields(ApiAssetRecord)
+        if f.name not in ("risk_count", "vul_count")
+    ],
+)
+
+
+def make_page(count: int, with_unknown_keys: bool) -> List[Dict[str, Any]]:
+    page = []
+    for i in range(count):
+        item = {
+            "id": i,
+            "http_authority": "192.192.101.220:20010",
+            "http_path": f"/data_label_test/Srhida{i:06d}",
+            "http_request_method_id": 2,
+            "api_protocol_id": 1,
+            "merger_rule_id": 0,
+            "offline_sign": 0,
+            "version": "",
+            "app_name": "data_label",
+            "app_id": 1,
+            "address": "192.192.101.220",
+            "app_icon_file_path": "",
+            "call_count": 5,
+            "today_call_count": 5,
+            "risk_level_id": 0,
+            "vul_level_id": 0,
+            "api_sens_level_id": 1,
+            "created_at": "2025-01-01 00:00:00",
+            "latest_access_time": "2025-01-01 00:00:00",
+            "src_ip_config_ids": [],
+            "api_labels": [],
+            "asset_label_names": [],
+            "data_labels": None,
+            "request_data_assets": [],
+            "response_data_assets": [],
+            "asset_source_name": "",
+            "data_source_type": 0,
+            "active_id": 0,
+        }
+        if with_unknown_keys:
+            item.update({"risk_count": 0, "vul_count": 0, "new_server_field": "x"})
+        page.append(item)
+    return page
+
+
+def measure(decode_page: Callable[[List[Dict[str, Any]]], list], page: List[Dict[str, Any]], rounds: int = 3):
+    elapsed = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        records = decode_page(page)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del records
+
+    tracemalloc.start()
+    records = decode_page(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, records
+
+
+def main(count: int = 100_000):
+    _, decode_many = build_decoder(ApiAssetRecord)
+    page = make_page(count, with_unknown_keys=False)
+
+    legacy_time, legacy_peak, _ = measure(
+        lambda items: [LegacyApiAssetRecord(**item) for item in items if item], page
+    )
+    slots_time, slots_peak, _ = measure(decode_many, page)
+
+    print(f"记录数: {count}")
+    print(f"legacy dataclass(**item): {legacy_time * 1000:8.1f} ms | 峰值内存 {legacy_peak / 1024 / 1024:7.1f} MiB")
+    print(f"slots + decode_many     : {slots_time * 1000:8.1f} ms | 峰值内存 {slots_peak / 1024 / 1024:7.1f} MiB")
+    print(f"耗时 x{legacy_time / slots_time:.2f} | 内存 x{legacy_peak / slots_peak:.2f}")
+
+    # 服务端新增字段时旧实现直接抛错, 新实现忽略未知字段
+    page = make_page(count, with_unknown_keys=True)
+    try:
+        [LegacyApiAssetRecord(**item) for item in page[:1]]
+    except TypeError as e:
+        print(f"legacy 遇到未知字段: {e}")
+    tolerant_time, _, records = measure(decode_many, page)
+    print(f"slots + decode_many(含未知字段): {tolerant_time * 1000:.1f} ms, 解码 {len(records)} 条")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
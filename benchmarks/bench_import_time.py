@@ -0,0 +1,92 @@
+"""导入耗时基准: 用 python -X importtime 统计测试模块与常用工具模块的导入耗时, 以及 pytest --collect-only 的总耗时
+
+每个模块在独立的子进程中导入, 取多次运行的中位数; 同时列出每个模块导入链中耗时最多的第三方包,
+便于发现被无意间提前导入的重型依赖(openpyxl、ddddocr、asyncssh、numpy 等)
+
+运行: python -m benchmarks.bench_import_time [重复次数] [结果追加写入的 jsonl 路径]
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from utils.file_tools.file_utils import FileUtils
+
+MODULES = (
+    "testcases.test_data_label.test_data_label",
+    "conftest",
+    "utils.sr_tools.apione_client",
+    "utils.report_tools.history_store",
+    "utils.ssh_tools.ssh_connect",
+    "utils.data_tools.label_dataset",
+)
+HEAVY_PACKAGES = ("openpyxl", "ddddocr", "onnxruntime", "cv2", "asyncssh", "Crypto", "numpy", "pandas")
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_time(module: str, root: str) -> Tuple[float, Dict[str, float]]:
+    """导入 module 的累计耗时(秒), 以及导入链中各顶层包的累计耗时"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败: {result.stderr[-500:]}")
+    total, packages = 0.0, {}
+    # importtime 先输出子模块再输出父模块, 倒序后按缩进维护祖先栈; 祖先属于同一个包的不重复计入
+    ancestors: List[str] = []
+    for line in reversed(result.stderr.splitlines()):
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)) / 1e6, len(match.group(3)) // 2, match.group(4)
+        del ancestors[depth:]
+        top = name.split(".")[0]
+        if name == module:
+            total = cumulative
+        elif top in HEAVY_PACKAGES and all(parent.split(".")[0] != top for parent in ancestors):
+            packages[top] = packages.get(top, 0.0) + cumulative
+        ancestors.append(name)
+    return total, packages
+
+
+def collect_time(root: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "testcases/test_data_label"],
+        cwd=root,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main(repeat: int = 5, output: str = ""):
+    root = os.path.dirname(FileUtils.find_file_from_root("pytest.ini"))
+    results: List[Dict] = []
+    for module in MODULES:
+        runs = [import_time(module, root) for _ in range(repeat)]
+        total = statistics.median(run[0] for run in runs)
+        heavy = runs[-1][1]
+        heavy_text = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in heavy.items()) or "-"
+        print(f"{module}: {total * 1000:.0f}ms | 重型依赖: {heavy_text}")
+        results.append({"module": module, "seconds": total, "heavy": heavy})
+
+    collect = statistics.median(collect_time(root) for _ in range(repeat))
+    print(f"pytest --collect-only testcases/test_data_label: {collect * 1000:.0f}ms")
+
+    if output:
+        with open(output, "a", encoding="utf-8") as f:
+            record = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "collect": collect, "modules": results}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5, sys.argv[2] if len(sys.argv) > 2 else "")
@@ -0,0 +1,46 @@
+"""API 标签对比基准: 用 base_data_label.json 的全部样本构造识别结果, 统计对比耗时
+
+运行: python -m benchmarks.bench_label_compare [标签倍数]
+"""
+import json
+import sys
+import time
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.file_tools.file_utils import FileUtils
+from utils.sr_tools.label_compare import compare_api_labels
+
+
+def main(multiplier: int = 10):
+    file_path = FileUtils.find_file_from_root("data/data_label/base_data_label.json")
+    with open(file_path, "r", encoding="utf-8") as f:
+        all_data_labels = json.load(f)
+
+    pairs = []
+    for _ in range(multiplier):
+        for data_label_id, data_label in all_data_labels.items():
+            body = data_label.get("body") or []
+            # 识别结果: 丢掉最后一条样本, 并在同位置误识别一个其他标签
+            label_detail = ApiAssetLabelDetail(
+                request={
+                    "start_line": None,
+                    "headers": None,
+                    "body": {
+                        data_label["name"]: {"count": len(body) - 1, "contents": list(reversed(body[:-1]))},
+                        "其他标签": {"count": 1, "contents": body[-1:]},
+                    },
+                },
+                response={"start_line": None, "headers": None, "body": None},
+                storage_state=1,
+            )
+            pairs.append(({"id": data_label_id, **data_label}, label_detail))
+
+    start = time.perf_counter()
+    results = compare_api_labels(pairs)
+    elapsed = time.perf_counter() - start
+    samples = sum(len(data_label.get("body") or []) for data_label, _ in pairs)
+    print(f"标签数: {len(results)} | 样本数: {samples} | 对比耗时 {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
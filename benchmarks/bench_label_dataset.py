@@ -0,0 +1,61 @@
+"""数据标签加载基准: 每次完整 json.load 两个源文件再按标准筛选 vs LabelDataset 二进制缓存按标准加载
+
+运行: python -m benchmarks.bench_label_dataset
+"""
+import json
+import os
+import tempfile
+import time
+
+from utils.data_tools.label_dataset import LabelDataset
+from utils.file_tools.file_utils import FileUtils
+
+BASE_PATH = FileUtils.find_file_from_root("data/data_label/base_data_label.json")
+REFER_PATH = FileUtils.find_file_from_root("data/data_label/specification_refer.json")
+
+
+def legacy_spec_data_labels(specification_name):
+    with open(REFER_PATH, "r", encoding="utf-8") as f:
+        refers = json.load(f)[specification_name]
+    with open(BASE_PATH, "r", encoding="utf-8") as f:
+        base_data_labels = json.load(f)
+    return [
+        {
+            "id": refer["id"],
+            "name": refer["name"],
+            "scope": base_data_labels[refer["id"]].get("scope", -1),
+            "body": base_data_labels[refer["id"]].get("body", []),
+            "file_data": base_data_labels[refer["id"]].get("file_data", []),
+        }
+        for refer in refers
+        if refer["id"] in base_data_labels
+    ]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, "label_dataset.bin")
+        start = time.perf_counter()
+        LabelDataset(BASE_PATH, REFER_PATH, cache_path).close()
+        print(f"首次编译: {(time.perf_counter() - start) * 1000:.1f}ms, 缓存 {os.path.getsize(cache_path) / 2**20:.2f} MB")
+
+        start = time.perf_counter()
+        dataset = LabelDataset(BASE_PATH, REFER_PATH, cache_path)
+        print(f"打开缓存: {(time.perf_counter() - start) * 1000:.1f}ms")
+        for specification_name in dataset.spec_names:
+            start = time.perf_counter()
+            legacy = legacy_spec_data_labels(specification_name)
+            legacy_elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            cached = dataset.spec_data_labels(specification_name)
+            cached_elapsed = time.perf_counter() - start
+            assert cached == legacy
+            print(
+                f"{specification_name[:24]}: {len(cached)} 个标签 | "
+                f"json.load {legacy_elapsed * 1000:.1f}ms | 缓存 {cached_elapsed * 1000:.1f}ms"
+            )
+        dataset.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""标签内容解析基准: 逐条正则的 convert_to_dict_list(改造前实现) vs label_parser.parse_contents
+
+使用 data/data_label/base_data_label.json 中的 body 样本模拟 unmask 返回的 contents
+
+运行: python -m benchmarks.bench_label_parser [重复轮数]
+"""
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+from utils.file_tools.file_utils import FileUtils
+from utils.sr_tools.label_parser import parse_content, parse_contents
+
+
+def legacy_convert_to_dict_list(contents: List[str]) -> List[Dict[str, Any]]:
+    """改造前 ApioneUtils.convert_to_dict_list 的实现"""
+    result = []
+    kv_pattern = re.compile(r'^\s*([\w\u4e00-\u9fff_]+)"?\s*:\s*"?\s*(.+?)\s*"?$')
+    for item in contents:
+        item = item.strip()
+        if (item.startswith("'") and item.endswith("'")) or (item.startswith('"') and item.endswith('"')):
+            item = item[1:-1]
+        if not item:
+            continue
+        if item.count(':') > 1:
+            result.append(item)
+            continue
+        match = kv_pattern.match(item)
+        if match:
+            key, value = match.groups()
+            result.append({key: value})
+        else:
+            result.append(item)
+    return result
+
+
+def load_label_contents() -> List[List[str]]:
+    """把每个标签的 body 样本还原为服务端 contents 字符串列表"""
+    file_path = FileUtils.find_file_from_root("data/data_label/base_data_label.json")
+    with open(file_path, "r", encoding="utf-8") as f:
+        all_data_labels = json.load(f)
+    label_contents = []
+    for data_label in all_data_labels.values():
+        contents = []
+        for sample in data_label.get("body") or []:
+            if isinstance(sample, dict):
+                contents.extend(f'"{k}":"{v}"' for k, v in sample.items())
+            else:
+                contents.append(f'"{sample}"')
+        label_contents.append(contents)
+    return label_contents
+
+
+def bench(convert, label_contents: List[List[str]], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # 每个标签 request/response 各解析一次
+        for contents in label_contents:
+            convert(contents)
+            convert(contents)
+    return time.perf_counter() - start
+
+
+def main(rounds: int = 20):
+    label_contents = load_label_contents()
+    total = sum(len(c) for c in label_contents) * 2 * rounds
+
+    for contents in label_contents:
+        assert parse_contents(contents) == legacy_convert_to_dict_list(contents)
+
+    parse_content.cache_clear()
+    legacy_time = bench(legacy_convert_to_dict_list, label_contents, rounds)
+    parsed_time = bench(parse_contents, label_contents, rounds)
+
+    print(f"标签数: {len(label_contents)} | 解析条目: {total}")
+    print(f"legacy convert_to_dict_list: {legacy_time * 1000:8.1f} ms")
+    print(f"parse_contents(缓存)       : {parsed_time * 1000:8.1f} ms | {parse_content.cache_info()}")
+    print(f"加速 x{legacy_time / parsed_time:.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,87 @@
+"""OOXML 测试文件生成基准: python-docx / pandas+openpyxl / python-pptx(改造前实现) vs ooxml_writer 模板
+
+使用 data/data_label/base_data_label.json 中的 file_data 作为正文, 每个标签各生成一个 docx / xlsx / pptx
+
+运行: python -m benchmarks.bench_ooxml_writer [标签数]
+改造前实现依赖 dev 分组与 frames 可选依赖: uv sync --group dev --extra frames
+"""
+import io
+import json
+import sys
+import time
+from typing import Callable, List
+
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_generator import build_record_text
+from utils.file_tools.ooxml_writer import build_docx, build_pptx, build_xlsx
+
+
+def legacy_docx(record_text: str) -> bytes:
+    from docx import Document
+
+    buffer = io.BytesIO()
+    document = Document()
+    document.add_paragraph(record_text)
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_xlsx(record_text: str) -> bytes:
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    pd.DataFrame([{"测试数据": record_text}]).to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
+
+
+def legacy_pptx(record_text: str) -> bytes:
+    from pptx import Presentation
+
+    buffer = io.BytesIO()
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.placeholders[1].text = record_text
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def template_xlsx(record_text: str) -> bytes:
+    return build_xlsx([["测试数据"], [record_text]])
+
+
+def load_record_texts(limit: int) -> List[str]:
+    file_path = FileUtils.find_file_from_root("data/data_label/base_data_label.json")
+    with open(file_path, "r", encoding="utf-8") as f:
+        all_data_labels = json.load(f)
+    texts = [build_record_text(d.get("file_data") or []) for d in all_data_labels.values()]
+    return texts[:limit]
+
+
+def bench(build: Callable[[str], bytes], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        build(text)
+    return time.perf_counter() - start
+
+
+def main(limit: int = 100):
+    texts = load_record_texts(limit)
+    print(f"文件数(每种格式): {len(texts)}")
+    for name, legacy, template in (
+        ("docx", legacy_docx, build_docx),
+        ("xlsx", legacy_xlsx, template_xlsx),
+        ("pptx", legacy_pptx, build_pptx),
+    ):
+        # 预热: 导入依赖、加载模板
+        legacy(texts[0])
+        template(texts[0])
+        legacy_time = bench(legacy, texts)
+        template_time = bench(template, texts)
+        print(
+            f"{name}: 改造前 {legacy_time / len(texts) * 1000:7.2f} ms/个 | "
+            f"模板 {template_time / len(texts) * 1000:7.3f} ms/个 | 加速 x{legacy_time / template_time:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
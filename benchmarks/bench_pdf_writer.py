@@ -0,0 +1,92 @@
+"""PDF 测试文件生成基准: fpdf2 每个文件 add_font(改造前实现) vs fpdf2 进程内缓存字宽 vs pdf_writer 进程内缓存字体
+
+使用 data/data_label/base_data_label.json 中全部标签的 file_data 作为正文;
+fpdf2 每个文件耗时数百毫秒, 默认只抽样前 20 个标签估算全量耗时
+
+运行: python -m benchmarks.bench_pdf_writer [字体路径] [改造前抽样数]
+"""
+import copy
+import functools
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.bench_ooxml_writer import load_record_texts
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_generator import PDF_FONT_PATH
+from utils.file_tools.pdf_writer import build_pdf, load_font
+
+
+def legacy_pdf(record_text: str, font_path: str) -> bytes:
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.add_font("NotoSansSC", "", font_path)
+    pdf.set_font("NotoSansSC", size=12)
+    pdf.multi_cell(0, 10, text=record_text)
+    return bytes(pdf.output())
+
+
+@functools.lru_cache(maxsize=None)
+def _fpdf_font(font_path: str):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_font("NotoSansSC", "", font_path)
+    return pdf.fonts["notosanssc"], Path(font_path).read_bytes()
+
+
+def cached_fpdf(record_text: str, font_path: str) -> bytes:
+    """fpdf2 复用已解析的字宽与 cmap; 子集化会原地修改字体, 每个文件仍需重新载入字体"""
+    from fontTools import ttLib
+    from fpdf import FPDF
+    from fpdf.fonts import SubsetMap
+
+    cached, font_bytes = _fpdf_font(font_path)
+    font = copy.copy(cached)
+    font.ttfont = ttLib.TTFont(io.BytesIO(font_bytes), recalcTimestamp=False, lazy=True)
+    font.subset = SubsetMap(font)
+    pdf = FPDF()
+    pdf.fonts[font.fontkey] = font
+    pdf.add_page()
+    pdf.set_font("NotoSansSC", size=12)
+    pdf.multi_cell(0, 10, text=record_text)
+    return bytes(pdf.output())
+
+
+def bench(build: Callable[[str, str], bytes], texts: List[str], font_path: str) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        build(text, font_path)
+    return time.perf_counter() - start
+
+
+def main(font_path: str, legacy_samples: int = 20):
+    texts = load_record_texts(sys.maxsize)
+    print(f"标签数: {len(texts)}, 字体: {font_path}")
+
+    start = time.perf_counter()
+    load_font(font_path)
+    print(f"字体解析(每进程一次): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    samples = min(legacy_samples, len(texts))
+    legacy_time = bench(legacy_pdf, texts[:legacy_samples], font_path) / samples
+    _fpdf_font(font_path)
+    fpdf_cached_time = bench(cached_fpdf, texts[:legacy_samples], font_path) / samples
+    cached_time = bench(build_pdf, texts, font_path) / len(texts)
+    print(
+        f"pdf: 改造前 {legacy_time * 1000:7.2f} ms/个 (全量约 {legacy_time * len(texts):.1f}s) | "
+        f"fpdf2 缓存字宽 {fpdf_cached_time * 1000:7.2f} ms/个 (全量约 {fpdf_cached_time * len(texts):.1f}s) | "
+        f"缓存字体 {cached_time * 1000:7.3f} ms/个 (全量 {cached_time * len(texts):.2f}s) | "
+        f"加速 x{legacy_time / cached_time:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else FileUtils.find_file_from_root(PDF_FONT_PATH),
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
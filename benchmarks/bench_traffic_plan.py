@@ -0,0 +1,52 @@
+"""API 测试流量计划基准: 原来预先展开的请求字典列表 vs TrafficPlan 惰性生成
+
+使用 data/data_label/base_data_label.json 中全部标签, 按重复次数放大到百万级请求, 对比峰值内存与生成速度
+
+运行: python -m benchmarks.bench_traffic_plan [body 重复次数]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from utils.file_tools.file_utils import FileUtils
+from utils.sr_tools.traffic_plan import TrafficPlan
+
+
+def legacy_requests(data_labels, repeat):
+    requests = []
+    for data_label in data_labels:
+        for _ in range(repeat):
+            requests.append(
+                {
+                    "method": "POST",
+                    "url": "/data_label_test/" + data_label["id"],
+                    "data": json.dumps(data_label["body"], ensure_ascii=False).encode("utf-8"),
+                }
+            )
+    return requests
+
+
+def measure(name, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {count} 个请求, 耗时 {elapsed:.2f}s, 峰值内存 {peak / 2**20:.1f} MB")
+
+
+def main(repeat: int = 500):
+    file_path = FileUtils.find_file_from_root("data/data_label/base_data_label.json")
+    with open(file_path, "r", encoding="utf-8") as f:
+        data_labels = [{"id": key, **value} for key, value in json.load(f).items()]
+
+    measure("预先展开(仅 body)", lambda: len(legacy_requests(data_labels, repeat)))
+    measure("TrafficPlan(仅 body)", lambda: sum(1 for _ in TrafficPlan(data_labels, mix={"body": repeat})))
+    mix = {"query": repeat // 5, "header": repeat // 5, "body": repeat}
+    measure("TrafficPlan(query/header/body)", lambda: sum(1 for _ in TrafficPlan(data_labels, mix=mix)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
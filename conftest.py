@@ -3,9 +3,13 @@ import pytest
 import pytest_asyncio
 
 from utils.auth_tools.auth_utils import AuthUtils
+from utils.file_tools.file_utils import FileUtils
 from utils.log_tools.logger_utils import ProjectLogger
 from utils.notice_tools.webcom_utils import WeComRobot
+from utils.report_tools.history_store import RunHistoryStore
 from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.apione_client import ApioneClient
+from utils.sr_tools.data_label_suite import DEFAULT_PROXY_APPS
 from utils.ssh_tools.ssh_connect import AsyncSSHClient
 from utils.yaml_tools.yaml_utils import YAMLUtil
 from utils.log_tools.logger_utils import get_logger
@@ -61,6 +65,27 @@ async def https_req(sc_config):
         log.success("测试结束，释放 https_req fixture")
         await client.close()
 
+@pytest_asyncio.fixture(scope='session')
+async def apione_client(https_req):
+    """返回基于 https_req 的 Apione 客户端, 会话内缓存已解析的资产ID与标签详情"""
+    client = ApioneClient(https_req)
+    yield client
+    log.info(f"ApioneClient 缓存命中情况: {client.cache_stats()}")
+
+
+@pytest.fixture(scope='session')
+def run_history():
+    """会话级运行历史, 返回 (store, run_id), 会话结束时落盘"""
+    store = RunHistoryStore(
+        FileUtils.find_file_from_root(
+            "files/data_label_file/history/run_history.db", create_if_not_exists=True
+        )
+    )
+    run_id = store.start_run()
+    yield store, run_id
+    store.finish_run(run_id)
+    store.close()
+
 @pytest_asyncio.fixture(scope='session')
 async def sc_ssh_client(sc_config):
     """返回一个配置好的 总控ssh 客户端"""
@@ -98,9 +123,8 @@ def load_config():
 
 @pytest.fixture(scope='session')
 def proxy_apps():
-    return {
-        "data_label": ("192.192.101.220:20010", "192.192.101.220:20011")
-    }
+    return dict(DEFAULT_PROXY_APPS)
+
 @pytest.fixture(scope='session', autouse=True)
 def sc_config(load_config):
     return load_config.get('sc', {})
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ApiAssetRecord:
+    """API 资产类"""
     id: int
     http_authority: str
     http_path: str
@@ -31,12 +32,13 @@ class ApiAssetRecord:
     asset_source_name: str
     data_source_type: int
     active_id: int
-    # risk_count: int
-    # vul_count: int
-    
+    risk_count: Optional[int] = None
+    vul_count: Optional[int] = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ApiAssetLabelDetail:
+    """API 资产 request/response 数据标签详情"""
     request: Dict[str, Any]
     response: Dict[str, Any]
     storage_state: int
@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class FileAssetRecord:
     """文件资产类"""
     id: int
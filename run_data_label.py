@@ -0,0 +1,275 @@
+"""数据标签测试命令行入口, 不经过 pytest 收集与 fixture, 直接按阶段执行 DataLabelSuite
+
+运行:
+    python run_data_label.py --list-specs
+    python run_data_label.py --specs GB/T35273 --concurrency 32 --rate 200 --skip notify --format xlsx md
+    python run_data_label.py fuzz --total 100000 --rate 500
+
+启动时只导入 argparse, 较重的依赖(httpx、loguru、asyncssh、openpyxl 等)在解析参数之后按阶段导入
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 与 utils.sr_tools.data_label_suite 保持一致, 在此重复以免 --help 时导入整个测试流程
+PHASES = ("reset", "traffic", "verify", "export", "notify")
+OUTPUT_FORMATS = ("xlsx", "md", "json")
+PLACEMENTS = ("query", "header", "body")
+HISTORY_PATH = "files/data_label_file/history/run_history.db"
+BASE_DATA_LABEL_PATH = "data/data_label/base_data_label.json"
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """解析 query=2,header=2,body=5 形式的流量放置比例"""
+    mix = {}
+    for item in value.split(","):
+        placement, sep, weight = item.partition("=")
+        placement = placement.strip()
+        if not sep or placement not in PLACEMENTS:
+            raise argparse.ArgumentTypeError(f"放置比例格式应为 query=2,header=2,body=5: {value}")
+        try:
+            mix[placement] = int(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"重复次数须为整数: {item}") from None
+        if mix[placement] < 0:
+            raise argparse.ArgumentTypeError(f"重复次数不能为负数: {item}")
+    return mix
+
+
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"须大于 0: {value}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"须大于 0: {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="数据标签测试: reset -> traffic -> verify -> export -> notify")
+    parser.add_argument("--specs", nargs="+", metavar="SPEC", help="按名称或 ID 选择标准, 默认全部")
+    parser.add_argument("--list-specs", action="store_true", help="列出全部标准后退出")
+    parser.add_argument("--concurrency", type=positive_int, default=5, help="API 流量发送并发数 (默认 5)")
+    parser.add_argument("--rate", type=positive_float, help="API 流量目标速率, 请求/秒, 默认不限速")
+    parser.add_argument("--verify-concurrency", type=positive_int, default=8, help="识别结果查询并发数 (默认 8)")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        help="API 流量放置比例, 默认 body=5; 如 header=2,body=5, 开启 query 前须确认服务端识别的是解码后的查询串",
+    )
+    parser.add_argument("--skip", nargs="+", choices=PHASES, default=[], metavar="PHASE", help=f"跳过的阶段: {PHASES}")
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        nargs="+",
+        choices=OUTPUT_FORMATS,
+        default=["xlsx"],
+        metavar="FORMAT",
+        help=f"export 阶段的输出格式: {OUTPUT_FORMATS} (默认 xlsx)",
+    )
+    parser.add_argument("--output-dir", help="export 阶段的输出目录, 默认 files/data_label_file/test_result")
+    parser.add_argument(
+        "--no-archive",
+        dest="archive",
+        action="store_false",
+        help="上传时不把测试文件保存到本地; 之后无法 --skip traffic 重新校验, notify 也不包含测试数据",
+    )
+    parser.add_argument("--config", default="./common/config.yaml", help="配置文件 (默认 ./common/config.yaml)")
+    parser.add_argument("--proxy-api", help="API 流量代理地址 ip:port, 默认 DEFAULT_PROXY_APPS")
+    parser.add_argument("--proxy-file", help="文件上传代理地址 ip:port, 默认 DEFAULT_PROXY_APPS")
+    parser.add_argument("--log-level", default="INFO", help="控制台日志级别 (默认 INFO)")
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    fuzz = subparsers.add_parser(
+        "fuzz", help="负样本模糊测试: 发送近似样本与无标签流量, 统计误识别; 运行期间关闭资产自动合并"
+    )
+    fuzz.add_argument("--total", type=positive_int, default=100_000, help="发送的请求总数 (默认 100000)")
+    fuzz.add_argument(
+        "--rate",
+        dest="fuzz_rate",
+        metavar="RATE",
+        type=positive_float,
+        default=500.0,
+        help="目标速率, 请求/秒 (默认 500)",
+    )
+    fuzz.add_argument(
+        "--concurrency",
+        dest="fuzz_concurrency",
+        metavar="CONCURRENCY",
+        type=positive_int,
+        default=64,
+        help="发送并发数 (默认 64)",
+    )
+    fuzz.add_argument("--seed", type=int, default=0, help="取值与变异的随机种子 (默认 0)")
+    fuzz.add_argument("--settle", type=float, default=10.0, help="发送结束后等待资产入库的秒数 (默认 10)")
+    return parser
+
+
+def select_specifications(
+    specifications: Sequence[Tuple[str, Any]], selected: Optional[Sequence[str]]
+) -> List[Tuple[str, Any]]:
+    """按名称或 ID 选择标准, 保持命令行中的顺序; 未指定时返回全部"""
+    if not selected:
+        return list(specifications)
+    chosen = []
+    for spec in selected:
+        match = [item for item in specifications if spec in (item[0], str(item[1]))]
+        if not match:
+            raise ValueError(f"标准不存在: {spec}")
+        chosen.extend(item for item in match if item not in chosen)
+    return chosen
+
+
+async def run(args: argparse.Namespace, specifications: List[Tuple[str, Any]]) -> int:
+    from utils.data_tools.label_dataset import LabelDataset
+    from utils.file_tools.file_utils import FileUtils
+    from utils.log_tools.logger_utils import get_logger
+    from utils.report_tools.history_store import RunHistoryStore
+    from utils.request_tools.async_http_client import AsyncHttpClient
+    from utils.sr_tools.apione_client import ApioneClient
+    from utils.sr_tools.data_label_suite import DEFAULT_PROXY_APPS, DataLabelSuite, notify
+    from utils.yaml_tools.yaml_utils import YAMLUtil
+
+    log = get_logger(__name__)
+    config = YAMLUtil.read_yaml(args.config)
+    sc_config = config.get("sc", {})
+    api_app, file_app = DEFAULT_PROXY_APPS["data_label"]
+    proxy_apps = {"data_label": (args.proxy_api or api_app, args.proxy_file or file_app)}
+
+    apione = await ApioneClient.connect(sc_config["sc_ip"], sc_config["username"], sc_config["password"])
+    http = AsyncHttpClient()
+    ssh = robot = None
+    history = RunHistoryStore(FileUtils.find_file_from_root(HISTORY_PATH, create_if_not_exists=True))
+    run_id = history.start_run(note=" ".join(sys.argv[1:]) or None)
+    summaries = []
+    failed = []
+    try:
+        if "reset" not in args.skip:
+            from utils.ssh_tools.ssh_connect import AsyncSSHClient
+
+            ssh = AsyncSSHClient(
+                host=sc_config["sc_ip"], username=sc_config["ssh_username"], password=sc_config["ssh_password"]
+            )
+            await ssh.connect()
+
+        suite = DataLabelSuite(
+            apione,
+            http,
+            ssh=ssh,
+            history=history,
+            run_id=run_id,
+            proxy_apps=proxy_apps,
+            traffic_mix=args.mix,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            verify_concurrency=args.verify_concurrency,
+            output_formats=args.formats,
+            result_dir=args.output_dir,
+            archive=args.archive,
+        )
+        with LabelDataset.default() as dataset:
+            for specification_name, specification_id in specifications:
+                log.info(f"开始测试标准 {specification_name} (id={specification_id})")
+                try:
+                    result = await suite.run_specification(
+                        specification_name,
+                        specification_id,
+                        dataset.spec_data_labels(specification_name),
+                        skip=args.skip,
+                    )
+                except Exception:
+                    # 与 pytest 参数化一致, 单个标准失败不影响后续标准
+                    log.exception(f"标准 {specification_name} 测试失败")
+                    failed.append(specification_name)
+                    continue
+                if result.summary is not None:
+                    summaries.append(result.summary)
+
+        if "notify" not in args.skip and summaries:
+            from utils.notice_tools.webcom_utils import WeComRobot
+
+            robot = WeComRobot(config.get("notice", {})["webhook_key"])
+            await notify(robot, http, summaries)
+    finally:
+        history.finish_run(run_id)
+        history.close()
+        for client in (robot, ssh, http, apione):
+            if client is not None:
+                await client.close()
+        log.info(f"ApioneClient 缓存命中情况: {apione.cache_stats()}")
+
+    log.info(f"完成 {len(specifications) - len(failed)}/{len(specifications)} 个标准, 运行 ID {run_id}")
+    if failed:
+        log.error(f"失败的标准: {failed}")
+        return 1
+    return 0
+
+
+async def run_fuzz(args: argparse.Namespace) -> int:
+    import json
+
+    from utils.data_tools.pii_generator import PiiGenerator
+    from utils.file_tools.file_utils import FileUtils
+    from utils.request_tools.async_http_client import AsyncHttpClient
+    from utils.sr_tools.apione_client import ApioneClient
+    from utils.sr_tools.data_label_suite import DEFAULT_PROXY_APPS
+    from utils.sr_tools.negative_fuzzer import NegativePayloadFactory, run_negative_fuzz
+    from utils.yaml_tools.yaml_utils import YAMLUtil
+
+    sc_config = YAMLUtil.read_yaml(args.config).get("sc", {})
+    api_app = args.proxy_api or DEFAULT_PROXY_APPS["data_label"][0]
+    with open(FileUtils.find_file_from_root(BASE_DATA_LABEL_PATH), "r", encoding="utf-8") as f:
+        pii = PiiGenerator.from_base_data_labels(json.load(f), seed=args.seed)
+    factory = NegativePayloadFactory(pii, seed=args.seed)
+
+    apione = await ApioneClient.connect(sc_config["sc_ip"], sc_config["username"], sc_config["password"])
+    http = AsyncHttpClient(f"http://{api_app}")
+    try:
+        await run_negative_fuzz(
+            apione,
+            http,
+            factory,
+            args.total,
+            rate=args.fuzz_rate,
+            concurrency=args.fuzz_concurrency,
+            settle=args.settle,
+        )
+    finally:
+        for client in (http, apione):
+            await client.close()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from utils.log_tools.logger_utils import ProjectLogger
+
+    ProjectLogger(log_level=args.log_level)
+    if args.command == "fuzz":
+        return asyncio.run(run_fuzz(args))
+
+    from utils.data_tools.label_dataset import LabelDataset
+
+    with LabelDataset.default(load_records=False) as dataset:
+        specifications = dataset.specifications
+    if args.list_specs:
+        for specification_name, specification_id in specifications:
+            print(f"{specification_id}\t{specification_name}")
+        return 0
+    try:
+        specifications = select_specifications(specifications, args.specs)
+    except ValueError as e:
+        build_parser().error(str(e))
+    return asyncio.run(run(args, specifications))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from utils.data_tools.label_dataset import LabelDataset
+from utils.file_tools.file_utils import FileUtils
+
+BASE_DATA_LABELS = {
+    "Srhida000001": {"name": "姓名", "scope": 1, "body": [{"name": "李娜"}], "file_data": ["姓名:李娜"]},
+    "Srhida000002": {"name": "手机号", "body": [{"phone": "15112345678"}]},
+    "Srhida000003": {"name": "地址", "scope": 2, "file_data": ["北京市朝阳区"]},
+}
+DATA_LABEL_REFERS = {
+    "标准A": [
+        {"id": "Srhida000003", "name": "详细地址"},
+        {"id": "Srhida000001", "name": "姓名"},
+        {"id": "Srhida999999", "name": "不存在"},
+    ],
+    "标准B": [{"id": "Srhida000002", "name": "手机号码"}],
+}
+
+
+def write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    base_path, refer_path = tmp_path / "base.json", tmp_path / "refer.json"
+    write_json(base_path, BASE_DATA_LABELS)
+    write_json(refer_path, DATA_LABEL_REFERS)
+    return str(base_path), str(refer_path), str(tmp_path / "cache" / "label_dataset.bin")
+
+
+class TestLabelDataset:
+    """数据标签数据集缓存: 按标准加载、缓存键与失效"""
+
+    def test_spec_data_labels(self, sources):
+        with LabelDataset(*sources) as dataset:
+            assert dataset.spec_names == ["标准A", "标准B"]
+            assert dataset.spec_data_labels("标准A") == [
+                {"id": "Srhida000003", "name": "详细地址", "scope": 2, "body": [], "file_data": ["北京市朝阳区"]},
+                {"id": "Srhida000001", "name": "姓名", "scope": 1, "body": [{"name": "李娜"}], "file_data": ["姓名:李娜"]},
+            ]
+            assert dataset.spec_data_labels("标准B")[0]["scope"] == -1
+            # 每次返回独立副本
+            dataset.spec_data_labels("标准B")[0]["body"].clear()
+            assert dataset.data_label("Srhida000002")["body"] == [{"phone": "15112345678"}]
+            with pytest.raises(ValueError):
+                dataset.spec_data_labels("标准C")
+
+    def test_cache_key(self, sources):
+        base_path, _, cache_path = sources
+        LabelDataset(*sources).close()
+        compiled_at = os.stat(cache_path).st_mtime_ns
+
+        # 源文件未变化: 直接使用缓存
+        LabelDataset(*sources).close()
+        assert os.stat(cache_path).st_mtime_ns == compiled_at
+
+        # 只修改时间变化: sha256 一致, 只更新缓存键
+        stat = os.stat(base_path)
+        os.utime(base_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with LabelDataset(*sources) as dataset:
+            assert dataset.header["sources"]["base"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+            assert dataset.spec_data_labels("标准B")[0]["name"] == "手机号码"
+
+        # 内容变化: 重新编译
+        write_json(base_path, {**BASE_DATA_LABELS, "Srhida000002": {"name": "手机号", "body": [{"tel": "13800000000"}]}})
+        os.utime(base_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        with LabelDataset(*sources) as dataset:
+            assert dataset.spec_data_labels("标准B")[0]["body"] == [{"tel": "13800000000"}]
+
+    def test_specifications_only(self, sources, tmp_path):
+        specification_path = tmp_path / "specification.json"
+        write_json(specification_path, [{"name": "标准A", "id": 3}, {"name": "标准B", "id": 7}])
+        with LabelDataset(*sources, specification_path=str(specification_path), load_records=False) as dataset:
+            assert dataset.specifications == [("标准A", 3), ("标准B", 7)]
+            with pytest.raises(RuntimeError):
+                dataset.spec_data_labels("标准A")
+        # 源文件集合变化时重新编译, 不使用缺少标准列表的旧缓存
+        with LabelDataset(*sources) as dataset:
+            assert dataset.specifications == []
+
+    def test_corrupted_cache(self, sources):
+        cache_path = sources[2]
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, "wb") as f:
+            f.write(b"not a cache")
+        with LabelDataset(*sources) as dataset:
+            assert len(dataset.label_ids) == 3
+
+    def test_project_dataset(self, tmp_path):
+        dataset = LabelDataset(
+            FileUtils.find_file_from_root("data/data_label/base_data_label.json"),
+            FileUtils.find_file_from_root("data/data_label/specification_refer.json"),
+            str(tmp_path / "label_dataset.bin"),
+        )
+        with open(FileUtils.find_file_from_root("data/data_label/specification_refer.json"), encoding="utf-8") as f:
+            refers = json.load(f)
+        with dataset:
+            for specification_name, refer in refers.items():
+                labels = dataset.spec_data_labels(specification_name)
+                assert [label["id"] for label in labels] == [
+                    item["id"] for item in refer if item["id"] in dataset.header["labels"]
+                ]
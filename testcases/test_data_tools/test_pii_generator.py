@@ -0,0 +1,114 @@
+import io
+import json
+import re
+
+import numpy as np
+import pytest
+
+from utils.data_tools.pii_generator import LabelValueGenerator, PiiGenerator, learn_slots
+
+ID_CARD_WEIGHTS = [7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2]
+USCC_CHARS = "0123456789ABCDEFGHJKLMNPQRTUWXY"
+USCC_WEIGHTS = [1, 3, 9, 27, 19, 26, 16, 17, 20, 29, 25, 13, 8, 24, 10, 30, 28]
+
+
+def id_card_valid(value: str) -> bool:
+    total = sum(int(ch) * weight for ch, weight in zip(value[:17], ID_CARD_WEIGHTS))
+    return "10X98765432"[total % 11] == value[17]
+
+
+def luhn_valid(value: str) -> bool:
+    total = 0
+    for i, ch in enumerate(reversed(value)):
+        digit = int(ch) * (2 if i % 2 else 1)
+        total += digit - 9 if digit > 9 else digit
+    return total % 10 == 0
+
+
+def uscc_valid(value: str) -> bool:
+    total = sum(USCC_CHARS.index(ch) * weight for ch, weight in zip(value[:17], USCC_WEIGHTS))
+    return USCC_CHARS[(31 - total % 31) % 31] == value[17]
+
+
+def label(name, body=(), file_data=(), label_id="L1"):
+    return {"id": label_id, "name": name, "body": list(body), "file_data": list(file_data)}
+
+
+class TestPiiGenerator:
+    """样本模式学习与批量生成测试"""
+
+    def test_id_card(self):
+        values = LabelValueGenerator(label("身份证号码", ["110105199003071234", "31011519851212123X"])).generate(200_000)
+        values = values.tolist()
+
+        assert len(set(values)) == len(values)
+        assert all(re.fullmatch(r"\d{17}[\dX]", value) for value in values[:1000])
+        assert all(id_card_valid(value) for value in values[:1000])
+        # 出生日期合法
+        dates = np.array([f"{value[6:10]}-{value[10:12]}-{value[12:14]}" for value in values[:1000]], "datetime64[D]")
+        assert dates.min() >= np.datetime64("1950-01-01") and dates.max() <= np.datetime64("2009-12-31")
+
+    def test_checksums_and_numbers(self):
+        bank_cards = LabelValueGenerator(label("银行卡号", ["6222021234567890123"])).generate(1000).tolist()
+        assert all(card.startswith("622202") and len(card) == 19 and luhn_valid(card) for card in bank_cards)
+
+        uscc = LabelValueGenerator(label("统一社会信用代码", ["91310101MA1FPX1234"])).generate(1000).tolist()
+        assert all(uscc_valid(code) for code in uscc)
+
+        mobiles = LabelValueGenerator(label("手机号", ["手机号:15112345678"])).generate(1000).tolist()
+        assert all(re.fullmatch(r"手机号:1[3-9]\d{9}", mobile) for mobile in mobiles)
+        assert len(set(mobiles)) == 1000
+
+    def test_generic_pattern(self):
+        values = LabelValueGenerator(label("年龄", file_data=["年龄：25岁"]), source="file_data").generate(50)
+        assert all(re.fullmatch(r"年龄：[1-9]\d岁", value) for value in values.tolist())
+
+        emails = LabelValueGenerator(label("邮箱", ["user@domain.cn"])).generate(50).tolist()
+        assert all(re.fullmatch(r"[a-z]{4}@[a-z]{6}\.cn", email) for email in emails)
+
+        dates = LabelValueGenerator(label("日期", ["1990年01月01日", "2025/12/31"])).generate(100).tolist()
+        assert all(re.fullmatch(r"\d{4}年\d{2}月\d{2}日|\d{4}/\d{2}/\d{2}", value) for value in dates)
+
+        names = LabelValueGenerator(label("姓名", ["李娜", "王小明"])).generate(100).tolist()
+        assert {len(name) for name in names} == {2, 3}
+        # 脱敏标签中的中文、掩码字符原样保留
+        assert [len(slot.pool) for slot in learn_slots("张*", "脱敏姓名")] == [1]
+
+    def test_deterministic(self):
+        data_label = label("车牌号", ["京A12345", "沪B23456"])
+        first = LabelValueGenerator(data_label, seed=1).generate(1000)
+        assert np.array_equal(first, LabelValueGenerator(data_label, seed=1).generate(1000))
+        assert not np.array_equal(first, LabelValueGenerator(data_label, seed=2).generate(1000))
+        # 分批生成与一次生成结果一致
+        batches = np.concatenate(list(LabelValueGenerator(data_label, seed=1).iter_batches(1000, batch_size=300)))
+        assert np.array_equal(first, batches)
+
+    def test_request_bodies(self):
+        generator = LabelValueGenerator(label("手机号", [{"phone": "15112345678"}, {"mobile": "18678297009"}, "13987654321"]))
+        bodies = list(generator.request_bodies(3))
+
+        assert len(bodies) == 3
+        for body in bodies:
+            assert [list(item) if isinstance(item, dict) else None for item in body] == [["phone"], ["mobile"], None]
+            assert all(re.fullmatch(r"1[3-9]\d{9}", value) for value in (body[0]["phone"], body[1]["mobile"], body[2]))
+
+    def test_write_jsonl(self):
+        generator = PiiGenerator.from_base_data_labels(
+            {
+                "L1": {"name": "身份证号码", "body": ["110105199003071234"]},
+                "L2": {"name": "空标签", "body": [], "file_data": []},
+            }
+        )
+        assert list(generator.generators) == ["L1"]
+        f = io.StringIO()
+        assert generator.write_jsonl(f, 25, batch_size=10) == 25
+        records = [json.loads(line) for line in f.getvalue().splitlines()]
+        assert len(records) == 25
+        assert {(record["id"], record["name"]) for record in records} == {("L1", "身份证号码")}
+        assert all(id_card_valid(record["value"]) for record in records)
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            LabelValueGenerator(label("空标签"))
+        with pytest.raises(ValueError):
+            LabelValueGenerator(label("姓名", ["李娜"]), source="headers")
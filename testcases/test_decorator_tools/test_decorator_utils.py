@@ -0,0 +1,78 @@
+import dataclasses
+from typing import List, Optional
+
+import pytest
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail, ApiAssetRecord
+from utils.decorator_tools.decorator_utils import build_decoder, transform_to_data_class
+
+
+@dataclasses.dataclass(slots=True)
+class Sample:
+    id: int
+    name: str
+    tags: List[str] = dataclasses.field(default_factory=list)
+    note: Optional[str] = None
+
+
+class TestBuildDecoder:
+    """生成的 dataclass 解码函数: 忽略未知字段、可选字段取默认值、缺失必填字段报错"""
+
+    def test_decode_ignores_unknown_keys(self):
+        decode, _ = build_decoder(Sample)
+        record = decode({"id": 1, "name": "a", "tags": ["x"], "note": "n", "added_by_server": True})
+
+        assert record == Sample(1, "a", ["x"], "n")
+
+    def test_optional_fields_use_defaults(self):
+        decode, _ = build_decoder(Sample)
+        first, second = decode({"id": 1, "name": "a"}), decode({"id": 2, "name": "b"})
+
+        assert first == Sample(1, "a")
+        first.tags.append("x")
+        assert second.tags == []  # default_factory 每次生成新对象
+
+    def test_explicit_none_is_kept(self):
+        decode, _ = build_decoder(Sample)
+
+        assert decode({"id": 1, "name": None, "note": None}).name is None
+
+    @pytest.mark.parametrize("item", [{"name": "a"}, {"id": 1}, {"bogus": 1}])
+    def test_missing_required_field_raises(self, item):
+        decode, _ = build_decoder(Sample)
+
+        with pytest.raises(TypeError, match="缺少必填字段"):
+            decode(item)
+
+    def test_entity_missing_required_field_raises(self):
+        with pytest.raises(TypeError, match="ApiAssetRecord 缺少必填字段: 'id'"):
+            build_decoder(ApiAssetRecord)[0]({"bogus": 1})
+
+    def test_decode_many_skips_empty_items(self):
+        _, decode_many = build_decoder(Sample)
+
+        assert decode_many([{"id": 1, "name": "a"}, {}, None, {"id": 2, "name": "b"}]) == [
+            Sample(1, "a"),
+            Sample(2, "b"),
+        ]
+
+    def test_decoder_is_memoised(self):
+        assert build_decoder(Sample) is build_decoder(Sample)
+
+
+class TestTransformToDataClass:
+    @pytest.mark.asyncio
+    async def test_transform(self):
+        @transform_to_data_class(ApiAssetLabelDetail)
+        async def fetch(response):
+            return response
+
+        detail = await fetch({"request": {}, "response": {"body": {}}, "storage_state": 1})
+
+        assert detail == ApiAssetLabelDetail({}, {"body": {}}, 1)
+        assert await fetch(None) is None
+        assert await fetch([{"request": {}, "response": {}, "storage_state": 0}]) == [
+            ApiAssetLabelDetail({}, {}, 0)
+        ]
+        with pytest.raises(TypeError):
+            await fetch({"request": {}})
@@ -0,0 +1,78 @@
+import io
+import struct
+
+import olefile
+
+from utils.file_tools.doc_writer import build_doc
+
+
+def read_doc_text(data: bytes) -> str:
+    """按 [MS-DOC] 独立解析: FIB -> 表流 -> CLX 分段表 -> 正文"""
+    ole = olefile.OleFileIO(io.BytesIO(data))
+    word_document = ole.openstream("WordDocument").read()
+    w_ident, n_fib = struct.unpack_from("<HH", word_document, 0)
+    assert w_ident == 0xA5EC and n_fib >= 0x00C1
+    flags = struct.unpack_from("<H", word_document, 0x0A)[0]
+    table = ole.openstream("1Table" if flags & 0x0200 else "0Table").read()
+
+    fc_clx, lcb_clx = struct.unpack_from("<II", word_document, 0x01A2)
+    clx = table[fc_clx : fc_clx + lcb_clx]
+    assert clx[0] == 0x02
+    lcb = struct.unpack_from("<I", clx, 1)[0]
+    plc = clx[5 : 5 + lcb]
+    piece_count = (lcb - 4) // 12
+    cps = struct.unpack_from(f"<{piece_count + 1}I", plc, 0)
+    text = []
+    for i in range(piece_count):
+        fc = struct.unpack_from("<I", plc, 4 * (piece_count + 1) + 8 * i + 2)[0]
+        length = cps[i + 1] - cps[i]
+        if fc & 0x40000000:
+            offset = (fc & 0x3FFFFFFF) // 2
+            text.append(word_document[offset : offset + length].decode("cp1252"))
+        else:
+            text.append(word_document[fc : fc + 2 * length].decode("utf-16-le"))
+    return "".join(text)
+
+
+class TestDocWriter:
+    """.doc 写入测试, 使用 olefile 读取复合文档"""
+
+    def test_round_trip(self):
+        text = "测试数据:\n张小红先生\nHello, world\n13800138000\n"
+        data = build_doc(text)
+
+        assert olefile.isOleFile(io.BytesIO(data))
+        ole = olefile.OleFileIO(io.BytesIO(data))
+        assert sorted(ole.listdir()) == [["1Table"], ["WordDocument"]]
+        assert ole.root.clsid == "00020906-0000-0000-C000-000000000046"
+        assert read_doc_text(data) == text.replace("\n", "\r")
+
+    def test_fib_counts_and_paragraph_pages(self):
+        lines = [f"第{i}行" for i in range(100)]
+        data = build_doc("\n".join(lines))
+        word_document = olefile.OleFileIO(io.BytesIO(data)).openstream("WordDocument").read()
+        text = read_doc_text(data)
+
+        assert text.split("\r")[:-1] == lines
+        assert struct.unpack_from("<I", word_document, 0x4C)[0] == len(text)
+
+        # PlcfBtePapx 覆盖全部正文, 每页 FKP 的段落数与正文中的段落标记一致
+        table = olefile.OleFileIO(io.BytesIO(data)).openstream("1Table").read()
+        fc, lcb = struct.unpack_from("<II", word_document, 154 + 13 * 8)
+        page_count = (lcb - 4) // 8
+        fcs = struct.unpack_from(f"<{page_count + 1}I", table, fc)
+        pns = struct.unpack_from(f"<{page_count}I", table, fc + 4 * (page_count + 1))
+        paragraphs = 0
+        for pn in pns:
+            page = word_document[pn * 512 : (pn + 1) * 512]
+            paragraphs += page[511]
+        assert page_count > 1
+        assert paragraphs == len(lines)
+        assert fcs[-1] - fcs[0] == 2 * len(text)
+
+    def test_large_document(self):
+        # 超过 109 个 FAT 扇区时需要 DIFAT
+        text = "\n".join(f"第{i}行 测试数据" for i in range(600000))
+        data = build_doc(text)
+        assert len(data) > 109 * 128 * 512
+        assert read_doc_text(data).count("\r") == 600000
@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_generator import LabelFileGenerator, build_record_text
+from utils.file_tools.label_file_manifest import load_manifest, manifest_path_of
+
+
+class TestLabelFileGenerator:
+    """测试文件生成引擎测试"""
+
+    formats = (".txt", ".csv", ".xls", ".doc")
+
+    def labels(self):
+        return [
+            {"name": "姓名", "file_data": ["张小红", "李娜"]},
+            {"name": "年龄", "file_data": ["18岁"]},
+        ]
+
+    def test_generate_and_reuse(self, tmp_path):
+        output_dir = tmp_path / "spec"
+        generator = LabelFileGenerator(str(output_dir), formats=self.formats, max_workers=1)
+        paths = generator.generate(self.labels())
+
+        assert sorted(os.listdir(output_dir)) == sorted(os.path.basename(p) for p in paths)
+        assert len(paths) == 8
+        txt_path = output_dir / "数据标签识别_姓名.txt"
+        assert txt_path.read_text(encoding="utf-8") == build_record_text(["张小红", "李娜"])
+
+        # 内容未变化时不重写文件; 被外部改动(修改时间与清单不一致)的文件重新生成
+        mtimes = {p: os.stat(p).st_mtime_ns for p in paths}
+        os.utime(txt_path, ns=(1, 1))
+        generator.generate(self.labels())
+        assert os.stat(txt_path).st_mtime_ns != 1
+        assert all(os.stat(p).st_mtime_ns == mtimes[p] for p in paths if p != str(txt_path))
+
+    def test_changed_and_stale_files(self, tmp_path):
+        output_dir = tmp_path / "spec"
+        generator = LabelFileGenerator(str(output_dir), formats=self.formats, max_workers=1)
+        generator.generate(self.labels())
+
+        labels = self.labels()[:1]
+        labels[0]["file_data"] = ["王芳"]
+        generator.generate(labels)
+
+        assert sorted(os.listdir(output_dir)) == [
+            "数据标签识别_姓名.csv",
+            "数据标签识别_姓名.doc",
+            "数据标签识别_姓名.txt",
+            "数据标签识别_姓名.xls",
+        ]
+        assert (output_dir / "数据标签识别_姓名.txt").read_text(encoding="utf-8") == build_record_text(["王芳"])
+        # 生成清单不在输出目录中
+        assert generator.manifest_path.parent == tmp_path
+
+    def test_manifest(self, tmp_path):
+        output_dir = tmp_path / "spec"
+        labels = [{"id": "L1", **label} for label in self.labels()]
+        generator = LabelFileGenerator(str(output_dir), formats=self.formats, max_workers=1)
+        paths = generator.generate(labels)
+
+        manifest = load_manifest(manifest_path_of(str(output_dir)))
+        assert sorted(manifest) == sorted(os.path.basename(p) for p in paths)
+        for path in paths:
+            entry = manifest[os.path.basename(path)]
+            assert entry.md5 == FileUtils.calculate_file_md5(path)
+            assert entry.size == os.path.getsize(path)
+        entry = manifest["数据标签识别_年龄.xls"]
+        assert (entry.label_id, entry.label_name, entry.ext) == ("L1", "年龄", ".xls")
+
+        # 复用的文件沿用清单中的 md5
+        generator.generate(labels)
+        assert load_manifest(generator.manifest_path) == manifest
+
+    def test_csv_and_no_pandas_import(self, tmp_path):
+        code = (
+            "import sys\n"
+            "from utils.file_tools.label_file_generator import render\n"
+            f"for ext in {self.formats + ('.xlsx', '.docx', '.pptx')!r}:\n"
+            "    render(ext, '测试数据:\\n张小红\\n\"李娜\",18岁\\n')\n"
+            "assert 'pandas' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=FileUtils.find_file_from_root(""))
+
+        generator = LabelFileGenerator(str(tmp_path / "spec"), formats=(".csv",), max_workers=1)
+        (path,) = generator.generate([{"name": "姓名", "file_data": ["张小红", '"李娜",18岁']}])
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            assert f.read() == '测试数据\n"张小红\n""李娜"",18岁"\n'
+
+    def test_store_shared_across_specs(self, tmp_path):
+        store_dir = str(tmp_path / "store")
+        first = LabelFileGenerator(str(tmp_path / "spec_a"), formats=self.formats, max_workers=1, store_dir=store_dir)
+        second = LabelFileGenerator(str(tmp_path / "spec_b"), formats=self.formats, max_workers=1, store_dir=store_dir)
+        paths_a = first.generate(self.labels())
+        # 同一标签数据在另一个标准中名称不同, 内容仍相同
+        paths_b = second.generate([{"name": "姓名_别名", "file_data": ["张小红", "李娜"]}])
+
+        objects = [p for p in (tmp_path / "store").rglob("*") if p.is_file() and p.name != "index.json"]
+        assert len(objects) == 8
+        assert os.path.samefile(paths_b[0], paths_a[0])
+        assert all(os.stat(p).st_nlink == 3 for p in paths_a[:4])
+
+        manifest = load_manifest(second.manifest_path)
+        entry = manifest["数据标签识别_姓名_别名.doc"]
+        assert entry.md5 == FileUtils.calculate_file_md5(paths_b[3])
+
+        # 已链接的文件不重新生成, 过期的链接被清理
+        mtimes = [os.stat(p).st_mtime_ns for p in paths_a]
+        first.generate(self.labels()[:1])
+        assert sorted(os.listdir(tmp_path / "spec_a")) == sorted(os.path.basename(p) for p in paths_a[:4])
+        assert [os.stat(p).st_mtime_ns for p in paths_a[:4]] == mtimes[:4]
+
+    def test_symlink_views(self, tmp_path):
+        store_dir = str(tmp_path / "store")
+        generator = LabelFileGenerator(
+            str(tmp_path / "spec"), formats=(".txt",), max_workers=1, store_dir=store_dir, link_mode="symlink"
+        )
+        (path,) = generator.generate(self.labels()[:1])
+
+        assert os.path.islink(path)
+        assert open(path, encoding="utf-8").read() == build_record_text(["张小红", "李娜"])
+        generator.generate(self.labels()[:1])
+        assert os.path.islink(path)
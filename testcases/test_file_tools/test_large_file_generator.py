@@ -0,0 +1,105 @@
+import csv
+from collections import Counter
+
+import docx
+import openpyxl
+import pytest
+
+from utils.file_tools.large_file_generator import (
+    LargeFileGenerator,
+    format_size,
+    load_sidecar,
+    parse_size,
+    sidecar_path_of,
+)
+
+LABELS = [
+    {"id": "L1", "name": "姓名", "file_data": ["张小红先生", "姓名：蔡安伟"]},
+    {"id": "L2", "name": "手机号", "file_data": ["13800138000", "手机号:13912345678"]},
+    {"id": "L3", "name": "空标签", "file_data": []},
+]
+SAMPLE_LABELS = {value: label["id"] for label in LABELS for value in label["file_data"]}
+
+
+def count_samples(lines):
+    counts = Counter(SAMPLE_LABELS[line] for line in lines if line in SAMPLE_LABELS)
+    return {label_id: counts[label_id] for label_id in ("L1", "L2")}
+
+
+def expected_counts(sidecar):
+    return {label_id: hits.count for label_id, hits in sidecar.expected.items()}
+
+
+class TestLargeFileGenerator:
+    """大文件生成测试, 逐行读回文件核对期望命中数"""
+
+    def test_txt_and_sidecar(self, tmp_path):
+        path = tmp_path / "big.txt"
+        sidecar = LargeFileGenerator(LABELS, density=0.05, seed=7).generate(str(path), 200 * 1024)
+        lines = path.read_text(encoding="utf-8").splitlines()
+
+        assert sidecar.size == path.stat().st_size >= 200 * 1024
+        assert sidecar.line_count == len(lines)
+        assert sidecar.sample_count == round(len(lines) * 0.05)
+        assert expected_counts(sidecar) == count_samples(lines)
+        assert load_sidecar(sidecar_path_of(path)) == sidecar
+        assert sidecar.expected["L1"].label_name == "姓名"
+        # 填充文本不含数字
+        assert not any(ch.isdigit() for line in lines if line not in SAMPLE_LABELS for ch in line)
+
+    def test_deterministic(self, tmp_path):
+        generator = LargeFileGenerator(LABELS, density=0.01, seed=3)
+        generator.generate(str(tmp_path / "a.csv"), 64 * 1024)
+        generator.generate(str(tmp_path / "b.csv"), 64 * 1024)
+        other = LargeFileGenerator(LABELS, density=0.01, seed=4).generate(str(tmp_path / "c.csv"), 64 * 1024)
+
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+        assert (tmp_path / "a.csv").read_bytes() != (tmp_path / "c.csv").read_bytes()
+        with open(tmp_path / "c.csv", encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["测试数据"]
+        assert expected_counts(other) == count_samples(row[0] for row in rows[1:])
+
+    def test_xlsx(self, tmp_path):
+        path = tmp_path / "big.xlsx"
+        sidecar = LargeFileGenerator(LABELS, density=0.1).generate(str(path), 64 * 1024)
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        cells = [cell.value for row in workbook.active.iter_rows() for cell in row if cell.value is not None]
+
+        assert cells[0] == "测试数据"
+        assert len(cells) - 1 == sidecar.line_count
+        assert expected_counts(sidecar) == count_samples(cells[1:])
+
+    def test_docx(self, tmp_path):
+        path = tmp_path / "big.docx"
+        sidecar = LargeFileGenerator(LABELS, density=0.1).generate(str(path), 64 * 1024)
+        paragraphs = [p.text for p in docx.Document(str(path)).paragraphs]
+
+        assert len(paragraphs) == sidecar.line_count
+        assert expected_counts(sidecar) == count_samples(paragraphs)
+
+    def test_generate_series(self, tmp_path):
+        sidecars = LargeFileGenerator(LABELS).generate_series(str(tmp_path), [16 * 1024, 32 * 1024], [".txt"])
+        assert [s.file_name for s in sidecars] == ["大文件测试_16KB.txt", "大文件测试_32KB.txt"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            ".大文件测试_16KB.txt.expected.json",
+            ".大文件测试_32KB.txt.expected.json",
+            "大文件测试_16KB.txt",
+            "大文件测试_32KB.txt",
+        ]
+
+    def test_sizes_and_errors(self, tmp_path):
+        assert parse_size("100MB") == 100 * 1024 * 1024
+        assert parse_size("1g") == 1 << 30
+        assert parse_size("1.5K") == 1536
+        assert parse_size("2048") == 2048
+        assert format_size(100 * 1024 * 1024) == "100MB"
+        assert format_size(1536) == "1536B"
+        with pytest.raises(ValueError):
+            parse_size("ten MB")
+        with pytest.raises(ValueError):
+            LargeFileGenerator(LABELS, density=0)
+        with pytest.raises(ValueError):
+            LargeFileGenerator([{"id": "L3", "name": "空标签", "file_data": []}])
+        with pytest.raises(ValueError):
+            LargeFileGenerator(LABELS).generate(str(tmp_path / "big.pdf"), 1024)
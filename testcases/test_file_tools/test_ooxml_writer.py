@@ -0,0 +1,39 @@
+import io
+import zipfile
+
+import docx
+import openpyxl
+import pptx
+
+from utils.file_tools.ooxml_writer import build_docx, build_pptx, build_xlsx, column_letter
+
+TEXT = "测试数据:\n张小红 <先生> & 李娜\n\n13800138000\n"
+
+
+class TestOoxmlWriter:
+    """OOXML 模板写入测试, 使用 python-docx / openpyxl / python-pptx 读取验证"""
+
+    def test_docx(self):
+        document = docx.Document(io.BytesIO(build_docx(TEXT)))
+        assert [p.text for p in document.paragraphs] == ["测试数据:", "张小红 <先生> & 李娜", "", "13800138000"]
+
+    def test_xlsx(self):
+        rows = [["测试数据", "备注"], ["张小红\n李娜", "a&b"]]
+        workbook = openpyxl.load_workbook(io.BytesIO(build_xlsx(rows)))
+        assert [[c.value for c in row] for row in workbook.active.iter_rows()] == rows
+
+    def test_pptx(self):
+        presentation = pptx.Presentation(io.BytesIO(build_pptx(TEXT)))
+        texts = [shape.text_frame.text for slide in presentation.slides for shape in slide.shapes]
+        assert texts == [TEXT.rstrip("\n")]
+
+    def test_package_is_valid_and_deterministic(self):
+        for build in (build_docx, build_pptx):
+            data = build(TEXT)
+            assert zipfile.ZipFile(io.BytesIO(data)).testzip() is None
+            assert data == build(TEXT)
+        # XML 中不允许的控制字符被移除
+        assert b"\x01" not in zipfile.ZipFile(io.BytesIO(build_docx("a\x01b"))).read("word/document.xml")
+
+    def test_column_letter(self):
+        assert [column_letter(i) for i in (0, 25, 26, 701, 702)] == ["A", "Z", "AA", "ZZ", "AAA"]
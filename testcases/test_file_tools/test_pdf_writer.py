@@ -0,0 +1,126 @@
+import io
+import re
+import zlib
+
+import pytest
+from pypdf import PdfReader
+
+from utils.file_tools.pdf_writer import build_pdf, load_font
+
+ttLib = pytest.importorskip("fontTools.ttLib")
+fontBuilder = pytest.importorskip("fontTools.fontBuilder")
+ttGlyphPen = pytest.importorskip("fontTools.pens.ttGlyphPen")
+
+
+def square_glyph(size: int):
+    pen = ttGlyphPen.TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, size))
+    pen.lineTo((size, size))
+    pen.lineTo((size, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+@pytest.fixture
+def font_path(tmp_path):
+    """构造最小 TrueType 字体: Å 为复合字形, 引用 A 与未映射的 ring"""
+    glyph_order = [".notdef", "A", "ring", "Aring", "zhang", "space"]
+    builder = fontBuilder.FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap({ord("A"): "A", ord("Å"): "Aring", ord("张"): "zhang", ord(" "): "space"})
+    composite = ttGlyphPen.TTGlyphPen({"A": None, "ring": None})
+    composite.addComponent("A", (1, 0, 0, 1, 0, 0))
+    composite.addComponent("ring", (1, 0, 0, 1, 100, 700))
+    glyphs = {
+        ".notdef": square_glyph(500),
+        "A": square_glyph(600),
+        "ring": square_glyph(200),
+        "Aring": composite.glyph(),
+        "zhang": square_glyph(900),
+        "space": ttGlyphPen.TTGlyphPen(None).glyph(),
+    }
+    builder.setupGlyf(glyphs)
+    widths = {".notdef": 500, "A": 600, "ring": 200, "Aring": 600, "zhang": 1000, "space": 250}
+    builder.setupHorizontalMetrics({name: (widths[name], 0) for name in glyph_order})
+    builder.setupHorizontalHeader(ascent=880, descent=-120)
+    builder.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    path = tmp_path / "test.ttf"
+    builder.save(str(path))
+    return str(path)
+
+
+def read_pdf(data: bytes):
+    """解析 xref 与对象, 经 ToUnicode 还原每页文字, 返回 (每页文字, 嵌入字体)"""
+    xref_offset = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    xref = data[xref_offset:].split(b"trailer")[0].split(b"\n")[3:-1]
+    objects = {}
+    for number, entry in enumerate(xref, 1):
+        offset = int(entry[:10])
+        assert data[offset:].startswith(f"{number} 0 obj\n".encode())
+        body = data[offset : data.index(b"\nendobj", offset)].split(b"\n", 1)[1]
+        stream = re.search(rb"stream\n(.*)\nendstream", body, re.S)
+        objects[number] = (body, zlib.decompress(stream.group(1)) if stream else None)
+
+    def ref(number, key):
+        return int(re.search(rb"/" + key + rb" (\d+) 0 R", objects[number][0]).group(1))
+
+    cid_font = int(re.search(rb"/DescendantFonts \[(\d+) 0 R\]", objects[3][0]).group(1))
+    font_file = objects[ref(ref(cid_font, b"FontDescriptor"), b"FontFile2")][1]
+    to_unicode = {
+        int(cid, 16): bytes.fromhex(text.decode()).decode("utf-16-be")
+        for cid, text in re.findall(rb"<([0-9A-F]{4})> <([0-9A-F]+)>", objects[ref(3, b"ToUnicode")][1])
+    }
+    pages = []
+    for page in re.findall(rb"(\d+) 0 R", re.search(rb"/Kids \[(.*?)\]", objects[2][0]).group(1)):
+        content = objects[ref(int(page), b"Contents")][1]
+        lines = []
+        for encoded in re.findall(rb"<([0-9A-F]*)> Tj", content):
+            lines.append("".join(to_unicode[int(encoded[i : i + 4], 16)] for i in range(0, len(encoded), 4)))
+        pages.append(lines)
+    return pages, ttLib.TTFont(io.BytesIO(font_file))
+
+
+class TestPdfWriter:
+    """PDF 写入测试, 使用独立解析器读取正文与嵌入字体"""
+
+    def test_text_and_font_subset(self, font_path):
+        pages, font = read_pdf(build_pdf("测试:\nAÅ 张\n\nA\n", font_path))
+
+        # 字体中没有的字符显示为 .notdef, 但仍可通过 ToUnicode 还原
+        assert pages == [["测试:", "AÅ 张", "A"]]
+        assert font["maxp"].numGlyphs == 6
+        glyf = font["glyf"]
+        composites = [name for name in font.getGlyphOrder() if glyf[name].isComposite()]
+        assert len(composites) == 1
+        components = [c.glyphName for c in glyf[composites[0]].components]
+        assert [font["hmtx"][name][0] for name in components] == [600, 200]
+
+    def test_wrap_and_page_break(self, font_path):
+        long_line = "张" * 60
+        pages, _ = read_pdf(build_pdf(long_line + "\n" + "\n".join("A" * 40), font_path))
+
+        # 可用宽度 188mm ≈ 533pt, 12 号字每个"张"宽 12pt
+        assert pages[0][:2] == ["张" * 44, "张" * 16]
+        assert len(pages) == 2 and len(pages[0]) == 26
+        assert sum(len(page) for page in pages) == 42
+
+    def test_font_parsed_once(self, font_path):
+        build_pdf("A", font_path)
+        hits = load_font.cache_info().hits
+        build_pdf("张", font_path)
+        assert load_font.cache_info().hits == hits + 1
+
+    def test_readable_by_pypdf(self, font_path):
+        # 与仓库自带解析器互为印证: pypdf 严格模式解析结构、按 ToUnicode 提取正文
+        reader = PdfReader(io.BytesIO(build_pdf("测试:\nAÅ 张\n" + "\n".join("A" * 30), font_path)), strict=True)
+
+        assert len(reader.pages) == 2
+        assert reader.pages[0].extract_text().splitlines()[:2] == ["测试:", "AÅ 张"]
+        font = reader.pages[0]["/Resources"]["/Font"]["/F1"].get_object()
+        assert (font["/Subtype"], font["/Encoding"]) == ("/Type0", "/Identity-H")
+        descendant = font["/DescendantFonts"][0].get_object()
+        font_file = descendant["/FontDescriptor"]["/FontFile2"].get_object().get_data()
+        assert ttLib.TTFont(io.BytesIO(font_file))["maxp"].numGlyphs == 6
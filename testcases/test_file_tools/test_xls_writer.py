@@ -0,0 +1,50 @@
+import io
+
+import olefile
+import pytest
+import xlrd
+
+from utils.file_tools.xls_writer import build_xls
+
+
+def read_sheet(data: bytes):
+    """用 xlrd 读取第一个工作表中的非空单元格"""
+    book = xlrd.open_workbook(file_contents=data)
+    assert book.biff_version == 80
+    sheet = book.sheet_by_index(0)
+    return {
+        (row, column): sheet.cell_value(row, column)
+        for row in range(sheet.nrows)
+        for column in range(sheet.row_len(row))
+        if sheet.cell_type(row, column) != xlrd.XL_CELL_EMPTY
+    }
+
+
+class TestXlsWriter:
+    """.xls 写入测试, 使用 olefile 检查复合文档结构, 使用 xlrd 读取 BIFF8 内容"""
+
+    def test_round_trip(self):
+        data = build_xls([["测试数据"], ["张小红\n李娜"], ["测试数据", "Hello"]])
+
+        assert olefile.OleFileIO(io.BytesIO(data)).listdir() == [["Workbook"]]
+        assert read_sheet(data) == {
+            (0, 0): "测试数据",
+            (1, 0): "张小红\n李娜",
+            (2, 0): "测试数据",
+            (2, 1): "Hello",
+        }
+
+    def test_long_strings_continue(self):
+        long_text = "\n".join(f"第{i}行 测试数据" for i in range(2000))
+        rows = [["x" * 5000, long_text]] + [[f"行{i}"] for i in range(500)]
+        cells = read_sheet(build_xls(rows))
+
+        assert cells[(0, 0)] == "x" * 5000
+        assert cells[(0, 1)] == long_text
+        assert cells[(500, 0)] == "行499"
+
+    def test_limits(self):
+        with pytest.raises(ValueError):
+            build_xls([["x" * 32768]])
+        with pytest.raises(ValueError):
+            build_xls([["x"]] * 65537)
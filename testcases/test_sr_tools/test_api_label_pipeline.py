@@ -0,0 +1,145 @@
+import asyncio
+import random
+
+import pytest
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.sr_tools.api_label_pipeline import ApiLabelPipeline, PipelineStage, StagePipeline
+from utils.sr_tools.label_compare import compare_api_label
+
+APP = "192.192.101.220:20010"
+
+
+def detail_for(name, contents):
+    return ApiAssetLabelDetail(
+        request={"body": {name: {"count": len(contents), "contents": contents}}},
+        response={},
+        storage_state=None,
+    )
+
+
+class FakeApione:
+    """按 API 路径返回资产 ID, 记录详情查询; missing 中的标签查不到资产"""
+
+    def __init__(self, data_labels, missing=(), cached=()):
+        self.ids = {
+            f"{APP}/data_label_test/{d['id']}": index
+            for index, d in enumerate(data_labels)
+            if d["id"] not in missing
+        }
+        self.details = {index: detail_for(d["name"], d["body"]) for index, d in enumerate(data_labels)}
+        self.cache = {self.ids[f"{APP}/data_label_test/{i}"]: None for i in cached}
+        self.latest_calls = []
+        self.unmask_calls = []
+
+    async def get_api_asset_id(self, api):
+        # 打乱完成顺序, 验证结果仍按输入顺序返回
+        await asyncio.sleep(random.random() / 1000)
+        return self.ids.get(api)
+
+    def cached_api_asset_label_detail(self, api_id):
+        return self.details[api_id] if api_id in self.cache else None
+
+    async def get_api_asset_latest_call(self, api_id):
+        assert api_id is not None
+        self.latest_calls.append(api_id)
+        return f"req-{api_id}", f"key-{api_id}"
+
+    async def get_call_record_label_detail(self, api_id, latest_request_id, latest_storage_key):
+        assert (latest_request_id, latest_storage_key) == (f"req-{api_id}", f"key-{api_id}")
+        self.unmask_calls.append(api_id)
+        return self.details[api_id]
+
+
+DATA_LABELS = [
+    {"id": f"Srhida{i:06d}", "name": f"标签{i}", "body": [{"k": f"v{i}"}]} for i in range(20)
+]
+
+
+class TestApiLabelPipeline:
+    """API 数据标签流水线: 结果顺序、缓存跳过、缺失资产与 on_result"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        apione = FakeApione(DATA_LABELS)
+        recorded = []
+        pipeline = ApiLabelPipeline(apione, APP, compare_api_label, lookup_concurrency=4, on_result=recorded.append)
+        results = await pipeline.run(DATA_LABELS)
+
+        assert [r["request"]["id"] for r in results] == [d["id"] for d in DATA_LABELS]
+        assert all(r["request"]["status"] == "PASS" for r in results)
+        assert sorted(r["request"]["id"] for r in recorded) == [d["id"] for d in DATA_LABELS]
+        assert pipeline.report()["compare"].processed == len(DATA_LABELS)
+
+    @pytest.mark.asyncio
+    async def test_cached_detail_skips_detail_and_unmask(self):
+        apione = FakeApione(DATA_LABELS, cached=[DATA_LABELS[0]["id"], DATA_LABELS[3]["id"]])
+        results = await ApiLabelPipeline(apione, APP, compare_api_label).run(DATA_LABELS)
+
+        assert sorted(apione.latest_calls) == sorted(apione.unmask_calls) == [
+            i for i in range(len(DATA_LABELS)) if i not in (0, 3)
+        ]
+        assert results[0]["request"]["status"] == results[3]["request"]["status"] == "PASS"
+
+    @pytest.mark.asyncio
+    async def test_missing_asset_fails_without_detail_calls(self):
+        missing = DATA_LABELS[5]["id"]
+        apione = FakeApione(DATA_LABELS, missing=[missing])
+        results = await ApiLabelPipeline(apione, APP, compare_api_label).run(DATA_LABELS)
+
+        assert None not in apione.latest_calls
+        assert len(apione.latest_calls) == len(DATA_LABELS) - 1
+        assert results[5]["request"]["status"] == "FAILED"
+        assert results[5]["request"]["unmatched"]["body"] == DATA_LABELS[5]["body"]
+
+    @pytest.mark.asyncio
+    async def test_stats_reset_between_runs(self):
+        pipeline = ApiLabelPipeline(FakeApione(DATA_LABELS), APP, compare_api_label)
+        await pipeline.run(DATA_LABELS)
+        await pipeline.run(DATA_LABELS[:5])
+
+        assert {stats.processed for stats in pipeline.report().values()} == {5}
+
+
+class TestStagePipeline:
+    @pytest.mark.asyncio
+    async def test_stage_error_propagates(self):
+        def fail(item):
+            if item == 2:
+                raise ValueError("boom")
+            return item
+
+        pipeline = StagePipeline([PipelineStage("double", lambda x: x * 2, 2), PipelineStage("fail", fail, 1)])
+        with pytest.raises(ValueError, match="boom"):
+            await pipeline.run([0, 1, 2])
+
+    @pytest.mark.asyncio
+    async def test_stage_error_awaits_cancelled_workers(self):
+        cancelled = []
+
+        async def fail(item):
+            # 让前两项先进入下一阶段
+            await asyncio.sleep(0.01 * item)
+            if item == 2:
+                raise ValueError("boom")
+            return item
+
+        async def slow(item):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+            return item
+
+        pipeline = StagePipeline([PipelineStage("fail", fail, 1), PipelineStage("slow", slow, 2)])
+        with pytest.raises(ValueError, match="boom"):
+            await pipeline.run([0, 1, 2, 3])
+
+        # 抛出异常前, 被取消的 worker 已经退出
+        assert sorted(cancelled) == [0, 1]
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+    def test_requires_stage(self):
+        with pytest.raises(ValueError):
+            StagePipeline([])
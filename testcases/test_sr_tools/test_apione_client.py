@@ -0,0 +1,149 @@
+import dataclasses
+
+import pytest
+
+from entity.api_asset.api_asset import ApiAssetRecord
+from utils.sr_tools.apione_client import ApioneClient, BoundedCache
+
+
+def api_asset(api_id: int, path: str):
+    """字段齐全的 API 资产记录, 未关心的字段取 None"""
+    record = {field.name: None for field in dataclasses.fields(ApiAssetRecord)}
+    record.update(id=api_id, http_authority="192.192.101.220:20010", http_path=path)
+    return record
+
+
+class StubHttps:
+    """按路径返回固定响应的 https 客户端, 记录每次调用"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def post(self, url, json=None, **kwargs):
+        self.calls.append(("POST", url))
+        if url == "/apione/v2/assets/list":
+            path = json["api"].split("20010", 1)[1]
+            return {"code": 200, "data": {"results": [api_asset(len(self.calls), path)]}}
+        if url == "/apione/v2/initial/rules":
+            return {"code": 200}
+        raise AssertionError(f"未预期的请求 {url}")
+
+    async def get(self, url, **kwargs):
+        self.calls.append(("GET", url))
+        if url == "/apione/v2/initial/progress":
+            return {"code": 200, "data": {"finish_tag": True}}
+        if "/data-count/rank" in url:
+            return {"code": 200, "data": {"results": [{"data_label": "姓名", "data_count": 3}]}}
+        raise AssertionError(f"未预期的请求 {url}")
+
+    def count(self, url_part):
+        return sum(url_part in url for _, url in self.calls)
+
+
+class TestBoundedCache:
+    """有界 LRU 缓存: 淘汰顺序与命中率"""
+
+    def test_lru_eviction(self):
+        cache = BoundedCache("test", max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a 变为最近使用
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert len(cache) == 2
+
+    def test_overwrite_refreshes_recency(self):
+        cache = BoundedCache("test", max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        cache.set("c", 3)
+
+        assert cache.get("a") == 10
+        assert cache.get("b", "missing") == "missing"
+
+    def test_hit_rate(self):
+        cache = BoundedCache("test")
+        assert cache.hit_rate == 0.0
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats() == {"size": 1, "hits": 2, "misses": 1, "hit_rate": 0.6667}
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.hits == 2  # 清空只丢弃条目, 不重置统计
+
+
+class TestApioneClient:
+    """ApioneClient 缓存: 重复查询命中缓存, initial_rule 之后失效"""
+
+    @pytest.mark.asyncio
+    async def test_api_asset_id_cached(self):
+        https = StubHttps()
+        client = ApioneClient(https)
+        api = "192.192.101.220:20010/data_label_test/Srhida000001"
+
+        first = await client.get_api_asset_id(api)
+        second = await client.get_api_asset_id(api)
+
+        assert first == second
+        assert https.count("/assets/list") == 1
+        assert client.cache_stats()["api_asset_ids"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_file_label_detail_cached_and_read_only(self):
+        https = StubHttps()
+        client = ApioneClient(https)
+
+        detail = await client.get_file_asset_label_detail(9)
+        assert await client.get_file_asset_label_detail(9) is detail
+        assert https.count("/data-count/rank") == 1
+        assert dict(detail) == {"姓名": 3}
+        with pytest.raises(TypeError):
+            detail["姓名"] = 0
+
+    @pytest.mark.asyncio
+    async def test_initial_rule_invalidates_caches(self):
+        https = StubHttps()
+        client = ApioneClient(https)
+        api = "192.192.101.220:20010/data_label_test/Srhida000001"
+        await client.get_api_asset_id(api)
+        await client.get_file_asset_label_detail(9)
+
+        await client.initial_rule(1)
+
+        assert {name: stats["size"] for name, stats in client.cache_stats().items()} == {
+            "api_asset_ids": 0,
+            "file_asset_ids": 0,
+            "label_details": 0,
+        }
+        await client.get_api_asset_id(api)
+        await client.get_file_asset_label_detail(9)
+        assert https.count("/assets/list") == 2
+        assert https.count("/data-count/rank") == 2
+
+    @pytest.mark.asyncio
+    async def test_initial_rule_failure_still_invalidates(self):
+        https = StubHttps()
+        client = ApioneClient(https)
+        await client.get_file_asset_label_detail(9)
+
+        async def reject(url, json=None, **kwargs):
+            return {"code": 500, "message": "busy"}
+
+        https.post = reject
+        with pytest.raises(RuntimeError, match="busy"):
+            await client.initial_rule(1)
+        assert len(client.label_details) == 0
+
+    def test_cache_size_bound(self):
+        client = ApioneClient(StubHttps(), cache_size=3)
+        for i in range(10):
+            client.label_details.set(("api", i), None)
+
+        assert len(client.label_details) == 3
+        assert ("api", 9) in client.label_details and ("api", 6) not in client.label_details
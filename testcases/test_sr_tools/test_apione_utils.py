@@ -0,0 +1,100 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from utils.sr_tools.apione_utils import ApioneUtils
+
+
+class FakeListClient:
+    """按 page_num/page_size 切片返回 rows 条记录的列表接口"""
+
+    def __init__(self, rows: int, row_count: bool = True):
+        self.rows = rows
+        self.row_count = row_count
+        self.requested = []
+        self.cancelled = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def post(self, url, json=None, **kwargs):
+        page_num, page_size = json["page_num"], json["page_size"]
+        self.requested.append(page_num)
+        try:
+            await asyncio.sleep(0)
+            if page_num > 1:
+                await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(page_num)
+            raise
+        start = (page_num - 1) * page_size
+        results = [{"id": i} for i in range(start, min(start + page_size, self.rows))]
+        data = {"results": results}
+        if self.row_count:
+            data["row_count"] = self.rows
+        return {"code": 200, "data": data}
+
+
+async def collect(client, page_size=10, prefetch=1):
+    pages = []
+    async for page in ApioneUtils.iter_list_pages(client, "/list", page_size=page_size, prefetch=prefetch):
+        # 消费当前页时, 已请求的页数不超过 当前页 + prefetch
+        assert max(client.requested) <= len(pages) + 1 + prefetch
+        pages.append([row["id"] for row in page])
+    return pages
+
+
+class TestIterListPages:
+    """列表接口分页预取: 页序、最后一页截断、预取深度与提前退出"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("prefetch", [1, 3])
+    async def test_page_order_and_prefetch_depth(self, prefetch):
+        client = FakeListClient(rows=45)
+        pages = await collect(client, prefetch=prefetch)
+
+        assert [len(page) for page in pages] == [10, 10, 10, 10, 5]
+        assert sum(pages, []) == list(range(45))
+        # row_count 已知, 不请求第 6 页
+        assert sorted(client.requested) == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_short_page_cuts_off_prefetch(self):
+        # 没有 row_count 时只能靠短页判断结束, 多余的预取被取消
+        client = FakeListClient(rows=25, row_count=False)
+        pages = await collect(client, prefetch=3)
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+    @pytest.mark.asyncio
+    async def test_exact_multiple_ends_on_row_count(self):
+        client = FakeListClient(rows=20)
+        pages = await collect(client)
+
+        assert [len(page) for page in pages] == [10, 10]
+        assert sorted(client.requested) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_early_break_cancels_and_awaits_prefetch(self):
+        client = FakeListClient(rows=100)
+        client.release.clear()
+        pages = ApioneUtils.iter_list_pages(client, "/list", page_size=10, prefetch=2)
+        async with aclosing(pages):
+            async for page in pages:
+                # 让预取的第 2、3 页开始请求
+                await asyncio.sleep(0)
+                break
+
+        assert [row["id"] for row in page] == list(range(10))
+        assert sorted(client.cancelled) == [2, 3]
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+    @pytest.mark.asyncio
+    async def test_error_response(self):
+        class FailingClient:
+            async def post(self, url, json=None, **kwargs):
+                return {"code": 500, "message": "boom"}
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await collect(FailingClient())
@@ -0,0 +1,169 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import run_data_label
+from utils.sr_tools import data_label_suite
+from utils.sr_tools.data_label_suite import DataLabelSuite, export_summary_markdown
+
+ROOT = Path(__file__).resolve().parents[2]
+
+DATA_LABELS = [
+    {"id": "Srhida000001", "name": "姓名", "scope": 1, "body": [{"name": "李娜"}], "file_data": []},
+    {"id": "Srhida000002", "name": "身份证号", "scope": 2, "body": [], "file_data": ["110101199003070011"]},
+]
+
+SUMMARY = {
+    "specification": "GB/T 35273",
+    "total_labels": 2,
+    "api": {
+        "request_pass": 1,
+        "request_fail": 0,
+        "request_mis": 0,
+        "response_pass": 0,
+        "response_fail": 1,
+        "response_mis": 1,
+        "overall": {"precision": 0.5, "recall": 1.0, "f1": 2 / 3},
+    },
+    "file": {"total_pass": 1, "total_fail": 0, "file_stats": {".pdf": {"pass": 1, "fail": 0, "mis": 0}}},
+    "history": {"base_run": "r1", "regressions": 2, "fixes": 3},
+}
+
+
+class RecordingSuite(DataLabelSuite):
+    """不连接服务端, 记录各阶段的调用"""
+
+    def __init__(self, **kwargs):
+        super().__init__(apione=None, http=None, **kwargs)
+        self.calls = []
+
+    async def reset(self, specification_name, specification_id):
+        self.calls.append("reset")
+
+    async def verify_api(self, api_data_labels, specification_name):
+        self.calls.append("verify_api")
+        return []
+
+    async def verify_file(self, file_data_labels, specification_name, uploaded_files=None, failed_uploads=()):
+        self.calls.append("verify_file")
+        return []
+
+    def summarize(self, result):
+        self.calls.append("summarize")
+        return dict(SUMMARY, specification=result.specification_name)
+
+
+class TestDataLabelSuite:
+    """数据标签测试流程: 阶段跳过与导出"""
+
+    @pytest.mark.asyncio
+    async def test_skip_traffic_verifies_planned_labels(self, tmp_path):
+        suite = RecordingSuite(output_formats=("md", "json"), result_dir=str(tmp_path))
+        result = await suite.run_specification("GB/T 35273", 1, DATA_LABELS, skip=("traffic",))
+
+        assert suite.calls == ["reset", "verify_api", "verify_file", "summarize"]
+        assert [d["id"] for d in result.api_data_labels] == ["Srhida000001"]
+        # 默认只发送 body
+        assert result.api_data_labels[0]["body"] == [{"name": "李娜"}]
+        assert result.api_data_labels[0]["headers"] == []
+        assert [d["id"] for d in result.file_data_labels] == ["Srhida000002"]
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["GB_T 35273.json", "GB_T 35273.md"]
+        exported = json.loads((tmp_path / "GB_T 35273.json").read_text(encoding="utf-8"))
+        assert exported["summary"]["specification"] == "GB/T 35273"
+        assert "回退 2 | ⬆ 修复 3" in (tmp_path / "GB_T 35273.md").read_text(encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_skip_verify_stops_before_export(self, tmp_path):
+        suite = RecordingSuite(output_formats=("json",), result_dir=str(tmp_path))
+        result = await suite.run_specification("GB/T 35273", 1, DATA_LABELS, skip=("reset", "traffic", "verify"))
+
+        assert suite.calls == []
+        assert result.summary is None
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_phase_and_format(self):
+        with pytest.raises(ValueError):
+            RecordingSuite(output_formats=("pdf",))
+        with pytest.raises(ValueError):
+            await RecordingSuite().run_specification("GB/T 35273", 1, DATA_LABELS, skip=("deploy",))
+
+    def test_summary_markdown(self):
+        markdown = export_summary_markdown(SUMMARY)
+
+        assert markdown.startswith("## 🎯 GB/T 35273 标准数据标签测试报告")
+        assert "请求位置: ✓ 通过 1 | ✗ 失败 0 | ❓ 误识别 0" in markdown
+        assert "准确率 50.00% | 召回率 100.00% | F1 66.67%" in markdown
+        assert "• .pdf: ✓ 通过 1" in markdown
+        assert "回退 2" in markdown
+        assert "与上次运行对比" not in export_summary_markdown(dict(SUMMARY, history=None))
+
+
+class TestRunDataLabelCli:
+    """命令行入口: 参数解析、标准选择与启动耗时"""
+
+    def test_constants_match_suite(self):
+        assert run_data_label.PHASES == data_label_suite.PHASES
+        assert run_data_label.OUTPUT_FORMATS == data_label_suite.OUTPUT_FORMATS
+
+    def test_parse_args(self):
+        args = run_data_label.build_parser().parse_args(
+            ["--specs", "1", "GB/T 35273", "--rate", "50", "--mix", "query=1,body=3", "--skip", "reset", "notify",
+             "--format", "md", "json"]
+        )
+
+        assert args.specs == ["1", "GB/T 35273"]
+        assert args.rate == 50.0
+        assert args.mix == {"query": 1, "body": 3}
+        assert args.skip == ["reset", "notify"]
+        assert args.formats == ["md", "json"]
+        assert args.concurrency == 5
+        assert args.archive is True
+        assert run_data_label.build_parser().parse_args(["--no-archive"]).archive is False
+        assert args.command is None
+
+    def test_parse_fuzz_args(self):
+        args = run_data_label.build_parser().parse_args(["--rate", "20", "fuzz", "--total", "1000", "--rate", "50"])
+
+        assert args.command == "fuzz"
+        assert args.total == 1000
+        assert args.fuzz_rate == 50.0
+        assert args.fuzz_concurrency == 64
+        # 顶层 --rate 只作用于标准测试流程
+        assert args.rate == 20.0
+        with pytest.raises(SystemExit):
+            run_data_label.build_parser().parse_args(["fuzz", "--total", "0"])
+
+    @pytest.mark.parametrize("argv", [["--mix", "cookie=1"], ["--rate", "0"], ["--skip", "deploy"], ["--format", "pdf"]])
+    def test_parse_args_rejects(self, argv):
+        with pytest.raises(SystemExit):
+            run_data_label.build_parser().parse_args(argv)
+
+    def test_select_specifications(self):
+        specifications = [("GB/T 35273", 1), ("JR/T 0197", 3)]
+
+        assert run_data_label.select_specifications(specifications, None) == specifications
+        assert run_data_label.select_specifications(specifications, ["3", "GB/T 35273", "1"]) == [
+            ("JR/T 0197", 3),
+            ("GB/T 35273", 1),
+        ]
+        with pytest.raises(ValueError):
+            run_data_label.select_specifications(specifications, ["GB/T 99999"])
+
+    def test_start_up_time(self):
+        # 第一次运行可能需要编译数据集缓存, 计时第二次
+        for _ in range(2):
+            started = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "run_data_label.py", "--list-specs"], cwd=ROOT, capture_output=True, text=True
+            )
+            elapsed = time.perf_counter() - started
+
+        assert completed.returncode == 0, completed.stderr
+        assert completed.stdout.strip()
+        assert elapsed < 1.0
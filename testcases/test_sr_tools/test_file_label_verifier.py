@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_generator import LabelFileGenerator
+from utils.sr_tools.file_label_verifier import FileLabelVerifier
+from utils.sr_tools.label_compare import compare_file_label
+
+
+class FakeApione:
+    """文件资产列表为空, 按名称只能查到 found 中的文件"""
+
+    def __init__(self, found=()):
+        self.found = set(found)
+        self.detail_calls = []
+
+    async def iter_file_assets(self, **kwargs):
+        return
+        yield
+
+    async def get_file_asset_id(self, file_name, file_md5=None):
+        return 7 if file_name in self.found else None
+
+    async def get_file_asset_label_detail(self, file_id):
+        assert file_id is not None
+        self.detail_calls.append(file_id)
+        return {"姓名": 1}
+
+
+class TestFileLabelVerifier:
+    """本地测试文件索引测试"""
+
+    labels = [
+        {"id": "L1", "name": "姓名", "file_data": ["张小红"]},
+        {"id": "L2", "name": "银行_卡号", "file_data": ["6222020000000000000"]},
+    ]
+
+    def test_index_from_manifest(self, tmp_path, monkeypatch):
+        output_dir = tmp_path / "spec"
+        LabelFileGenerator(str(output_dir), formats=(".txt", ".csv"), max_workers=1).generate(self.labels)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("清单中的文件不应重新计算 md5")
+
+        monkeypatch.setattr(FileUtils, "calculate_file_md5", fail)
+        files_by_label = FileLabelVerifier.index_local_files(str(output_dir))
+
+        assert sorted(files_by_label) == ["姓名", "银行_卡号"]
+        names = [f.name for f in files_by_label["银行_卡号"]]
+        assert names == ["数据标签识别_银行_卡号.csv", "数据标签识别_银行_卡号.txt"]
+
+    def test_fallback_for_modified_files(self, tmp_path):
+        output_dir = tmp_path / "spec"
+        LabelFileGenerator(str(output_dir), formats=(".txt",), max_workers=1).generate(self.labels)
+        modified = output_dir / "数据标签识别_姓名.txt"
+        modified.write_text("测试数据:\n李娜\n", encoding="utf-8")
+        (output_dir / "数据标签识别_年龄.txt").write_text("18岁", encoding="utf-8")
+
+        files_by_label = FileLabelVerifier.index_local_files(str(output_dir))
+
+        assert sorted(files_by_label) == ["姓名", "年龄", "银行_卡号"]
+        for local_files in files_by_label.values():
+            for local_file in local_files:
+                assert local_file.md5 == FileUtils.calculate_file_md5(local_file.path)
+                assert os.path.dirname(local_file.path) == str(output_dir)
+
+    @pytest.mark.asyncio
+    async def test_missing_file_asset_skips_detail(self, tmp_path):
+        output_dir = tmp_path / "spec"
+        LabelFileGenerator(str(output_dir), formats=(".txt", ".csv"), max_workers=1).generate(self.labels[:1])
+        apione = FakeApione(found=["数据标签识别_姓名.txt"])
+
+        details = await FileLabelVerifier(apione).verify(str(output_dir), ["姓名"])
+
+        assert apione.detail_calls == [7]
+        by_ext = {detail.file.ext: detail for detail in details["姓名"]}
+        assert by_ext[".csv"].file_asset_id is None
+        assert dict(by_ext[".csv"].label_detail) == {}
+        result = compare_file_label(self.labels[0], details["姓名"])
+        assert result[".txt"]["matched_count"] == 1
+        assert result[".csv"]["matched_count"] == 0
+        assert result["status"] == "FAILED"
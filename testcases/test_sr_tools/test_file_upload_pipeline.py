@@ -0,0 +1,60 @@
+import hashlib
+import os
+
+from utils.file_tools.label_file_generator import LabelFileGenerator, render
+from utils.file_tools.label_file_manifest import load_manifest
+from utils.sr_tools.file_upload_pipeline import FileUploadPipeline
+
+
+class FakeHttpClient:
+    def __init__(self, fail_names=()):
+        self.uploaded = {}
+        self.fail_names = set(fail_names)
+
+    async def upload_bytes(self, filename, content, url, use_multipart=False):
+        if filename in self.fail_names:
+            raise RuntimeError("upload failed")
+        self.uploaded[filename] = content
+
+
+class TestFileUploadPipeline:
+    """边生成边上传流水线测试"""
+
+    formats = (".txt", ".csv", ".doc")
+    labels = [
+        {"id": "L1", "name": "姓名", "file_data": ["张小红"]},
+        {"id": "L2", "name": "年龄", "file_data": ["18岁"]},
+    ]
+
+    async def test_upload_from_memory(self, tmp_path):
+        http = FakeHttpClient()
+        output_dir = tmp_path / "spec"
+        generator = LabelFileGenerator(str(output_dir), formats=self.formats, max_workers=2)
+        entries = await FileUploadPipeline(http, "/api/upload", generator, interval=0).run(self.labels)
+
+        assert [entry.file_name for entry in entries] == [
+            f"数据标签识别_{label['name']}{ext}" for label in self.labels for ext in self.formats
+        ]
+        for entry in entries:
+            content = http.uploaded[entry.file_name]
+            assert entry.md5 == hashlib.md5(content).hexdigest()
+            assert content == render(entry.ext, "测试数据:\n" + ("张小红" if entry.label_id == "L1" else "18岁") + "\n")
+        # 未要求归档时不落盘
+        assert not output_dir.exists()
+
+    async def test_archive_and_failures(self, tmp_path):
+        http = FakeHttpClient(fail_names={"数据标签识别_年龄.csv"})
+        output_dir = tmp_path / "spec"
+        generator = LabelFileGenerator(str(output_dir), formats=self.formats, max_workers=1)
+        pipeline = FileUploadPipeline(http, "/api/upload", generator, archive=True, interval=0)
+        entries = await pipeline.run(self.labels)
+
+        assert [entry.file_name for entry in pipeline.failed] == ["数据标签识别_年龄.csv"]
+        assert sorted(entry.file_name for entry in entries) == sorted(http.uploaded)
+        assert len(entries) == 5
+        # 上传失败的文件仍归档在本地
+        archived = entries + pipeline.failed
+        assert sorted(os.listdir(output_dir)) == sorted(entry.file_name for entry in archived)
+        manifest = load_manifest(generator.manifest_path)
+        assert [manifest[entry.file_name].md5 for entry in archived] == [entry.md5 for entry in archived]
+        assert pipeline.report()["upload"].processed == 6
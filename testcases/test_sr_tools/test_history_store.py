@@ -0,0 +1,77 @@
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.report_tools.history_store import RunHistoryStore
+from utils.sr_tools.file_label_verifier import FileLabelDetail, LocalTestFile
+from utils.sr_tools.label_compare import compare_api_label, compare_file_label
+
+
+def make_detail(body=None):
+    return ApiAssetLabelDetail(
+        request={"start_line": None, "headers": None, "body": body},
+        response={"start_line": None, "headers": None, "body": None},
+        storage_state=1,
+    )
+
+
+class TestRunHistoryStore:
+    """运行历史存储测试"""
+
+    name_label = {"id": "L1", "name": "姓名", "body": [{"name": "李娜"}]}
+    age_label = {"id": "L2", "name": "年龄", "body": [{"age": "18"}]}
+
+    def record_run(self, store, name_found: bool, age_found: bool) -> str:
+        run_id = store.start_run()
+        name_body = {"姓名": {"count": 1, "contents": [{"name": "李娜"}]}} if name_found else None
+        age_body = {"年龄": {"count": 1, "contents": [{"age": "18"}]}} if age_found else None
+        store.record_api_result(run_id, "spec", compare_api_label(self.name_label, make_detail(name_body)))
+        store.record_api_result(run_id, "spec", compare_api_label(self.age_label, make_detail(age_body)))
+        store.finish_run(run_id)
+        return run_id
+
+    def test_regressions_and_fixes(self, tmp_path):
+        with RunHistoryStore(str(tmp_path / "history.db")) as store:
+            first = self.record_run(store, name_found=True, age_found=False)
+            second = self.record_run(store, name_found=False, age_found=True)
+
+            assert store.previous_run(second, "spec") == first
+            assert store.previous_run(first) is None
+
+            run_diff = store.diff(first, second)
+            assert [(c.label_id, c.part, c.location) for c in run_diff.regressions] == [
+                ("L1", "request", "body")
+            ]
+            assert [(c.label_id, c.after_matched) for c in run_diff.fixes] == [("L2", 1)]
+            assert store.diff(first, second, spec="other").regressions == []
+
+    def test_over_detection_is_regression(self, tmp_path):
+        with RunHistoryStore(str(tmp_path / "history.db")) as store:
+            first = self.record_run(store, name_found=True, age_found=True)
+            second = store.start_run()
+            over = {"姓名": {"count": 2, "contents": [{"name": "李娜"}, {"name": "张三"}]}}
+            store.record_api_result(second, "spec", compare_api_label(self.name_label, make_detail(over)))
+
+            run_diff = store.diff(first, second)
+            assert [(c.label_id, c.location, c.after_matched) for c in run_diff.regressions] == [
+                ("L1", "body", 1)
+            ]
+
+    def test_file_results_persist(self, tmp_path):
+        db_path = str(tmp_path / "history.db")
+        local_file = LocalTestFile("/tmp/a.csv", "数据标签识别_姓名.csv", ".csv", "md5", "姓名")
+        data_label = {"id": "L1", "name": "姓名", "file_data": ["李娜"]}
+        with RunHistoryStore(db_path) as store:
+            first = store.start_run()
+            store.record_file_result(
+                first, "spec", compare_file_label(data_label, [FileLabelDetail(local_file, 1, {"姓名": 1})])
+            )
+            second = store.start_run()
+            store.record_file_result(
+                second, "spec", compare_file_label(data_label, [FileLabelDetail(local_file, 1, {"姓名": 0})])
+            )
+
+        # 重新打开后历史仍在
+        with RunHistoryStore(db_path) as store:
+            assert [run["run_id"] for run in store.list_runs()] == [second, first]
+            regressions = store.diff(first, second).regressions
+            assert [(c.kind, c.location, c.before_matched, c.after_matched) for c in regressions] == [
+                ("file", ".csv", 1, 0)
+            ]
@@ -0,0 +1,158 @@
+import json
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.file_tools.label_file_manifest import ManifestEntry
+from utils.sr_tools.file_label_verifier import FileLabelDetail, LocalTestFile
+from utils.sr_tools.label_compare import (
+    CompareRules,
+    canonicalize,
+    compare_api_label,
+    compare_file_label,
+    freeze_label_detail,
+)
+
+
+def make_detail(body=None):
+    return ApiAssetLabelDetail(
+        request={"start_line": None, "headers": None, "body": body},
+        response={"start_line": None, "headers": None, "body": None},
+        storage_state=1,
+    )
+
+
+class TestLabelCompare:
+    """API 标签对比引擎测试"""
+
+    data_label = {
+        "id": "Srhida000001",
+        "name": "姓名",
+        "body": [{"employeename": "李娜"}, {"employee_name": "吴京"}, "汉族"],
+    }
+
+    def test_canonicalize_ignores_key_order(self):
+        assert canonicalize({"a": "1", "b": "2"}) == canonicalize({"b": "2", "a": "1"})
+        assert canonicalize(" 汉族 ") == canonicalize("汉族")
+
+    def test_all_matched(self):
+        detail = make_detail(
+            {"姓名": {"count": 3, "contents": ["汉族", {"employee_name": "吴京"}, {"employeename": "李娜"}]}}
+        )
+        result = compare_api_label(self.data_label, detail)
+        assert result["request"]["status"] == "PASS"
+        assert result["request"]["matched"]["count"] == 3
+        assert result["request"]["unmatched"]["count"] == 0
+        assert result["response"]["status"] == "FAILED"
+        assert result["response"]["unmatched"]["count"] == 3
+
+    def test_unmatched_and_misidentification(self):
+        detail = make_detail(
+            {
+                "姓名": {"count": 1, "contents": [{"employeename": "李娜"}]},
+                "民族": {"count": 1, "contents": ["汉族"]},
+            }
+        )
+        request = compare_api_label(self.data_label, detail)["request"]
+        assert request["status"] == "FAILED"
+        assert request["unmatched"]["body"] == [{"employee_name": "吴京"}, "汉族"]
+        assert request["misidentification"]["body"] == {"民族": {"count": 1, "contents": ["汉族"]}}
+        assert request["misidentification"]["count"] == 1
+        # 对比不修改服务端结果
+        assert set(detail.request["body"]) == {"姓名", "民族"}
+
+    def test_over_detection_fails(self):
+        # 样本 1 条, 服务端在同一位置识别出 5 条
+        data_label = {"id": "Srhida000001", "name": "姓名", "body": [{"employeename": "李娜"}]}
+        contents = [{"employeename": "李娜"}, {"a": "张三"}, {"b": "王五"}, {"a": "张三"}, "赵六"]
+        detail = make_detail({"姓名": {"count": 5, "contents": contents}})
+
+        request = compare_api_label(data_label, detail)["request"]
+        assert request["status"] == "FAILED"
+        assert request["matched"]["count"] == 1
+        assert request["unmatched"]["count"] == 0
+        assert request["over_detected"]["body"] == contents[1:]
+        assert request["over_detected"]["count"] == 4
+
+    def test_over_detection_by_server_count(self):
+        # contents 被截断时按服务端 count 计入多识别
+        data_label = {"id": "Srhida000001", "name": "姓名", "body": [{"employeename": "李娜"}]}
+        detail = make_detail({"姓名": {"count": 3, "contents": [{"employeename": "李娜"}]}})
+
+        request = compare_api_label(data_label, detail)["request"]
+        assert request["status"] == "FAILED"
+        assert request["over_detected"]["body"] == []
+        assert request["over_detected"]["count"] == 2
+
+    def test_duplicate_samples_not_over_detected(self):
+        data_label = {"id": "Srhida000001", "name": "姓名", "body": ["李娜", "李娜"]}
+        detail = make_detail({"姓名": {"count": 2, "contents": ["李娜", " 李娜 "]}})
+
+        request = compare_api_label(data_label, detail)["request"]
+        assert request["status"] == "PASS"
+        assert request["over_detected"]["count"] == 0
+        assert request["over_detected"]["body"] is None
+
+    def test_missing_detail(self):
+        result = compare_api_label(self.data_label, None)
+        assert result["request"]["unmatched"]["count"] == 3
+        assert result["request"]["matched"]["count"] == 0
+
+    def test_frozen_detail_rescored_under_rules(self):
+        detail = freeze_label_detail(
+            make_detail(
+                {
+                    "姓名": {"count": 3, "contents": ["汉族", {"employee_name": "吴京"}, {"employeename": "李娜"}]},
+                    "民族": {"count": 1, "contents": ["汉族"]},
+                }
+            )
+        )
+        strict = compare_api_label(self.data_label, detail)["request"]
+        assert strict["status"] == "FAILED"
+        # 结果为普通副本, 可 json 序列化
+        assert json.dumps(strict, ensure_ascii=False)
+
+        relaxed = compare_api_label(
+            self.data_label, detail, CompareRules(parts=("request",), allowed_labels=frozenset({"民族"}))
+        )
+        assert relaxed["request"]["status"] == "PASS"
+        assert "response" not in relaxed
+
+    def test_send_failed_location_not_scored(self):
+        data_label = dict(self.data_label, start_line=[{"employeename": "李娜"}], send_failed=["start_line"])
+        detail = make_detail({"姓名": {"count": len(self.data_label["body"]), "contents": self.data_label["body"]}})
+        result = compare_api_label(data_label, detail)["request"]
+
+        assert result["send_failed"]["start_line"] == [{"employeename": "李娜"}]
+        assert result["send_failed"]["count"] == 1
+        assert result["unmatched"]["start_line"] is None
+        assert result["unmatched"]["count"] == 0
+        assert result["status"] == "FAILED"
+
+    def test_compare_file_label_does_not_mutate(self):
+        label_detail = {"姓名": 2, "民族": 1}
+        file_label_detail = FileLabelDetail(
+            LocalTestFile("/tmp/数据标签识别_姓名.txt", "数据标签识别_姓名.txt", ".txt", "md5", "姓名"),
+            1,
+            label_detail,
+        )
+        result = compare_file_label({"id": "Srhida000001", "name": "姓名", "file_data": ["a", "b"]}, [file_label_detail])
+        assert result[".txt"]["matched_count"] == 2
+        assert result[".txt"]["misidentification"] == {"民族": 1}
+        assert result["status"] == "FAILED"
+        assert label_detail == {"姓名": 2, "民族": 1}
+
+    def test_compare_file_label_upload_failed(self):
+        file_label_detail = FileLabelDetail(
+            LocalTestFile("/tmp/数据标签识别_姓名.txt", "数据标签识别_姓名.txt", ".txt", "md5", "姓名"), 1, {"姓名": 1}
+        )
+        failed = [
+            ManifestEntry("Srhida000001", "姓名", ".pdf", "数据标签识别_姓名.pdf", 10, 0, "md5", "hash"),
+            ManifestEntry("Srhida000002", "年龄", ".pdf", "数据标签识别_年龄.pdf", 10, 0, "md5", "hash"),
+        ]
+        data_label = {"id": "Srhida000001", "name": "姓名", "file_data": ["a"]}
+
+        assert compare_file_label(data_label, [file_label_detail])["status"] == "PASS"
+        result = compare_file_label(data_label, [file_label_detail], upload_failed=failed)
+        assert result[".pdf"]["upload_failed"] is True
+        assert result[".pdf"]["target_file"] == "数据标签识别_姓名.pdf"
+        assert result[".pdf"]["matched_count"] == 0
+        assert result["status"] == "FAILED"
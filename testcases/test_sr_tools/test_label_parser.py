@@ -0,0 +1,36 @@
+import pytest
+
+from utils.sr_tools.label_parser import parse_contents, parse_label_locations
+
+
+class TestLabelParser:
+    """标签内容解析测试"""
+
+    @pytest.mark.parametrize(
+        "contents,expected",
+        [
+            (['"employeename":"李娜"'], [{"employeename": "李娜"}]),
+            (["user_name: 钱*"], [{"user_name": "钱*"}]),
+            (['"汉族"'], ["汉族"]),
+            (["fe80::1ff:fe23:4567:890a"], ["fe80::1ff:fe23:4567:890a"]),
+            (["", "  ", "'", '""'], []),
+            (None, []),
+        ],
+    )
+    def test_parse_contents(self, contents, expected):
+        assert parse_contents(contents) == expected
+
+    def test_parse_contents_returns_fresh_dicts(self):
+        first = parse_contents(['"name":"张三"'])
+        first[0]["name"] = "changed"
+        assert parse_contents(['"name":"张三"']) == [{"name": "张三"}]
+
+    def test_parse_label_locations(self):
+        parsed = parse_label_locations(
+            {"body": [{"name": "姓名", "count": 2, "contents": ['"name":"张三"', '"name":"李四"']}]}
+        )
+        assert parsed == {
+            "start_line": None,
+            "headers": None,
+            "body": {"姓名": {"count": 2, "contents": [{"name": "张三"}, {"name": "李四"}]}},
+        }
@@ -0,0 +1,90 @@
+import numpy as np
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.report_tools.metrics_utils import ApiLabelMetrics, FileLabelMetrics
+from utils.sr_tools.file_label_verifier import FileLabelDetail, LocalTestFile
+from utils.sr_tools.label_compare import compare_api_label, compare_file_label
+
+
+def make_detail(body=None):
+    return ApiAssetLabelDetail(
+        request={"start_line": None, "headers": None, "body": body},
+        response={"start_line": None, "headers": None, "body": None},
+        storage_state=1,
+    )
+
+
+class TestLabelMetrics:
+    """标签识别指标测试"""
+
+    name_label = {"id": "L1", "name": "姓名", "body": [{"name": "李娜"}, {"name": "吴京"}]}
+    age_label = {"id": "L2", "name": "年龄", "body": [{"age": "18"}]}
+
+    def api_results(self):
+        return [
+            # 姓名: 识别出 1 条, 漏掉 1 条, 同时被识别为年龄
+            compare_api_label(
+                self.name_label,
+                make_detail(
+                    {
+                        "姓名": {"count": 1, "contents": [{"name": "李娜"}]},
+                        "年龄": {"count": 1, "contents": [{"name": "吴京"}]},
+                    }
+                ),
+            ),
+            # 年龄: 全部识别
+            compare_api_label(
+                self.age_label, make_detail({"年龄": {"count": 1, "contents": [{"age": "18"}]}})
+            ),
+        ]
+
+    def test_api_summary_and_per_label(self):
+        metrics = ApiLabelMetrics(self.api_results())
+        summary = metrics.summary()
+        assert summary["request_pass"] == 1
+        assert summary["request_fail"] == 1
+        assert summary["request_mis"] == 1
+        assert summary["response_fail"] == 2
+
+        per_label = metrics.per_label("request")
+        assert per_label["tp"].tolist() == [1, 1]
+        assert per_label["fn"].tolist() == [1, 0]
+        assert per_label["fp"].tolist() == [0, 1]
+        assert np.allclose(per_label["recall"], [0.5, 1.0])
+
+    def test_send_failed_location_not_counted(self):
+        # 请求头流量发送失败: 既不计为命中也不计为漏识别
+        data_label = dict(self.age_label, headers=[{"age": "18"}], send_failed=["headers"])
+        result = compare_api_label(data_label, make_detail({"年龄": {"count": 1, "contents": [{"age": "18"}]}}))
+        per_label = ApiLabelMetrics([result]).per_label("request")
+
+        assert result["request"]["status"] == "FAILED"
+        assert (per_label["tp"].tolist(), per_label["fn"].tolist()) == ([1], [0])
+
+    def test_api_confusion(self):
+        metrics = ApiLabelMetrics(self.api_results())
+        matrix = metrics.confusion_matrix()
+        assert matrix.tolist() == [[1, 1], [0, 1]]
+        true_idx, pred_idx, counts = metrics.confusion_pairs()
+        assert (true_idx.tolist(), pred_idx.tolist(), counts.tolist()) == ([0], [1], [1])
+
+    def test_file_summary(self):
+        local_file = LocalTestFile("/tmp/a.csv", "数据标签识别_姓名.csv", ".csv", "md5", "姓名")
+        file_result = compare_file_label(
+            {"id": "L1", "name": "姓名", "file_data": ["李娜", "吴京"]},
+            [FileLabelDetail(local_file, 1, {"姓名": 2, "民族": 1})],
+        )
+        summary = FileLabelMetrics([file_result]).summary()
+        assert summary["total_fail"] == 1
+        assert summary["file_stats"][".csv"] == {"pass": 1, "fail": 0, "mis": 1}
+        assert summary["file_stats"][".pdf"]["pass"] == 0
+
+    def test_file_summary_counts_doc(self):
+        # .doc 失败时既影响状态, 也出现在按文件类型的统计中
+        local_file = LocalTestFile("/tmp/a.doc", "数据标签识别_姓名.doc", ".doc", "md5", "姓名")
+        file_result = compare_file_label(
+            {"id": "L1", "name": "姓名", "file_data": ["李娜"]}, [FileLabelDetail(local_file, 1, {})]
+        )
+        summary = FileLabelMetrics([file_result]).summary()
+        assert file_result["status"] == "FAILED"
+        assert summary["file_stats"][".doc"] == {"pass": 0, "fail": 1, "mis": 0}
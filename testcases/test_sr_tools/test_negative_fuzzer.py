@@ -0,0 +1,166 @@
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pytest
+
+from utils.data_tools.pii_generator import PiiGenerator
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.apione_client import ApioneClient
+from utils.sr_tools.negative_fuzzer import (
+    NegativeFuzzer,
+    NegativePayloadFactory,
+    build_fuzz_report,
+    near_miss,
+    run_negative_fuzz,
+    sweep_fuzz_assets,
+)
+
+ID_CARD_WEIGHTS = [7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2]
+
+BASE_DATA_LABELS = {
+    "L1": {"name": "身份证号码", "body": ["110105199003071234"]},
+    "L2": {"name": "手机号", "body": ["15112345678"]},
+}
+PII = PiiGenerator.from_base_data_labels(BASE_DATA_LABELS)
+
+
+def id_card_valid(value: str) -> bool:
+    if not re.fullmatch(r"\d{17}[\dX]", value):
+        return False
+    total = sum(int(ch) * weight for ch, weight in zip(value[:17], ID_CARD_WEIGHTS))
+    return "10X98765432"[total % 11] == value[17]
+
+
+class FakeApione:
+    auto_merge_disabled = ApioneClient.auto_merge_disabled
+
+    def __init__(self, assets):
+        self.assets = assets
+        self.filters = None
+        self.auto_merge = []
+
+    async def update_auto_merge_config(self, turn_on=False):
+        self.auto_merge.append(turn_on)
+
+    async def iter_api_assets(self, **filters):
+        self.filters = filters
+        assert self.auto_merge == [False], "遍历资产时自动合并应处于关闭状态"
+        for path, data_labels in self.assets:
+            if isinstance(data_labels, Exception):
+                raise data_labels
+            yield SimpleNamespace(http_path=path, data_labels=data_labels)
+
+
+class TestNegativeFuzzer:
+    """负样本模糊测试: 变异、请求构造、发送与误识别汇总"""
+
+    def test_near_miss_breaks_checksums(self):
+        values = PII["L1"].generate(2000)
+        mutated = near_miss(values, np.random.default_rng(0)).tolist()
+
+        assert all(original != changed for original, changed in zip(values.tolist(), mutated))
+        # 变异后的身份证号几乎都不再合法(改首位数字时仍可能碰巧合法)
+        assert sum(id_card_valid(value) for value in mutated) < 2000 * 0.05
+        assert {len(value) for value in mutated} == {17, 18, 19}
+
+    def test_payload_factory(self):
+        def make_factory():
+            pii = PiiGenerator.from_base_data_labels(BASE_DATA_LABELS)
+            return NegativePayloadFactory(pii, seed=1, label_ids=["L1", "L2"], run_id="run1", buckets=4)
+
+        requests = make_factory().batch(400)
+
+        assert len(requests) == 400
+        paths = [path for path, _ in requests]
+        assert all(re.fullmatch(r"/fuzz_test/run1/(label_free|near_miss/L[12])/[0-3]", path) for path in paths)
+        assert 100 < sum("label_free" in path for path in paths) < 300
+        bodies = [json.loads(body) for _, body in requests]
+        assert all(list(body) == ["data", "value", "text", "content"] for body in bodies)
+        for path, body in zip(paths, bodies):
+            if "label_free" in path:
+                assert not any(ch.isdigit() for value in body.values() for ch in value)
+        # 相同种子构造相同的请求
+        assert make_factory().batch(400) == requests
+
+    async def test_send_at_rate_and_report(self):
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(404 if len(received) % 10 == 0 else 200)
+
+        http = AsyncHttpClient("http://target")
+        http.client = httpx.AsyncClient(base_url="http://target", transport=httpx.MockTransport(handler))
+        factory = NegativePayloadFactory(PII, run_id="run2", buckets=2)
+        started = time.perf_counter()
+        stats = await NegativeFuzzer(http, factory, rate=400, concurrency=8, batch_size=50).run(200)
+        elapsed = time.perf_counter() - started
+        await http.close()
+
+        assert stats.sent == len(received) == 200
+        assert stats.status_codes == {200: 180, 404: 20}
+        assert sum(stats.path_counts.values()) == 200
+        # 按目标速率发送: 200 个请求约 0.5s
+        assert elapsed >= 0.45
+
+        fired_path = "/fuzz_test/run2/near_miss/L1/0"
+        free_path = "/fuzz_test/run2/label_free/1"
+        apione = FakeApione(
+            [
+                ("target" + fired_path, [{"name": "身份证号码"}, {"name": "银行卡号"}]),
+                (free_path, ["银行卡号"]),
+                ("/fuzz_test/other/label_free/0", ["姓名"]),
+                ("/fuzz_test/run2/label_free/0", None),
+            ]
+        )
+        apione.auto_merge.append(False)
+        report = await sweep_fuzz_assets(apione, stats)
+
+        assert apione.filters == {"api": "/fuzz_test/run2/"}
+        assert report.assets_swept == 3
+        fps = {fp.label_name: fp for fp in report.false_positives}
+        assert set(fps) == {"身份证号码", "银行卡号"}
+        bank = fps["银行卡号"]
+        assert bank.assets == 2
+        assert bank.requests == stats.path_counts[fired_path] + stats.path_counts[free_path]
+        assert bank.per_million == bank.requests / 200 * 1_000_000
+        assert dict(bank.by_category) == {
+            "near_miss": stats.path_counts[fired_path],
+            "label_free": stats.path_counts[free_path],
+        }
+        assert report.false_positives[0].label_name == "银行卡号"
+
+    async def test_run_toggles_auto_merge(self):
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request.url.path)
+            return httpx.Response(200)
+
+        http = AsyncHttpClient("http://target")
+        http.client = httpx.AsyncClient(base_url="http://target", transport=httpx.MockTransport(handler))
+        factory = NegativePayloadFactory(PII, run_id="run4", buckets=2)
+        apione = FakeApione([("/fuzz_test/run4/label_free/0", ["姓名"])])
+        report = await run_negative_fuzz(apione, http, factory, 20, rate=1000, concurrency=4, settle=0)
+
+        assert len(received) == report.total_requests == 20
+        assert apione.auto_merge == [False, True]
+        assert apione.filters == {"api": "/fuzz_test/run4/"}
+
+        # 遍历资产失败时同样重新开启自动合并
+        apione = FakeApione([("/fuzz_test/run4/label_free/0", RuntimeError("查询资产失败"))])
+        with pytest.raises(RuntimeError):
+            await run_negative_fuzz(apione, http, factory, 4, rate=1000, settle=0)
+        await http.close()
+
+        assert apione.auto_merge == [False, True]
+
+    def test_report_without_assets(self):
+        factory = NegativePayloadFactory(PII, run_id="run3")
+        stats = SimpleNamespace(run_id="run3", sent=0, path_counts={})
+        report = build_fuzz_report(stats, [])
+        assert report.false_positives == [] and factory.path_prefix == "/fuzz_test/run3/"
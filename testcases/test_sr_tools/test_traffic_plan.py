@@ -0,0 +1,148 @@
+import json
+import time
+from collections import Counter
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+import pytest
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.label_compare import compare_api_label
+from utils.sr_tools.traffic_plan import TrafficPlan, send_traffic_plan
+
+DATA_LABELS = [
+    {
+        "id": "Srhida000001",
+        "name": "姓名",
+        "body": [{"employeename": "李娜"}, {"employee name": "吴京"}, {"age": 25}, "张三"],
+    },
+    {"id": "Srhida000004", "name": "出生日期", "body": [{f"birth{i}": "19900101"} for i in range(5)]},
+    {"id": "Srhida000009", "name": "空样本", "body": []},
+]
+
+
+class TestTrafficPlan:
+    """API 测试流量计划: 放置位置、重复次数与期望样本"""
+
+    def test_placements_and_weights(self):
+        plan = TrafficPlan(DATA_LABELS, mix={"query": 1, "header": 2, "body": 3}, fields_per_request=2)
+        requests = list(plan)
+
+        assert plan.counts() == Counter({"query": 4, "header": 8, "body": 6})
+        assert len(plan) == len(requests) == 18
+        assert {request.url.split("?")[0] for request in requests} == {
+            "/data_label_test/Srhida000001",
+            "/data_label_test/Srhida000004",
+        }
+
+        name_requests = [request for request in requests if request.data_label_id == "Srhida000001"]
+        query = next(request for request in name_requests if request.placement == "query")
+        assert parse_qsl(urlsplit(query.url).query) == [("employeename", "李娜"), ("employee name", "吴京")]
+        # "employee name" 不是合法的请求头名称, 只放入 query
+        header = next(request for request in name_requests if request.placement == "header")
+        assert header.headers == ((b"employeename", "李娜".encode("utf-8")),)
+        body = next(request for request in name_requests if request.placement == "body")
+        assert body.method == "POST" and json.loads(body.content) == DATA_LABELS[0]["body"]
+        # 重复发送复用同一个已编码的请求
+        assert sum(request is body for request in name_requests) == 3
+
+    def test_expected_samples_score_all_locations(self):
+        plan = TrafficPlan(DATA_LABELS[:1], mix={"query": 1, "header": 1})
+        expected = plan.expected_data_labels()[0]
+
+        assert expected["start_line"] == [{"employeename": "李娜"}, {"employee name": "吴京"}]
+        assert expected["headers"] == [{"employeename": "李娜"}]
+        assert expected["body"] == []
+        assert all(request.placement != "body" for request in plan)
+
+        found = {"姓名": {"count": 2, "contents": [{"employeename": "李娜"}, {"employee name": "吴京"}]}}
+        detail = ApiAssetLabelDetail(
+            request={"start_line": found, "headers": {"姓名": {"count": 1, "contents": [{"employeename": "李娜"}]}}},
+            response={},
+            storage_state=None,
+        )
+        result = compare_api_label(expected, detail)
+        assert result["request"]["status"] == "PASS"
+        assert result["request"]["matched"]["count"] == 3
+
+    def test_default_mix_is_body_only(self):
+        plan = TrafficPlan(DATA_LABELS)
+        expected = plan.expected_data_labels()[0]
+
+        assert plan.counts() == Counter({"body": 10})
+        assert expected["start_line"] == expected["headers"] == []
+        assert expected["body"] == DATA_LABELS[0]["body"]
+
+    def test_invalid_mix(self):
+        with pytest.raises(ValueError):
+            TrafficPlan(DATA_LABELS, mix={"cookie": 1})
+        with pytest.raises(ValueError):
+            TrafficPlan(DATA_LABELS, mix={"body": -1})
+
+    async def test_send_plan(self):
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(200)
+
+        http = AsyncHttpClient("http://target")
+        http.client = httpx.AsyncClient(base_url="http://target", transport=httpx.MockTransport(handler))
+        plan = TrafficPlan(DATA_LABELS, mix={"query": 2, "header": 2, "body": 5})
+        status_codes, failed = await send_traffic_plan(http, plan, concurrency=4)
+        await http.close()
+
+        assert status_codes == {200: len(plan)}
+        assert not failed
+        assert Counter(request.method for request in received) == {"GET": 8, "POST": 10}
+        # 没有请求体的 GET 不带 JSON content-type
+        assert all("content-type" not in request.headers for request in received if request.method == "GET")
+        assert all(
+            request.headers["content-type"].startswith("application/json")
+            for request in received
+            if request.method == "POST"
+        )
+        header_requests = [request for request in received if "employeename" in request.headers]
+        assert {dict(request.headers.raw)[b"employeename"] for request in header_requests} == {"李娜".encode("utf-8")}
+        assert any(dict(request.url.params).get("employeename") == "李娜" for request in received)
+
+    async def test_send_plan_at_rate(self):
+        http = AsyncHttpClient("http://target")
+        http.client = httpx.AsyncClient(
+            base_url="http://target", transport=httpx.MockTransport(lambda request: httpx.Response(204))
+        )
+        plan = TrafficPlan(DATA_LABELS, mix={"body": 20})
+        started = time.perf_counter()
+        status_codes, _ = await send_traffic_plan(http, plan, concurrency=8, rate=200)
+        elapsed = time.perf_counter() - started
+        await http.close()
+
+        assert status_codes == {204: 40}
+        # 40 个请求按 200/s 发送约 0.2s
+        assert elapsed >= 0.18
+
+    async def test_send_plan_retries_and_reports_failures(self):
+        attempts = Counter()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts[request.url.path] += 1
+            if request.url.path.endswith("Srhida000004"):
+                return httpx.Response(500)
+            if attempts[request.url.path] == 1:
+                raise httpx.ConnectError("reset", request=request)
+            return httpx.Response(200)
+
+        http = AsyncHttpClient("http://target")
+        http.client = httpx.AsyncClient(base_url="http://target", transport=httpx.MockTransport(handler))
+        plan = TrafficPlan(DATA_LABELS, mix={"body": 2})
+        status_codes, failed = await send_traffic_plan(http, plan, concurrency=1, max_retries=2, retry_interval=0)
+        await http.close()
+
+        # 首次连接失败后重试成功; 持续 500 的请求重试 2 次后记为失败
+        assert status_codes == {200: 2, 500: 2}
+        assert attempts["/data_label_test/Srhida000004"] == 2 * 3
+        assert failed == {("Srhida000004", "body"): 2}
+        expected = {d["id"]: d for d in plan.expected_data_labels(failed)}
+        assert expected["Srhida000004"]["send_failed"] == ["body"]
+        assert "send_failed" not in expected["Srhida000001"]
@@ -2,8 +2,6 @@ import json
 from multiprocessing import Value
 from typing_extensions import runtime
 from urllib import response
-from utils.crypto_tools.crypto_utils import md5enc, rsa_encrypt
-from utils.ocr_tools.ocr_utils import recognize_captcha_from_base64
 from utils.request_tools.async_http_client import AsyncHttpClient
 from utils.log_tools.logger_utils import get_logger
 
@@ -25,6 +23,10 @@ class AuthUtils:
         """
         获取 token
         """
+        # 验证码识别(ddddocr/onnxruntime)与 RSA 加密依赖较重, 只在登录时导入
+        from utils.crypto_tools.crypto_utils import md5enc, rsa_encrypt
+        from utils.ocr_tools.ocr_utils import recognize_captcha_from_base64
+
         public_key = """-----BEGIN PUBLIC KEY-----
         MIGfMA0GCSqGSIb3DQEBAQUAA4GNADCBiQKBgQDcu1sLod7mIz0EaYW7iM/glFNL
         kTFI5n87pFW/0Xv2UFUiPoFKiBagZ0NsBtPTKzFFimmqEdbj0W0O7wwoQ1bupTo8
@@ -0,0 +1,259 @@
+"""数据标签数据集缓存: 把 base_data_label.json、specification_refer.json 与 specification.json 编译为二进制缓存
+
+缓存文件结构: MAGIC | 头部长度(8 字节, 小端) | 头部 JSON | 记录区
+    - 头部: 源文件的修改时间、大小与 sha256, 标签 ID -> 记录区偏移与长度, 标准名称 -> [(标签 ID, 标签名称)],
+      标准列表 [(标准名称, 标准 ID)]
+    - 记录区: 每个标签一条 pickle 记录
+打开时先比较源文件的修改时间与大小, 不一致再比较 sha256, 内容未变只更新头部, 否则重新编译;
+记录区通过 mmap 映射, 按标准只反序列化该标准下的标签; 只读取标准列表时不映射记录区
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.file_tools.file_utils import FileUtils
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+DATASET_VERSION = 2
+MAGIC = b"SRLABEL\x01"
+_HEADER_LENGTH = struct.Struct("<Q")
+_PREFIX_SIZE = len(MAGIC) + _HEADER_LENGTH.size
+
+BASE_DATA_LABEL_PATH = "data/data_label/base_data_label.json"
+SPECIFICATION_REFER_PATH = "data/data_label/specification_refer.json"
+SPECIFICATION_PATH = "data/data_label/specification.json"
+CACHE_PATH = "files/cache/label_dataset.bin"
+
+
+def source_key(path: str, digest: Optional[str] = None) -> Dict[str, Any]:
+    """源文件的缓存键: 修改时间、大小与 sha256"""
+    stat = os.stat(path)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+
+
+def compile_dataset(sources: Dict[str, str]) -> Tuple[Dict[str, Any], bytes]:
+    """读取源文件并编译, 返回 (头部, 记录区)
+
+    Args:
+        sources: {"base": 路径, "refer": 路径, "specification": 路径(可选)}
+    """
+    raw: Dict[str, bytes] = {}
+    for name, path in sources.items():
+        with open(path, "rb") as f:
+            raw[name] = f.read()
+    base_data_labels: Dict[str, Dict[str, Any]] = json.loads(raw["base"])
+    data_label_refers: Dict[str, List[Dict[str, str]]] = json.loads(raw["refer"])
+
+    labels: Dict[str, Tuple[int, int]] = {}
+    records = bytearray()
+    for data_label_id, data_label in base_data_labels.items():
+        record = pickle.dumps(data_label, protocol=pickle.HIGHEST_PROTOCOL)
+        labels[data_label_id] = (len(records), len(record))
+        records += record
+
+    # 只保留基础标签中存在的 ID, 保持标准中的顺序
+    specs = {
+        specification_name: [
+            (refer["id"], refer["name"]) for refer in refers or () if refer["id"] in labels
+        ]
+        for specification_name, refers in data_label_refers.items()
+    }
+    specifications = (
+        [(item["name"], item["id"]) for item in json.loads(raw["specification"])]
+        if "specification" in raw
+        else []
+    )
+    header = {
+        "version": DATASET_VERSION,
+        "sources": {
+            name: source_key(path, hashlib.sha256(raw[name]).hexdigest()) for name, path in sources.items()
+        },
+        "labels": labels,
+        "specs": specs,
+        "specifications": specifications,
+    }
+    return header, bytes(records)
+
+
+def write_dataset(cache_path: str, header: Dict[str, Any], records: bytes):
+    """原子写入缓存文件"""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(encoded)))
+        f.write(encoded)
+        f.write(records)
+    os.replace(temp_path, cache_path)
+
+
+class LabelDataset:
+    """按标准惰性加载的数据标签数据集
+
+    Args:
+        base_path: base_data_label.json 路径
+        refer_path: specification_refer.json 路径
+        cache_path: 二进制缓存路径, 不存在或失效时自动编译
+        specification_path: specification.json 路径, 提供时缓存中同时保存标准列表
+        load_records: 是否映射记录区; 只需要标准列表(如 pytest 参数化)时可关闭
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        refer_path: str,
+        cache_path: str,
+        specification_path: Optional[str] = None,
+        load_records: bool = True,
+    ):
+        self.sources = {"base": base_path, "refer": refer_path}
+        if specification_path is not None:
+            self.sources["specification"] = specification_path
+        self.cache_path = cache_path
+        self._file = None
+        self._records: Optional[mmap.mmap] = None
+        self._offset = 0
+        self.header: Dict[str, Any] = {}
+        self.open(load_records)
+
+    @classmethod
+    def default(cls, load_records: bool = True) -> "LabelDataset":
+        """项目 data/data_label 下的数据集, 缓存在 files/cache 中"""
+        return cls(
+            FileUtils.find_file_from_root(BASE_DATA_LABEL_PATH),
+            FileUtils.find_file_from_root(SPECIFICATION_REFER_PATH),
+            os.path.join(
+                FileUtils.find_file_from_root(os.path.dirname(CACHE_PATH), create_if_not_exists=True),
+                os.path.basename(CACHE_PATH),
+            ),
+            specification_path=FileUtils.find_file_from_root(SPECIFICATION_PATH),
+            load_records=load_records,
+        )
+
+    def _read_header(self) -> Tuple[Optional[Dict[str, Any]], int]:
+        """读取缓存头部, 返回 (头部, 记录区起始位置); 缓存不存在、损坏或版本不符时头部为 None"""
+        try:
+            with open(self.cache_path, "rb") as f:
+                prefix = f.read(_PREFIX_SIZE)
+                if len(prefix) != _PREFIX_SIZE or prefix[: len(MAGIC)] != MAGIC:
+                    return None, 0
+                (length,) = _HEADER_LENGTH.unpack(prefix[len(MAGIC) :])
+                header = json.loads(f.read(length))
+        except (FileNotFoundError, ValueError):
+            return None, 0
+        if not isinstance(header, dict) or header.get("version") != DATASET_VERSION:
+            return None, 0
+        return header, _PREFIX_SIZE + length
+
+    def _validate(self, header: Dict[str, Any]) -> Optional[bool]:
+        """缓存是否仍对应源文件: True 完全一致, False 内容一致但修改时间变化, None 已失效"""
+        if set(header["sources"]) != set(self.sources):
+            return None
+        unchanged = True
+        for name, path in self.sources.items():
+            cached = header["sources"][name]
+            stat = os.stat(path)
+            if stat.st_mtime_ns == cached["mtime_ns"] and stat.st_size == cached["size"]:
+                continue
+            if stat.st_size != cached["size"] or source_key(path)["sha256"] != cached["sha256"]:
+                return None
+            unchanged = False
+        return unchanged
+
+    def open(self, load_records: bool = True):
+        """校验缓存, 必要时重新编译, 然后映射记录区"""
+        self.close()
+        header, records_offset = self._read_header()
+        state = self._validate(header) if header else None
+        if state is None:
+            log.info(f"编译数据标签缓存: {self.cache_path}")
+            header, records = compile_dataset(self.sources)
+            write_dataset(self.cache_path, header, records)
+        elif state is False:
+            # 源文件被 touch 或重新检出但内容未变, 只更新缓存键
+            with open(self.cache_path, "rb") as f:
+                f.seek(records_offset)
+                records = f.read()
+            header["sources"] = {
+                name: source_key(path, header["sources"][name]["sha256"]) for name, path in self.sources.items()
+            }
+            write_dataset(self.cache_path, header, records)
+
+        self.header = header
+        if not load_records:
+            return
+        self._file = open(self.cache_path, "rb")
+        self._records = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (length,) = _HEADER_LENGTH.unpack(self._records[len(MAGIC) : _PREFIX_SIZE])
+        self._offset = _PREFIX_SIZE + length
+
+    def close(self):
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "LabelDataset":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def spec_names(self) -> List[str]:
+        return list(self.header["specs"])
+
+    @property
+    def specifications(self) -> List[Tuple[str, Any]]:
+        """specification.json 中的 (标准名称, 标准 ID), 保持原顺序"""
+        return [tuple(item) for item in self.header["specifications"]]
+
+    @property
+    def label_ids(self) -> List[str]:
+        return list(self.header["labels"])
+
+    def data_label(self, data_label_id: str) -> Dict[str, Any]:
+        """反序列化单个基础标签, 每次返回独立副本"""
+        try:
+            offset, length = self.header["labels"][data_label_id]
+        except KeyError:
+            raise ValueError(f"数据标签不存在: {data_label_id}") from None
+        if self._records is None:
+            raise RuntimeError("数据集未映射记录区, 请以 load_records=True 打开")
+        start = self._offset + offset
+        return pickle.loads(self._records[start : start + length])
+
+    def spec_data_labels(self, specification_name: str) -> List[Dict[str, Any]]:
+        """指定标准下的数据标签: 名称取标准中的名称, scope/body/file_data 取基础标签"""
+        try:
+            refers = self.header["specs"][specification_name]
+        except KeyError:
+            raise ValueError(f"标准不存在: {specification_name}") from None
+        consistent = []
+        for data_label_id, data_label_name in refers:
+            data_label = self.data_label(data_label_id)
+            consistent.append(
+                {
+                    "id": data_label_id,
+                    "name": data_label_name,
+                    "scope": data_label.get("scope", -1),
+                    "body": data_label.get("body", []),
+                    "file_data": data_label.get("file_data", []),
+                }
+            )
+        return consistent
@@ -0,0 +1,448 @@
+"""基于 base_data_label.json 样本的批量敏感数据生成
+
+每条样本被解析为一个定宽取值模式, 由若干槽位组成, 每个槽位是一个等宽字符串池:
+    - 可识别的语义片段: 身份证号(出生日期合法、校验位正确)、统一社会信用代码(校验位正确)、
+      手机号(真实号段)、16~19 位银行卡号(保留卡 BIN, Luhn 校验)、日期(保持分隔格式)、姓名
+    - 其余数字、大小写字母逐位随机, 首位非零的数字串保持非零; 中文与符号原样保留
+生成时以 NumPy 数组批量完成: 序号经仿射置换映射到槽位组合(同一模式内不重复), 拼接码点后直接视作字符串数组
+相同的种子得到完全相同的取值序列
+"""
+
+import functools
+import json
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+DIGITS = "0123456789"
+UPPERCASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+
+SURNAMES = (
+    "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈"
+    "姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤"
+)
+GIVEN_NAME_CHARS = (
+    "伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红建文辉力斌宇浩凯鹏晨欣怡梓涵子轩雨琪思博昊天宁"
+    "佳俊雪梅兰婷晓峰岚嘉颖佩瑶琳鑫淑慧诗悦然安志国庆春海燕云飞龙翔蕾薇洁珊倩"
+)
+MOBILE_PREFIXES = tuple(
+    str(prefix)
+    for prefix in (
+        *range(130, 140), 145, 147, 150, 151, 152, 153, 155, 156, 157, 158, 159, 166,
+        170, 171, 173, 175, 176, 177, 178, *range(180, 190), 191, 198, 199,
+    )
+)
+REGION_CODES = (
+    "110101", "110105", "110108", "120101", "130102", "140105", "210102", "220102", "230102", "310101",
+    "310104", "310115", "320102", "320106", "330102", "330106", "340102", "350102", "360102", "370102",
+    "410102", "420102", "430102", "440103", "440106", "440304", "440305", "450102", "500101", "510104",
+    "510107", "520102", "530102", "610103", "620102", "650102",
+)
+USCC_CHARS = "0123456789ABCDEFGHJKLMNPQRTUWXY"
+USCC_TYPES = ("11", "12", "13", "19", "21", "31", "51", "52", "53", "91", "92", "93")
+
+_ID_CARD_WEIGHTS = np.array([7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2])
+_ID_CARD_CHECKS = "10X98765432"
+_USCC_WEIGHTS = np.array([1, 3, 9, 27, 19, 26, 16, 17, 20, 29, 25, 13, 8, 24, 10, 30, 28])
+_USCC_VALUES = np.zeros(128, dtype=np.int64)
+_USCC_VALUES[[ord(ch) for ch in USCC_CHARS]] = np.arange(len(USCC_CHARS))
+
+# 仿射置换的取值空间上限, 乘数小于 2^31, 保证 uint64 运算不溢出
+UNIQUE_CAPACITY_LIMIT = 1 << 32
+DEFAULT_BATCH_SIZE = 100_000
+
+_CJK = "一-鿿"
+
+
+def _codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def _pool(values: Sequence[str]) -> np.ndarray:
+    """等宽字符串池 -> (取值数, 宽度) 的码点数组"""
+    width = len(values[0])
+    if any(len(value) != width for value in values):
+        raise ValueError(f"字符串池中的取值宽度不一致: {values[:5]}")
+    return np.frombuffer("".join(values).encode("utf-32-le"), dtype=np.uint32).reshape(len(values), width)
+
+
+def _digit_values(codes: np.ndarray) -> np.ndarray:
+    return codes.astype(np.int64) - ord("0")
+
+
+def _id_card_check(payload: np.ndarray) -> np.ndarray:
+    """GB 11643 身份证校验位"""
+    return _codes(_ID_CARD_CHECKS)[(_digit_values(payload) @ _ID_CARD_WEIGHTS) % 11]
+
+
+def _luhn_check(payload: np.ndarray) -> np.ndarray:
+    digits = _digit_values(payload)[:, ::-1]
+    doubled = digits[:, 0::2] * 2
+    total = (doubled - 9 * (doubled > 9)).sum(axis=1) + digits[:, 1::2].sum(axis=1)
+    return (10 - total % 10) % 10 + ord("0")
+
+
+def _uscc_check(payload: np.ndarray) -> np.ndarray:
+    """GB 32100 统一社会信用代码校验位"""
+    check = (31 - (_USCC_VALUES[payload] @ _USCC_WEIGHTS) % 31) % 31
+    return _codes(USCC_CHARS)[check]
+
+
+@dataclass
+class Slot:
+    """模式中的一个槽位; check 不为空时该列为校验位, 由前 check[0] 列计算"""
+
+    pool: np.ndarray
+    check: Optional[Tuple[int, Callable[[np.ndarray], np.ndarray]]] = None
+
+    @property
+    def width(self) -> int:
+        return self.pool.shape[1]
+
+
+def _literal(text: str) -> Slot:
+    return Slot(_pool([text]))
+
+
+@functools.lru_cache(maxsize=None)
+def _char_pool(chars: str) -> np.ndarray:
+    return _pool(list(chars))
+
+
+def _chars(chars: str, count: int = 1) -> List[Slot]:
+    return [Slot(_char_pool(chars)) for _ in range(count)]
+
+
+def _check(payload_width: int, fn: Callable[[np.ndarray], np.ndarray]) -> Slot:
+    return Slot(_pool(["0"]), (payload_width, fn))
+
+
+@functools.lru_cache(maxsize=None)
+def _date_pool(layout: str, start_year: int, end_year: int) -> np.ndarray:
+    """start_year ~ end_year 间的全部日期; layout 中 Y/M/D 为年/月/日, 其余字符原样保留"""
+    dates = np.arange(np.datetime64(f"{start_year}-01-01"), np.datetime64(f"{end_year + 1}-01-01"))
+    iso = np.ascontiguousarray(np.datetime_as_string(dates).astype("<U10")).view(np.uint32).reshape(-1, 10)
+    fields = {"Y": iso[:, 0:4], "M": iso[:, 5:7], "D": iso[:, 8:10]}
+    columns = [fields[ch] if ch in fields else np.full((len(iso), 1), ord(ch), np.uint32) for ch in layout]
+    return np.ascontiguousarray(np.hstack(columns))
+
+
+def _id_card_slots(match: re.Match) -> List[Slot]:
+    return [
+        Slot(_pool(REGION_CODES)),
+        Slot(_date_pool("YMD", 1950, 2009)),
+        *_chars(DIGITS, 3),
+        _check(17, _id_card_check),
+    ]
+
+
+def _uscc_slots(match: re.Match) -> List[Slot]:
+    return [
+        Slot(_pool(USCC_TYPES)),
+        Slot(_pool(REGION_CODES)),
+        *_chars(USCC_CHARS, 9),
+        _check(17, _uscc_check),
+    ]
+
+
+def _mobile_slots(match: re.Match) -> List[Slot]:
+    return [Slot(_pool(MOBILE_PREFIXES)), *_chars(DIGITS, 8)]
+
+
+def _bank_card_slots(match: re.Match) -> List[Slot]:
+    # 卡 BIN 沿用样本, 其余随机, 末位为 Luhn 校验位
+    card = match.group()
+    return [_literal(card[:6]), *_chars(DIGITS, len(card) - 7), _check(len(card) - 1, _luhn_check)]
+
+
+def _date_slots(match: re.Match) -> List[Slot]:
+    year = int(match.group(1))
+    separator = match.group(2)
+    layout = "Y年M月D日" if separator == "年" else f"Y{separator}M{separator}D"
+    return [Slot(_date_pool(layout, max(1900, year - 30), min(2099, year + 10)))]
+
+
+def _name_slots(match: re.Match) -> List[Slot]:
+    return [Slot(_char_pool(SURNAMES)), *_chars(GIVEN_NAME_CHARS, len(match.group()) - 1)]
+
+
+_DATE_BODY = r"(0[1-9]|1[0-2])\2(0[1-9]|[12]\d|3[01])"
+
+# (名称, 正则, 槽位构造, 仅适用于名称包含该关键字的标签); 按顺序匹配, 先匹配的片段优先
+SEMANTIC_RULES: Tuple[Tuple[str, re.Pattern, Callable[[re.Match], List[Slot]], Optional[str]], ...] = (
+    (
+        "id_card",
+        re.compile(r"(?<![0-9A-Za-z])\d{6}(?:19|20)\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])\d{3}[\dXx](?![0-9A-Za-z])"),
+        _id_card_slots,
+        None,
+    ),
+    ("mobile", re.compile(r"(?<!\d)1[3-9]\d{9}(?!\d)"), _mobile_slots, None),
+    ("bank_card", re.compile(r"(?<!\d)[1-9]\d{15,18}(?!\d)"), _bank_card_slots, None),
+    (
+        "uscc",
+        re.compile(r"(?<![0-9A-Z])[0-9A-HJ-NPQRTUWXY]{2}\d{6}[0-9A-HJ-NPQRTUWXY]{10}(?![0-9A-Z])"),
+        _uscc_slots,
+        None,
+    ),
+    ("date", re.compile(r"(?<!\d)((?:19|20)\d{2})([-/.]?)" + _DATE_BODY + r"(?!\d)"), _date_slots, None),
+    (
+        "date",
+        re.compile(r"((?:19|20)\d{2})(年)(0[1-9]|1[0-2])月(0[1-9]|[12]\d|3[01])日"),
+        _date_slots,
+        None,
+    ),
+    ("name", re.compile(f"(?<![{_CJK}])[{SURNAMES}][{_CJK}]{{1,2}}"), _name_slots, "姓名"),
+)
+
+
+def _generic_slots(text: str, is_end: bool) -> List[Slot]:
+    """语义片段之外的部分: 数字、字母逐位随机, 其他字符原样保留"""
+    slots: List[Slot] = []
+    literal = []
+    for run in re.finditer(r"\d+|[A-Z]+|[a-z]+|[^0-9A-Za-z]+", text):
+        value = run.group()
+        # 结尾处的域名后缀、文件扩展名等 "." 之后的字母保持不变
+        is_suffix = (
+            is_end
+            and text[run.start() - 1 : run.start()] == "."
+            and re.fullmatch(r"[A-Za-z.]*", text[run.end() :]) is not None
+        )
+        if value.isdigit():
+            pools = [DIGITS] * len(value)
+            if len(value) > 1 and value[0] != "0":
+                pools[0] = DIGITS[1:]
+        elif value.isascii() and value.isalpha() and not is_suffix:
+            pools = [UPPERCASE if value.isupper() else LOWERCASE] * len(value)
+        else:
+            literal.append(value)
+            continue
+        if literal:
+            slots.append(_literal("".join(literal)))
+            literal = []
+        slots.extend(Slot(_char_pool(chars)) for chars in pools)
+    if literal:
+        slots.append(_literal("".join(literal)))
+    return slots
+
+
+def learn_slots(sample: str, label_name: str) -> List[Slot]:
+    """识别样本中的语义片段, 其余部分按字符类别生成槽位"""
+    matches: List[Tuple[int, int, List[Slot]]] = []
+    occupied = [False] * len(sample)
+    for _, pattern, build, keyword in SEMANTIC_RULES:
+        if keyword is not None and (keyword not in label_name or "脱敏" in label_name):
+            continue
+        for match in pattern.finditer(sample):
+            if any(occupied[match.start() : match.end()]):
+                continue
+            occupied[match.start() : match.end()] = [True] * (match.end() - match.start())
+            matches.append((match.start(), match.end(), build(match)))
+    slots: List[Slot] = []
+    cursor = 0
+    for start, end, semantic_slots in sorted(matches, key=lambda item: item[0]):
+        slots.extend(_generic_slots(sample[cursor:start], is_end=False))
+        slots.extend(semantic_slots)
+        cursor = end
+    slots.extend(_generic_slots(sample[cursor:], is_end=True))
+    return slots
+
+
+def slots_signature(slots: List[Slot]) -> Tuple:
+    """槽位结构相同的样本视为同一模式"""
+    return tuple((slot.pool.shape, slot.pool.tobytes(), slot.check is not None) for slot in slots)
+
+
+class ValuePattern:
+    """由样本解析出的定宽取值模式
+
+    变化的槽位按从右到左的顺序组成混合进制的序号空间(上限 UNIQUE_CAPACITY_LIMIT),
+    第 i 个取值对应序号 (a * i + c) mod 容量, a 与容量互素, 因此在容量之内不会重复;
+    超出上限的高位槽位独立随机
+    """
+
+    def __init__(self, sample: str, slots: List[Slot], rng: np.random.Generator):
+        self.sample = sample
+        self.slots = slots
+        self.width = sum(slot.width for slot in slots)
+        self.rng = rng
+        self.unique_slots: List[int] = []
+        self.random_slots: List[int] = []
+        capacity = 1
+        for index in reversed(range(len(slots))):
+            size = len(slots[index].pool)
+            if size == 1:
+                continue
+            if capacity * size <= UNIQUE_CAPACITY_LIMIT and not self.random_slots:
+                capacity *= size
+                self.unique_slots.append(index)
+            else:
+                self.random_slots.append(index)
+        self.capacity = capacity
+        self.multiplier = 1
+        if capacity > 1:
+            while True:
+                self.multiplier = int(rng.integers(1, min(capacity, 1 << 31)))
+                if math.gcd(self.multiplier, capacity) == 1:
+                    break
+        self.offset = int(rng.integers(0, capacity))
+        self.position = 0
+
+    def generate(self, count: int) -> np.ndarray:
+        """生成 count 个取值, 返回定宽字符串数组"""
+        indices = np.arange(self.position, self.position + count, dtype=np.uint64) % np.uint64(self.capacity)
+        self.position += count
+        combination = (indices * np.uint64(self.multiplier) + np.uint64(self.offset)) % np.uint64(self.capacity)
+
+        choices: Dict[int, np.ndarray] = {}
+        for index in self.unique_slots:
+            size = np.uint64(len(self.slots[index].pool))
+            choices[index] = combination % size
+            combination //= size
+        for index in self.random_slots:
+            choices[index] = self.rng.integers(0, len(self.slots[index].pool), count)
+
+        codes = np.empty((count, self.width), dtype=np.uint32)
+        column = 0
+        for index, slot in enumerate(self.slots):
+            if slot.check is not None:
+                payload_width, fn = slot.check
+                codes[:, column] = fn(codes[:, column - payload_width : column])
+            elif index in choices:
+                codes[:, column : column + slot.width] = slot.pool[choices[index]]
+            else:
+                codes[:, column : column + slot.width] = slot.pool[0]
+            column += slot.width
+        return codes.view(f"<U{self.width}").ravel()
+
+
+def body_values(body: Sequence[Any]) -> List[str]:
+    """请求体样本中的取值: 字典取各个值, 其他直接取自身"""
+    values = []
+    for item in body:
+        for value in item.values() if isinstance(item, dict) else [item]:
+            if value is not None and str(value):
+                values.append(str(value))
+    return values
+
+
+class LabelValueGenerator:
+    """单个数据标签的取值生成器
+
+    source 为 "body" 时从请求体样本学习(取值不含上下文), 为 "file_data" 时从文件样本学习(含 "姓名：" 等上下文);
+    指定来源没有样本时使用另一来源
+    """
+
+    def __init__(self, data_label: Dict[str, Any], seed: int = 0, source: str = "body"):
+        if source not in ("body", "file_data"):
+            raise ValueError(f"不支持的样本来源: {source}")
+        self.label_id = data_label.get("id")
+        self.label_name = data_label.get("name", "")
+        self.body = data_label.get("body") or []
+        samples = {
+            "body": body_values(self.body),
+            "file_data": [value for value in data_label.get("file_data") or [] if value],
+        }
+        self.samples = samples[source] or samples["file_data" if source == "body" else "body"]
+        if not self.samples:
+            raise ValueError(f"数据标签 {self.label_id} {self.label_name} 没有可用的样本")
+
+        label_key = zlib.crc32(str(self.label_id).encode("utf-8"))
+        self.rng = np.random.default_rng([seed, label_key])
+        patterns: Dict[Tuple, ValuePattern] = {}
+        for index, sample in enumerate(self.samples):
+            slots = learn_slots(sample, self.label_name)
+            signature = slots_signature(slots)
+            if signature not in patterns:
+                patterns[signature] = ValuePattern(sample, slots, np.random.default_rng([seed, label_key, index]))
+        self.patterns = list(patterns.values())
+        self.generated = 0
+
+    @property
+    def capacity(self) -> int:
+        """不重复取值数的下限(各模式容量之和)"""
+        return sum(pattern.capacity for pattern in self.patterns)
+
+    def generate(self, count: int) -> np.ndarray:
+        """生成 count 个取值, 各模式等概率出现"""
+        self.generated += count
+        if self.generated - count <= self.capacity < self.generated:
+            log.info(f"数据标签 {self.label_name} 的唯一取值(约 {self.capacity} 个)已用尽, 之后的取值会重复")
+        if len(self.patterns) == 1:
+            return self.patterns[0].generate(count)
+        choice = self.rng.integers(0, len(self.patterns), count)
+        values = np.empty(count, dtype=f"<U{max(pattern.width for pattern in self.patterns)}")
+        for index, pattern in enumerate(self.patterns):
+            mask = choice == index
+            selected = int(mask.sum())
+            if selected:
+                values[mask] = pattern.generate(selected)
+        return values
+
+    def iter_batches(self, total: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[np.ndarray]:
+        for start in range(0, total, batch_size):
+            yield self.generate(min(batch_size, total - start))
+
+    def request_bodies(self, count: int) -> Iterator[List[Any]]:
+        """按请求体样本的结构逐个生成请求体, 其中的每个取值都替换为新生成的值"""
+        slots = sum(len(item) if isinstance(item, dict) else 1 for item in self.body) or 1
+        values = iter(self.generate(count * slots).tolist())
+        for _ in range(count):
+            if not self.body:
+                yield [next(values)]
+                continue
+            body = []
+            for item in self.body:
+                if isinstance(item, dict):
+                    body.append({key: next(values) for key in item})
+                else:
+                    body.append(next(values))
+            yield body
+
+
+class PiiGenerator:
+    """按数据标签批量生成测试数据, 可流式写出 JSONL"""
+
+    def __init__(self, data_labels: List[Dict[str, Any]], seed: int = 0, source: str = "body"):
+        self.generators: Dict[str, LabelValueGenerator] = {}
+        for data_label in data_labels:
+            try:
+                generator = LabelValueGenerator(data_label, seed, source)
+            except ValueError as e:
+                log.debug(f"跳过数据标签: {e}")
+                continue
+            self.generators[generator.label_id] = generator
+
+    @classmethod
+    def from_base_data_labels(cls, base_data_labels: Dict[str, Dict[str, Any]], **kwargs) -> "PiiGenerator":
+        """base_data_label.json 以标签 ID 为键, 转为带 id 的列表"""
+        return cls([{"id": label_id, **data_label} for label_id, data_label in base_data_labels.items()], **kwargs)
+
+    def __getitem__(self, label_id: str) -> LabelValueGenerator:
+        return self.generators[label_id]
+
+    def write_jsonl(
+        self,
+        f: TextIO,
+        count_per_label: int,
+        label_ids: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """每行一个 {"id", "name", "value"}, 按批写出, 返回写出的行数"""
+        encode = json.encoder.encode_basestring
+        written = 0
+        for label_id in label_ids or list(self.generators):
+            generator = self.generators[label_id]
+            prefix = '{"id": %s, "name": %s, "value": ' % (encode(str(label_id)), encode(generator.label_name))
+            for values in generator.iter_batches(count_per_label, batch_size):
+                f.write("".join([f"{prefix}{encode(value)}}}\n" for value in values.tolist()]))
+                written += len(values)
+        return written
@@ -1,7 +1,8 @@
 import asyncio
+import dataclasses
 import functools
 import inspect
-from typing import Any, Callable, Coroutine, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Tuple, Type, TypeVar, Union
 from utils.log_tools.logger_utils import get_logger
 T = TypeVar('T')
 log = get_logger(__name__)
@@ -37,8 +38,43 @@ def get_arg_by_name(func: Callable, args: tuple, param_name: str) -> Any:
     bound_args = sig.bind(*args)
     return bound_args.arguments.get(param_name)
 
+@functools.lru_cache(maxsize=None)
+def build_decoder(data_class: Type[T]) -> Tuple[Callable[[Dict[str, Any]], T], Callable[[Iterable[Dict[str, Any]]], List[T]]]:
+    """为 dataclass 生成 (decode, decode_many) 解码函数
+
+    - 只读取 dataclass 声明过的字段, 服务端新增的字段直接忽略
+    - 缺失的可选字段取默认值; 缺失必填字段(无默认值)时与 data_class(**item) 一样抛出 TypeError
+    - 按字段顺序生成位置参数调用, 避免 data_class(**item) 的关键字参数展开开销
+    """
+    namespace: Dict[str, Any] = {"cls": data_class}
+    args = []
+    for index, field in enumerate(f for f in dataclasses.fields(data_class) if f.init):
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default_{index}"] = field.default
+            args.append(f"get({field.name!r}, _default_{index})")
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{index}"] = field.default_factory
+            args.append(f"(item[{field.name!r}] if {field.name!r} in item else _factory_{index}())")
+        else:
+            args.append(f"item[{field.name!r}]")
+    source = (
+        "def decode(item):\n"
+        "    get = item.get\n"
+        "    try:\n"
+        f"        return cls({', '.join(args)})\n"
+        "    except KeyError as e:\n"
+        "        raise TypeError(f'{cls.__name__} 缺少必填字段: {e.args[0]!r}') from None\n"
+        "def decode_many(items):\n"
+        "    return [decode(item) for item in items if item]\n"
+    )
+    exec(source, namespace)
+    return namespace["decode"], namespace["decode_many"]
+
+
 def transform_to_data_class(data_class: Type[T]):
     """独立的数据转换装饰器函数"""
+    decode, decode_many = build_decoder(data_class)
+
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -46,7 +82,7 @@ def transform_to_data_class(data_class: Type[T]):
             if not response:
                 return None
             if isinstance(response, list):
-                return [data_class(**item) for item in response if item]
-            return data_class(**response)
+                return decode_many(response)
+            return decode(response)
         return wrapper
     return decorator
\ No newline at end of file
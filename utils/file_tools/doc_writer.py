@@ -0,0 +1,384 @@
+"""Word 97-2003 (.doc) 纯文本文档写入
+
+按 [MS-DOC] 与 [MS-CFB] 直接生成二进制文档, 不依赖 Word 程序:
+    - WordDocument 流: FIB + UTF-16LE 正文 + 字符/段落属性 FKP 页
+    - 1Table 流: 样式表、字体表、节表、文档属性(DOP)、分段表(CLX)
+    - 外层为 v3 复合文档(512 字节扇区), 两个流均补齐到 4096 字节以上, 无需 mini stream
+只写入正文与默认格式, 足以被 Word、antiword、Apache POI/Tika 等解析为纯文本
+"""
+
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SECTOR_SIZE = 512
+MINI_STREAM_CUTOFF = 4096
+
+# 复合文档扇区标记
+FREESECT = 0xFFFFFFFF
+ENDOFCHAIN = 0xFFFFFFFE
+FATSECT = 0xFFFFFFFD
+DIFSECT = 0xFFFFFFFC
+NOSTREAM = 0xFFFFFFFF
+
+# Word.Document.8 的 CLSID {00020906-0000-0000-C000-000000000046}
+WORD_DOCUMENT_CLSID = bytes.fromhex("0609020000000000c000000000000046")
+
+# FIB 常量
+FIB_IDENT = 0xA5EC
+FIB_VERSION = 0x00C1
+FIB_SIZE = 900
+FIB_RG_FC_LCB_OFFSET = 154
+FIB_CCP_TEXT_OFFSET = 0x4C
+FIB_CB_MAC_OFFSET = 0x40
+TEXT_OFFSET = 0x400
+
+# FibRgFcLcb97 中用到的 (fc, lcb) 序号
+FC_LCB_STSHF = 1
+FC_LCB_PLCF_SED = 6
+FC_LCB_PLCF_BTE_CHPX = 12
+FC_LCB_PLCF_BTE_PAPX = 13
+FC_LCB_STTBF_FFN = 15
+FC_LCB_DOP = 31
+FC_LCB_CLX = 33
+FC_LCB_COUNT = 93
+
+# 每个段落 FKP 页最多容纳的段落数: 4 * (n + 1) + 13 * n <= PAPX_IN_FKP_OFFSET
+PAPX_IN_FKP_OFFSET = 506
+PARAGRAPHS_PER_FKP = (PAPX_IN_FKP_OFFSET - 4) // 17
+
+DOP_SIZE = 500
+LID_ZH_CN = 0x0804
+
+
+def _pad(data: bytes, boundary: int) -> bytes:
+    remainder = len(data) % boundary
+    return data if remainder == 0 else data + b"\x00" * (boundary - remainder)
+
+
+def normalize_text(text: str) -> str:
+    """换行统一为段落标记 \\r, 文档必须以段落标记结束"""
+    text = text.replace("\r\n", "\r").replace("\n", "\r")
+    if not text.endswith("\r"):
+        text += "\r"
+    return text
+
+
+def _paragraph_ends(encoded: bytes, fc_text: int) -> List[int]:
+    """每个段落结束位置(段落标记之后)的文件偏移"""
+    ends = []
+    for i in range(0, len(encoded), 2):
+        if encoded[i] == 0x0D and encoded[i + 1] == 0x00:
+            ends.append(fc_text + i + 2)
+    return ends
+
+
+def _chpx_fkp(fc_start: int, fc_end: int) -> bytes:
+    """字符属性 FKP: 单个 run, 使用默认字符属性"""
+    page = bytearray(SECTOR_SIZE)
+    struct.pack_into("<II", page, 0, fc_start, fc_end)
+    page[8] = 0  # rgb[0] = 0: 默认属性
+    page[511] = 1  # crun
+    return bytes(page)
+
+
+def _papx_fkp(fcs: List[int]) -> bytes:
+    """段落属性 FKP: 每个段落一个 BxPap, 共享同一个 PapxInFkp(样式 Normal, 无 sprm)"""
+    count = len(fcs) - 1
+    page = bytearray(SECTOR_SIZE)
+    struct.pack_into(f"<{len(fcs)}I", page, 0, *fcs)
+    bx_offset = 4 * len(fcs)
+    for i in range(count):
+        # BxPap: bOffset(字偏移) + 12 字节 PHE
+        page[bx_offset + 13 * i] = PAPX_IN_FKP_OFFSET // 2
+    # PapxInFkp: cb = 0, cb' = 1, grpprlInPapx = istd(0)
+    page[PAPX_IN_FKP_OFFSET : PAPX_IN_FKP_OFFSET + 4] = b"\x00\x01\x00\x00"
+    page[511] = count  # cpara
+    return bytes(page)
+
+
+def _plc(cps: List[int], data: List[bytes]) -> bytes:
+    return struct.pack(f"<{len(cps)}I", *cps) + b"".join(data)
+
+
+def _stylesheet() -> bytes:
+    """仅包含 Normal 段落样式的样式表(STSH)"""
+    sti_max = 0x0F
+    stshif = struct.pack(
+        "<6H3H",
+        1,  # cstd
+        0x000A,  # cbSTDBaseInFile
+        0x0001,  # fStdStylenamesWritten
+        sti_max,  # stiMaxWhenSaved
+        0x000F,  # istdMaxFixedWhenSaved
+        0,  # nVerBuiltInNamesWhenSaved
+        0, 0, 0,  # rgftcStandardChpStsh
+    )
+    stshi = stshif + struct.pack("<H", 0)  # ftcBi
+    stshi += struct.pack("<H", 4) + b"\x00" * (4 * sti_max)  # StshiLsd
+
+    name = "Normal".encode("utf-16-le")
+    # 段落样式有两个 UPX: UpxPapx(istd) 与 UpxChpx(空)
+    upx = struct.pack("<HH", 2, 0) + struct.pack("<H", 0)
+    std_body_size = 10 + 2 + len(name) + 2 + len(upx)
+    std = (
+        struct.pack(
+            "<5H",
+            0x0000,  # sti = 0 (Normal)
+            0x0001 | (0x0FFF << 4),  # stk = 段落样式, istdBase = 无
+            0x0002 | (0x0000 << 4),  # cupx = 2, istdNext = 0
+            std_body_size,  # bchUpe
+            0,  # grfstd
+        )
+        + struct.pack("<H", len(name) // 2)
+        + name
+        + b"\x00\x00"
+        + upx
+    )
+    return struct.pack("<H", len(stshi)) + stshi + struct.pack("<H", len(std)) + std
+
+
+def _ffn(name: str, ffid: int, chs: int) -> bytes:
+    xsz = name.encode("utf-16-le") + b"\x00\x00"
+    body = struct.pack("<BHBB", ffid, 400, chs, 0) + b"\x00" * 10 + b"\x00" * 24 + xsz
+    return struct.pack("<B", len(body)) + body
+
+
+def _font_table() -> bytes:
+    fonts = [
+        _ffn("Times New Roman", 0x16, 0x00),  # 可变宽度 TrueType, roman
+        _ffn("SimSun", 0x06, 0x86),  # 可变宽度 TrueType, GB2312
+        _ffn("Arial", 0x26, 0x00),  # 可变宽度 TrueType, swiss
+    ]
+    return struct.pack("<HH", len(fonts), 0) + b"".join(fonts)
+
+
+def _dop() -> bytes:
+    dop = bytearray(DOP_SIZE)
+    struct.pack_into("<H", dop, 0x0A, 720)  # dxaTab: 默认制表位 0.5 英寸
+    return bytes(dop)
+
+
+def _fib(
+    fc_lcb: Dict[int, Tuple[int, int]], ccp_text: int, cb_mac: int, fc_min: int, fc_mac: int
+) -> bytes:
+    fib = bytearray(FIB_SIZE)
+    # FibBase: fWhichTblStm(1Table) | fExtChar
+    struct.pack_into("<HHHHHHH", fib, 0, FIB_IDENT, FIB_VERSION, 0, LID_ZH_CN, 0, 0x1200, 0x00BF)
+    # 旧版读取器使用的 fcMin / fcMac
+    struct.pack_into("<II", fib, 0x18, fc_min, fc_mac)
+    struct.pack_into("<H", fib, 0x20, 14)  # csw
+    struct.pack_into("<H", fib, 0x22 + 13 * 2, LID_ZH_CN)  # lidFE
+    struct.pack_into("<H", fib, 0x3E, 22)  # cslw
+    struct.pack_into("<I", fib, FIB_CB_MAC_OFFSET, cb_mac)
+    struct.pack_into("<I", fib, FIB_CCP_TEXT_OFFSET, ccp_text)
+    struct.pack_into("<H", fib, FIB_RG_FC_LCB_OFFSET - 2, FC_LCB_COUNT)  # cbRgFcLcb
+    for index, (fc, lcb) in fc_lcb.items():
+        struct.pack_into("<II", fib, FIB_RG_FC_LCB_OFFSET + 8 * index, fc, lcb)
+    # cswNew = 0
+    struct.pack_into("<H", fib, FIB_RG_FC_LCB_OFFSET + 8 * FC_LCB_COUNT, 0)
+    return bytes(fib)
+
+
+def build_word_streams(text: str) -> Dict[str, bytes]:
+    """生成 WordDocument 与 1Table 两个流"""
+    encoded = normalize_text(text).encode("utf-16-le")
+    ccp_text = len(encoded) // 2
+    fc_text = TEXT_OFFSET
+    fc_text_end = fc_text + len(encoded)
+
+    # WordDocument: FIB | 正文 | CHPX FKP | PAPX FKP ...
+    body = b"\x00" * (TEXT_OFFSET - FIB_SIZE) + encoded
+    # FKP 页必须按 512 字节对齐
+    body += b"\x00" * (-(FIB_SIZE + len(body)) % SECTOR_SIZE)
+    first_page = (FIB_SIZE + len(body)) // SECTOR_SIZE
+    chpx_page = first_page
+
+    paragraph_fcs = [fc_text] + _paragraph_ends(encoded, fc_text)
+    papx_pages, papx_first_fcs, papx_pns = [], [], []
+    for start in range(0, len(paragraph_fcs) - 1, PARAGRAPHS_PER_FKP):
+        fcs = paragraph_fcs[start : start + PARAGRAPHS_PER_FKP + 1]
+        papx_pages.append(_papx_fkp(fcs))
+        papx_first_fcs.append(fcs[0])
+        papx_pns.append(chpx_page + 1 + len(papx_pns))
+
+    word_document = body + _chpx_fkp(fc_text, fc_text_end) + b"".join(papx_pages)
+    cb_mac = FIB_SIZE + len(word_document)
+
+    # 1Table: STSH | SttbfFfn | PlcfSed | PlcfBteChpx | PlcfBtePapx | DOP | CLX
+    parts: List[Tuple[int, bytes]] = [
+        (FC_LCB_STSHF, _stylesheet()),
+        (FC_LCB_STTBF_FFN, _font_table()),
+        # 单节, SED.fcSepx = 0xFFFFFFFF 表示默认节属性
+        (FC_LCB_PLCF_SED, _plc([0, ccp_text], [struct.pack("<HIHI", 0, 0xFFFFFFFF, 0, 0xFFFFFFFF)])),
+        (FC_LCB_PLCF_BTE_CHPX, _plc([fc_text, fc_text_end], [struct.pack("<I", chpx_page)])),
+        (
+            FC_LCB_PLCF_BTE_PAPX,
+            _plc(papx_first_fcs + [fc_text_end], [struct.pack("<I", pn) for pn in papx_pns]),
+        ),
+        (FC_LCB_DOP, _dop()),
+        # CLX: 单个 Pcdt, 一个未压缩(UTF-16LE)的 piece 覆盖全部正文
+        (
+            FC_LCB_CLX,
+            b"\x02"
+            + struct.pack("<I", 4 * 2 + 8)
+            + _plc([0, ccp_text], [struct.pack("<HIH", 0, fc_text, 0)]),
+        ),
+    ]
+    table = bytearray()
+    fc_lcb: Dict[int, Tuple[int, int]] = {}
+    for index, data in parts:
+        fc_lcb[index] = (len(table), len(data))
+        table += data
+        if len(table) % 2:
+            table += b"\x00"
+
+    fib = _fib(fc_lcb, ccp_text, cb_mac, fc_text, fc_text_end)
+    return {
+        "WordDocument": (fib + word_document).ljust(MINI_STREAM_CUTOFF, b"\x00"),
+        "1Table": bytes(table).ljust(MINI_STREAM_CUTOFF, b"\x00"),
+    }
+
+
+def _directory_entry(
+    name: str,
+    entry_type: int,
+    color: int = 1,
+    left: int = NOSTREAM,
+    right: int = NOSTREAM,
+    child: int = NOSTREAM,
+    clsid: bytes = b"\x00" * 16,
+    start: int = ENDOFCHAIN,
+    size: int = 0,
+) -> bytes:
+    encoded = name.encode("utf-16-le") + b"\x00\x00" if name else b""
+    return struct.pack(
+        "<64sHBBIII16sIQQIQ",
+        encoded,
+        len(encoded),
+        entry_type,
+        color,
+        left,
+        right,
+        child,
+        clsid,
+        0,
+        0,
+        0,
+        start,
+        size,
+    )
+
+
+def _stream_order(names: List[str]) -> List[str]:
+    """复合文档目录的比较规则: 先比较长度, 再比较大写名称"""
+    return sorted(names, key=lambda n: (len(n), n.upper()))
+
+
+def write_compound_file(streams: Dict[str, bytes], root_clsid: bytes = b"\x00" * 16) -> bytes:
+    """写出 v3 复合文档, 所有流都必须不小于 4096 字节(不使用 mini stream)"""
+    for name, data in streams.items():
+        if len(data) < MINI_STREAM_CUTOFF:
+            raise ValueError(f"流 {name} 小于 {MINI_STREAM_CUTOFF} 字节")
+
+    # 数据扇区
+    sectors = bytearray()
+    fat: List[int] = []
+    starts: Dict[str, int] = {}
+    for name, data in streams.items():
+        padded = _pad(data, SECTOR_SIZE)
+        count = len(padded) // SECTOR_SIZE
+        starts[name] = len(fat)
+        fat.extend(range(len(fat) + 1, len(fat) + count))
+        fat.append(ENDOFCHAIN)
+        sectors += padded
+
+    # 目录: 子节点组成平衡的二叉查找树, 全部标记为黑色
+    ordered = _stream_order(list(streams))
+    ids = {name: i + 1 for i, name in enumerate(ordered)}
+
+    def build_tree(names: List[str]) -> int:
+        if not names:
+            return NOSTREAM
+        mid = len(names) // 2
+        node = names[mid]
+        children[node] = (build_tree(names[:mid]), build_tree(names[mid + 1 :]))
+        return ids[node]
+
+    children: Dict[str, Tuple[int, int]] = {}
+    root_child = build_tree(ordered)
+    entries = [_directory_entry("Root Entry", 5, child=root_child, clsid=root_clsid)]
+    for name in ordered:
+        left, right = children[name]
+        entries.append(
+            _directory_entry(name, 2, left=left, right=right, start=starts[name], size=len(streams[name]))
+        )
+    while len(entries) % (SECTOR_SIZE // 128):
+        entries.append(_directory_entry("", 0, color=0, start=0))
+    directory = b"".join(entries)
+    directory_start = len(fat)
+    directory_count = len(directory) // SECTOR_SIZE
+    fat.extend(range(directory_start + 1, directory_start + directory_count))
+    fat.append(ENDOFCHAIN)
+    sectors += directory
+
+    # FAT 与 DIFAT 扇区: 数量需要覆盖包括自身在内的全部扇区
+    entries_per_sector = SECTOR_SIZE // 4
+    data_count = len(fat)
+    fat_count = difat_count = 0
+    while True:
+        total = data_count + fat_count + difat_count
+        needed_fat = -(-total // entries_per_sector)
+        needed_difat = 0 if needed_fat <= 109 else -(-(needed_fat - 109) // (entries_per_sector - 1))
+        if (needed_fat, needed_difat) == (fat_count, difat_count):
+            break
+        fat_count, difat_count = needed_fat, needed_difat
+
+    fat_sectors = list(range(data_count, data_count + fat_count))
+    difat_sectors = list(range(data_count + fat_count, data_count + fat_count + difat_count))
+    fat.extend([FATSECT] * fat_count)
+    fat.extend([DIFSECT] * difat_count)
+    fat.extend([FREESECT] * (fat_count * entries_per_sector - len(fat)))
+    sectors += struct.pack(f"<{len(fat)}I", *fat)
+
+    overflow = fat_sectors[109:]
+    for i, _ in enumerate(difat_sectors):
+        chunk = overflow[i * (entries_per_sector - 1) : (i + 1) * (entries_per_sector - 1)]
+        chunk = chunk + [FREESECT] * (entries_per_sector - 1 - len(chunk))
+        next_sector = difat_sectors[i + 1] if i + 1 < len(difat_sectors) else ENDOFCHAIN
+        sectors += struct.pack(f"<{entries_per_sector}I", *chunk, next_sector)
+
+    header_difat = fat_sectors[:109] + [FREESECT] * (109 - len(fat_sectors[:109]))
+    header = struct.pack(
+        "<8s16sHHHHH6sIIIIIIIII",
+        b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+        b"\x00" * 16,
+        0x003E,  # minor version
+        0x0003,  # major version
+        0xFFFE,  # byte order
+        9,  # sector shift
+        6,  # mini sector shift
+        b"\x00" * 6,
+        0,  # directory sectors (v3 必须为 0)
+        fat_count,
+        directory_start,
+        0,  # transaction signature
+        MINI_STREAM_CUTOFF,
+        ENDOFCHAIN,  # first mini FAT sector
+        0,
+        difat_sectors[0] if difat_sectors else ENDOFCHAIN,
+        difat_count,
+    ) + struct.pack("<109I", *header_difat)
+    return header + bytes(sectors)
+
+
+def build_doc(text: str) -> bytes:
+    """生成包含 text 的 .doc 文件字节, 换行视为段落分隔"""
+    return write_compound_file(build_word_streams(text), root_clsid=WORD_DOCUMENT_CLSID)
+
+
+def save_doc_file(text: str, doc_path: str) -> str:
+    doc_path = Path(doc_path)
+    doc_path.parent.mkdir(parents=True, exist_ok=True)
+    doc_path.write_bytes(build_doc(text))
+    return str(doc_path)
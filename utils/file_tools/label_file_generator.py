@@ -0,0 +1,305 @@
+import csv
+import functools
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.file_tools.doc_writer import build_doc
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_manifest import ManifestEntry, load_manifest, manifest_path_of, save_manifest
+from utils.file_tools.label_file_store import LabelFileStore
+from utils.file_tools.ooxml_writer import build_docx, build_pptx, build_xlsx
+from utils.file_tools.pdf_writer import build_pdf, load_font
+from utils.file_tools.xls_writer import build_xls
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+FILE_NAME_PREFIX = "数据标签识别_"
+
+# 渲染逻辑变化时提升对应格式的版本号, 旧文件会被重新生成
+FORMAT_VERSIONS: Dict[str, int] = {
+    ".csv": 2,
+    ".docx": 2,
+    ".doc": 2,
+    ".xlsx": 2,
+    ".xls": 2,
+    ".pdf": 2,
+    ".pptx": 2,
+    ".txt": 1,
+}
+
+DEFAULT_FORMATS: Tuple[str, ...] = tuple(FORMAT_VERSIONS)
+
+PDF_FONT_PATH = "testcases/test_data_label/NotoSansSC-Regular.ttf"
+
+
+def build_record_text(file_data: Sequence[str]) -> str:
+    """测试文件正文"""
+    formatted_test_data = "\n".join(file_data)
+    return f"测试数据:\n{formatted_test_data}\n"
+
+
+def _formatted_test_data(record_text: str) -> str:
+    """表格类文件只写入测试数据本身(不含 "测试数据:" 标题行)"""
+    return record_text.partition("\n")[2].rstrip("\n")
+
+
+def _render_csv(record_text: str) -> bytes:
+    # 与 DataFrame.to_csv(index=False) 的输出一致, 换行固定为 \n
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["测试数据"])
+    writer.writerow([_formatted_test_data(record_text)])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _render_xlsx(record_text: str) -> bytes:
+    formatted_test_data = _formatted_test_data(record_text)
+    return build_xlsx([["测试数据"], [formatted_test_data]])
+
+
+def _render_xls(record_text: str) -> bytes:
+    formatted_test_data = _formatted_test_data(record_text)
+    return build_xls([["测试数据"], [formatted_test_data]])
+
+
+@functools.lru_cache(maxsize=None)
+def _pdf_font_path() -> str:
+    font_path = FileUtils.find_file_from_root(PDF_FONT_PATH)
+    if font_path is None:
+        raise FileNotFoundError(f"PDF 字体文件未找到: {PDF_FONT_PATH}")
+    return font_path
+
+
+def _render_pdf(record_text: str) -> bytes:
+    # 字体在每个工作进程中只解析一次, 见 pdf_writer.load_font
+    return build_pdf(record_text, _pdf_font_path())
+
+
+def _render_txt(record_text: str) -> bytes:
+    return record_text.encode("utf-8")
+
+
+RENDERERS: Dict[str, Callable[[str], bytes]] = {
+    ".csv": _render_csv,
+    ".docx": build_docx,
+    ".doc": build_doc,
+    ".xlsx": _render_xlsx,
+    ".xls": _render_xls,
+    ".pdf": _render_pdf,
+    ".pptx": build_pptx,
+    ".txt": _render_txt,
+}
+
+
+def render(ext: str, record_text: str) -> bytes:
+    """按文件格式渲染文件内容, 返回完整的文件字节"""
+    renderer = RENDERERS.get(ext)
+    if renderer is None:
+        raise ValueError(f"不支持的文件格式: {ext}")
+    return renderer(record_text)
+
+
+def _render_job(job: Tuple[str, str]) -> bytes:
+    return render(*job)
+
+
+def render_with_md5(job: Tuple[str, str]) -> Tuple[bytes, str]:
+    """在工作进程中渲染并计算 md5, 供边生成边上传的流水线使用"""
+    content = render(*job)
+    return content, hashlib.md5(content).hexdigest()
+
+
+@dataclass
+class GenerationJob:
+    """单个 (数据标签, 文件格式) 生成任务"""
+
+    label_id: Optional[str]
+    label_name: str
+    ext: str
+    record_text: str
+    content_hash: str
+
+    @property
+    def file_name(self) -> str:
+        return f"{FILE_NAME_PREFIX}{self.label_name}{self.ext}"
+
+    def manifest_entry(self, size: int, md5: str, mtime_ns: int = 0) -> ManifestEntry:
+        return ManifestEntry(
+            label_id=self.label_id,
+            label_name=self.label_name,
+            ext=self.ext,
+            file_name=self.file_name,
+            size=size,
+            mtime_ns=mtime_ns,
+            md5=md5,
+            content_hash=self.content_hash,
+        )
+
+
+def content_hash(ext: str, record_text: str) -> str:
+    """文件内容指纹: 格式 + 格式版本 + 正文"""
+    digest = hashlib.sha256(f"{ext}:{FORMAT_VERSIONS[ext]}\n".encode("utf-8"))
+    digest.update(record_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LabelFileGenerator:
+    """数据标签测试文件生成引擎
+
+    - 为每个 (数据标签, 文件格式) 构造任务, 在进程池中并行渲染
+    - 以内容指纹判断文件是否变化, 未变化的文件直接复用
+    - 输出目录中不属于本次任务的文件会被删除
+    - 生成清单记录每个文件的标签、格式、大小与 md5, 校验阶段直接读取清单, 无需重新扫描、计算 md5
+    - 指定 store_dir 时文件保存在内容寻址存储中, 输出目录只放链接, 多个标准共用同一份文件
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        formats: Sequence[str] = DEFAULT_FORMATS,
+        max_workers: Optional[int] = None,
+        manifest_path: Optional[str] = None,
+        store_dir: Optional[str] = None,
+        link_mode: str = "hardlink",
+    ):
+        unsupported = [ext for ext in formats if ext not in RENDERERS]
+        if unsupported:
+            raise ValueError(f"不支持的文件格式: {unsupported}")
+        self.output_dir = Path(output_dir)
+        self.formats = tuple(formats)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.manifest_path = Path(manifest_path or manifest_path_of(output_dir))
+        self.store = LabelFileStore(store_dir, link_mode) if store_dir else None
+
+    def build_jobs(self, file_asset_data_labels: List[Dict[str, Any]]) -> List[GenerationJob]:
+        jobs = []
+        for file_asset_data_label in file_asset_data_labels:
+            record_text = build_record_text(file_asset_data_label.get("file_data") or [])
+            for ext in self.formats:
+                jobs.append(
+                    GenerationJob(
+                        label_id=file_asset_data_label.get("id"),
+                        label_name=file_asset_data_label["name"],
+                        ext=ext,
+                        record_text=record_text,
+                        content_hash=content_hash(ext, record_text),
+                    )
+                )
+        return jobs
+
+    def render_executor(self, jobs: List[GenerationJob]) -> ProcessPoolExecutor:
+        max_workers = min(self.max_workers, max(1, len(jobs)))
+        if not any(job.ext == ".pdf" for job in jobs):
+            return ProcessPoolExecutor(max_workers=max_workers)
+        # 主进程先解析字体: fork 出的工作进程直接继承缓存;
+        # spawn(Windows) 的工作进程不继承, 由 initializer 在启动时各解析一次, 不在首个 PDF 任务中解析
+        font_path = _pdf_font_path()
+        load_font(font_path)
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=load_font, initargs=(font_path,))
+
+    def _render_all(self, jobs: List[GenerationJob]) -> List[bytes]:
+        payloads = [(job.ext, job.record_text) for job in jobs]
+        workers = min(self.max_workers, len(jobs))
+        if workers <= 1:
+            return [_render_job(payload) for payload in payloads]
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with self.render_executor(jobs) as executor:
+            return list(executor.map(_render_job, payloads, chunksize=chunksize))
+
+    def _write(self, job: GenerationJob, content: bytes, md5: Optional[str] = None) -> ManifestEntry:
+        target = self.output_dir / job.file_name
+        temp_path = target.with_name(f".{job.file_name}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, target)
+        return job.manifest_entry(
+            len(content), md5 or hashlib.md5(content).hexdigest(), os.stat(target).st_mtime_ns
+        )
+
+    def _link(self, job: GenerationJob) -> ManifestEntry:
+        target = self.output_dir / job.file_name
+        if not self.store.is_linked(job.content_hash, job.ext, target):
+            self.store.link(job.content_hash, job.ext, target)
+        stored = self.store.get(job.content_hash)
+        return job.manifest_entry(stored.size, stored.md5, os.stat(target).st_mtime_ns)
+
+    def archive(self, job: GenerationJob, content: bytes, md5: str) -> ManifestEntry:
+        """保存已渲染的内容; 使用存储时先写入存储, 输出目录中只建立链接"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.store is None:
+            return self._write(job, content, md5)
+        self.store.put(job.content_hash, job.ext, content, md5)
+        return self._link(job)
+
+    @staticmethod
+    def _is_current(entry: Optional[ManifestEntry], job: GenerationJob, stat: Optional[os.stat_result]) -> bool:
+        return (
+            entry is not None
+            and stat is not None
+            and entry.content_hash == job.content_hash
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+        )
+
+    def _generate_files(self, jobs: List[GenerationJob]) -> Tuple[Dict[str, ManifestEntry], int]:
+        """直接在输出目录中生成文件, 返回 (清单条目, 新生成的文件数)"""
+        manifest = load_manifest(self.manifest_path)
+        stats = {entry.name: entry.stat() for entry in os.scandir(self.output_dir) if entry.is_file()}
+
+        entries: Dict[str, ManifestEntry] = {}
+        dirty = []
+        for job in jobs:
+            entry = manifest.get(job.file_name)
+            if self._is_current(entry, job, stats.get(job.file_name)):
+                # 复用的文件沿用清单中的 md5, 不重新读取
+                entries[job.file_name] = replace(entry, label_id=job.label_id)
+            else:
+                dirty.append(job)
+        for job, content in zip(dirty, self._render_all(dirty)):
+            entries[job.file_name] = self._write(job, content)
+        return entries, len(dirty)
+
+    def _link_views(self, jobs: List[GenerationJob]) -> Tuple[Dict[str, ManifestEntry], int]:
+        """存储中缺少的内容按指纹去重后生成, 输出目录中的文件均为指向存储对象的链接"""
+        self.store.refresh()
+        missing: Dict[str, GenerationJob] = {}
+        for job in jobs:
+            if self.store.get(job.content_hash) is None:
+                missing.setdefault(job.content_hash, job)
+        pending = list(missing.values())
+        for job, content in zip(pending, self._render_all(pending)):
+            self.store.put(job.content_hash, job.ext, content, hashlib.md5(content).hexdigest())
+        return {job.file_name: self._link(job) for job in jobs}, len(pending)
+
+    def generate(self, file_asset_data_labels: List[Dict[str, Any]]) -> List[str]:
+        """生成全部测试文件并写出清单, 返回文件路径列表"""
+        started = time.perf_counter()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        jobs = self.build_jobs(file_asset_data_labels)
+        if self.store is None:
+            entries, rendered = self._generate_files(jobs)
+        else:
+            entries, rendered = self._link_views(jobs)
+
+        self.finalize(jobs, entries)
+        log.info(
+            f"测试文件生成完成: 共 {len(jobs)} 个, 复用 {len(jobs) - rendered} 个, "
+            f"新生成 {rendered} 个, 耗时 {time.perf_counter() - started:.2f}s"
+        )
+        return [str(self.output_dir / job.file_name) for job in jobs]
+
+    def finalize(self, jobs: List[GenerationJob], entries: Dict[str, ManifestEntry]):
+        """清理不再需要的文件, 保证目录中只有本次的测试文件, 并写出清单"""
+        for entry in os.scandir(self.output_dir):
+            if entry.name not in entries and (entry.is_file() or entry.is_symlink()):
+                os.unlink(entry.path)
+        if self.store is not None:
+            self.store.save_index()
+        save_manifest(self.manifest_path, [entries[job.file_name] for job in jobs])
@@ -0,0 +1,59 @@
+"""测试文件生成清单
+
+生成阶段写出, 记录每个文件的数据标签、格式、大小、修改时间与 md5(写入时计算);
+校验阶段读取清单建立索引, 大小与修改时间未变的文件无需重新读取计算 md5
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """生成清单中的单个文件, md5 在写入时计算"""
+
+    label_id: Optional[str]
+    label_name: str
+    ext: str
+    file_name: str
+    size: int
+    mtime_ns: int
+    md5: str
+    content_hash: str
+
+
+def manifest_path_of(output_dir: str) -> Path:
+    """清单保存在输出目录同级的 .<目录名>.manifest.json 中, 不会被当作测试文件上传"""
+    output_dir = Path(output_dir)
+    return output_dir.parent / f".{output_dir.name}.manifest.json"
+
+
+def load_manifest(manifest_path: str) -> Dict[str, ManifestEntry]:
+    """读取生成清单, 以文件名为键; 清单不存在或损坏时返回空字典"""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        entries = [ManifestEntry(**entry) for entry in manifest["files"]]
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return {}
+    return {entry.file_name: entry for entry in entries}
+
+
+def save_manifest(manifest_path: str, entries: List[ManifestEntry]):
+    manifest_path = Path(manifest_path)
+    temp_path = manifest_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "files": [asdict(entry) for entry in entries]},
+            f,
+            ensure_ascii=False,
+            indent=0,
+        )
+    os.replace(temp_path, manifest_path)
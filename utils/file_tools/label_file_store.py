@@ -0,0 +1,133 @@
+"""内容寻址的测试文件存储
+
+同一数据标签往往出现在多个标准中, 各标准目录下的测试文件内容完全相同。存储按内容指纹保存文件:
+    - 对象路径: <存储目录>/<指纹前两位>/<指纹><后缀>, 每个 (标签数据, 文件格式) 只生成、计算 md5 一次
+    - 各标准目录只是指向对象的硬链接(跨设备或不支持时退回符号链接, 再退回复制)
+    - 对象的大小与 md5 记录在 <存储目录>/index.json 中
+"""
+
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+INDEX_FILE_NAME = "index.json"
+LINK_MODES = ("hardlink", "symlink", "copy")
+
+
+@dataclass
+class StoredObject:
+    """存储中的单个文件对象"""
+
+    ext: str
+    size: int
+    md5: str
+
+
+class LabelFileStore:
+    """内容寻址存储, 以内容指纹为键"""
+
+    def __init__(self, store_dir: str, link_mode: str = "hardlink"):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"不支持的链接方式: {link_mode}, 可选: {LINK_MODES}")
+        self.store_dir = Path(store_dir)
+        self.link_mode = link_mode
+        self.index_path = self.store_dir / INDEX_FILE_NAME
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._objects = self._load_index()
+        self._added: Dict[str, StoredObject] = {}
+        self._removed: Set[str] = set()
+
+    def _load_index(self) -> Dict[str, StoredObject]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return {key: StoredObject(**value) for key, value in json.load(f).items()}
+        except (FileNotFoundError, ValueError, TypeError):
+            return {}
+
+    def refresh(self):
+        """重新读取索引, 获取其他生成器(其他标准)新写入的对象"""
+        self._objects = {**self._load_index(), **self._added}
+        for content_hash in self._removed:
+            self._objects.pop(content_hash, None)
+
+    def save_index(self):
+        """与磁盘上的索引合并后写回, 多个生成器共用同一存储时不会互相覆盖"""
+        if not self._added and not self._removed:
+            return
+        self.refresh()
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({key: asdict(value) for key, value in self._objects.items()}, f, indent=0)
+        os.replace(temp_path, self.index_path)
+        self._added.clear()
+        self._removed.clear()
+
+    def object_path(self, content_hash: str, ext: str) -> Path:
+        return self.store_dir / content_hash[:2] / f"{content_hash}{ext}"
+
+    def get(self, content_hash: str) -> Optional[StoredObject]:
+        """返回已存储的对象; 对象文件缺失或大小不符时视为不存在"""
+        stored = self._objects.get(content_hash)
+        if stored is None:
+            return None
+        try:
+            if os.stat(self.object_path(content_hash, stored.ext)).st_size == stored.size:
+                return stored
+        except FileNotFoundError:
+            pass
+        del self._objects[content_hash]
+        self._added.pop(content_hash, None)
+        self._removed.add(content_hash)
+        return None
+
+    def put(self, content_hash: str, ext: str, content: bytes, md5: str) -> StoredObject:
+        path = self.object_path(content_hash, ext)
+        # 指纹相同即内容相同; 已有的对象不替换, 避免与现有链接脱钩
+        if not (path.is_file() and path.stat().st_size == len(content)):
+            path.parent.mkdir(exist_ok=True)
+            temp_path = path.with_name(f".{path.name}.tmp")
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        stored = StoredObject(ext=ext, size=len(content), md5=md5)
+        self._objects[content_hash] = stored
+        self._added[content_hash] = stored
+        self._removed.discard(content_hash)
+        return stored
+
+    def is_linked(self, content_hash: str, ext: str, target: Path) -> bool:
+        """target 是否已经指向该对象(同一 inode, 或指向对象的符号链接)"""
+        try:
+            return os.path.samefile(target, self.object_path(content_hash, ext))
+        except OSError:
+            return False
+
+    def link(self, content_hash: str, ext: str, target: Path):
+        """在 target 处创建指向对象的视图, 先写临时文件再替换, 不会修改对象本身"""
+        source = self.object_path(content_hash, ext)
+        temp_path = target.with_name(f".{target.name}.tmp")
+        if os.path.lexists(temp_path):
+            os.unlink(temp_path)
+        for mode in LINK_MODES[LINK_MODES.index(self.link_mode) :]:
+            try:
+                if mode == "hardlink":
+                    os.link(source, temp_path)
+                elif mode == "symlink":
+                    os.symlink(source.resolve(), temp_path)
+                else:
+                    shutil.copyfile(source, temp_path)
+                break
+            except OSError as e:
+                if mode == "copy":
+                    raise
+                # 之后的文件直接使用可用的方式
+                self.link_mode = LINK_MODES[LINK_MODES.index(mode) + 1]
+                log.warning(f"无法创建 {mode}, 改用 {self.link_mode}: {e}")
+        os.replace(temp_path, target)
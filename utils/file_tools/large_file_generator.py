@@ -0,0 +1,309 @@
+"""大文件测试数据生成, 用于测试文件识别的耗时与准确率随文件大小的变化
+
+    - 按块流式写出 txt / csv / xlsx / docx, 内存占用与目标大小无关
+    - 每行为一段填充文本或一个数据标签样本(取自 file_data), 样本行占比由 density 控制, 在文件中随机分布
+    - 填充文本只由不含数字的中性词组成, 不会命中数据标签
+    - 同目录下的 .<文件名>.expected.json 记录每个数据标签写入的样本数, 即期望命中数
+相同的数据标签、density 与 seed 生成完全相同的文件
+"""
+
+import csv
+import io
+import json
+import os
+import random
+import re
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.file_tools.ooxml_writer import (
+    DOCX_TEMPLATE,
+    XLSX_TEMPLATE,
+    PackageTemplate,
+    column_letter,
+    docx_paragraph,
+    escape_xml,
+    xlsx_row,
+)
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+LARGE_FILE_FORMATS: Tuple[str, ...] = (".txt", ".csv", ".xlsx", ".docx")
+LARGE_FILE_NAME_PREFIX = "大文件测试_"
+
+# 每块行数; 每写完一块检查一次文件大小, 实际大小最多超出目标一块
+BLOCK_LINES = 1000
+FILLER_POOL_SIZE = 1024
+FILLER_WORDS = (
+    "测试", "文本", "段落", "内容", "系统", "流程", "模块", "服务", "平台", "任务",
+    "结果", "说明", "会议", "纪要", "项目", "进度", "计划", "方案", "评审", "总结",
+    "需求", "设计", "开发", "部署", "运维", "监控", "告警", "日志", "配置", "版本",
+    "lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit",
+)
+
+# xlsx 每行写满 XLSX_COLUMNS 个单元格再换行, 避免过早达到行数上限
+XLSX_COLUMNS = 16
+XLSX_MAX_ROWS = 1048576
+# 超过该大小时 zip 条目使用 ZIP64, 未压缩的正文可能超过 4 GiB
+ZIP64_THRESHOLD = 1 << 30
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """'100MB' / '1G' / '512k' / '2048' -> 字节数"""
+    match = _SIZE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"无法解析的文件大小: {text}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    """字节数 -> 文件名中使用的大小, 如 104857600 -> '100MB'"""
+    for unit in ("G", "M", "K"):
+        if size >= _SIZE_UNITS[unit] and size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}B"
+    return f"{size}B"
+
+
+def sidecar_path_of(file_path: str) -> Path:
+    """期望命中数保存在同目录下的 .<文件名>.expected.json 中"""
+    file_path = Path(file_path)
+    return file_path.parent / f".{file_path.name}.expected.json"
+
+
+@dataclass
+class ExpectedHits:
+    """单个数据标签在大文件中的期望命中数"""
+
+    label_name: str
+    count: int = 0
+
+
+@dataclass
+class LargeFileSidecar:
+    """大文件的生成参数与期望命中数"""
+
+    file_name: str
+    ext: str
+    target_size: int
+    size: int
+    line_count: int
+    sample_count: int
+    density: float
+    seed: int
+    elapsed: float
+    expected: Dict[str, ExpectedHits] = field(default_factory=dict)
+
+
+def save_sidecar(path: str, sidecar: LargeFileSidecar):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(asdict(sidecar), f, ensure_ascii=False, indent=2)
+
+
+def load_sidecar(path: str) -> LargeFileSidecar:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["expected"] = {label_id: ExpectedHits(**hits) for label_id, hits in data["expected"].items()}
+    return LargeFileSidecar(**data)
+
+
+class _LineSource:
+    """按块产出文件中的行, 并统计已产出的样本数
+
+    每块的样本行数按 density 累计取整, 整个文件的样本占比与 density 一致;
+    样本行的位置、所属标签与取值均由 seed 决定
+    """
+
+    def __init__(self, samples: List[Tuple[str, List[str]]], density: float, seed: int):
+        self.samples = samples
+        self.density = density
+        self.rng = random.Random(seed)
+        self.filler = [
+            " ".join(self.rng.choices(FILLER_WORDS, k=self.rng.randint(8, 16))) for _ in range(FILLER_POOL_SIZE)
+        ]
+        self.counts: Dict[str, int] = {label_id: 0 for label_id, _ in samples}
+        self.line_count = 0
+        self.sample_count = 0
+        self._carry = 0.0
+
+    def blocks(self) -> Iterator[List[str]]:
+        rng = self.rng
+        while True:
+            lines = rng.choices(self.filler, k=BLOCK_LINES)
+            self._carry += self.density * BLOCK_LINES
+            sample_lines = int(self._carry)
+            self._carry -= sample_lines
+            for position in rng.sample(range(BLOCK_LINES), sample_lines):
+                label_id, values = rng.choice(self.samples)
+                lines[position] = rng.choice(values)
+                self.counts[label_id] += 1
+            self.line_count += BLOCK_LINES
+            self.sample_count += sample_lines
+            yield lines
+
+
+def _write_txt(f: BinaryIO, blocks: Iterator[List[str]], target_size: int):
+    while f.tell() < target_size:
+        f.write(("\n".join(next(blocks)) + "\n").encode("utf-8"))
+
+
+def _write_csv(f: BinaryIO, blocks: Iterator[List[str]], target_size: int):
+    # 与普通测试文件一致: 表头 "测试数据", 每行一个单元格
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["测试数据"])
+    while True:
+        f.write(buffer.getvalue().encode("utf-8"))
+        if f.tell() >= target_size:
+            break
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([line] for line in next(blocks))
+
+
+def _open_package(f: BinaryIO, template: PackageTemplate, target_size: int) -> Tuple[zipfile.ZipFile, BinaryIO]:
+    """写入模板的静态部件, 返回 (zip 包, 正文部件的写入流)"""
+    package = zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+    for name, data in template.static_parts.items():
+        package.writestr(zipfile.ZipInfo(name, _ZIP_DATE_TIME), data, compress_type=zipfile.ZIP_DEFLATED)
+    info = zipfile.ZipInfo(template.dynamic_part, _ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    stream = package.open(info, "w", force_zip64=target_size >= ZIP64_THRESHOLD)
+    stream.write(template.dynamic_prefix)
+    return package, stream
+
+
+def _write_docx(f: BinaryIO, blocks: Iterator[List[str]], target_size: int):
+    # 行只来自填充文本池与样本, 段落 XML 按行缓存
+    paragraphs: Dict[str, str] = {}
+    package, stream = _open_package(f, DOCX_TEMPLATE, target_size)
+    with package:
+        with stream:
+            # 压缩数据随写随落盘, f.tell() 即当前 zip 大小
+            while f.tell() < target_size:
+                xml = "".join(
+                    paragraphs.get(line) or paragraphs.setdefault(line, docx_paragraph(line))
+                    for line in next(blocks)
+                )
+                stream.write(xml.encode("utf-8"))
+            stream.write(DOCX_TEMPLATE.dynamic_suffix)
+
+
+def _write_xlsx(f: BinaryIO, blocks: Iterator[List[str]], target_size: int):
+    # 单元格的转义文本按行缓存, 行内按列号拼接
+    texts: Dict[str, str] = {}
+    columns = [column_letter(c) for c in range(XLSX_COLUMNS)]
+    package, stream = _open_package(f, XLSX_TEMPLATE, target_size)
+    with package:
+        with stream:
+            stream.write(xlsx_row(1, ["测试数据"]).encode("utf-8"))
+            row_number = 1
+            while f.tell() < target_size:
+                lines = next(blocks)
+                if row_number + len(lines) // XLSX_COLUMNS + 1 > XLSX_MAX_ROWS:
+                    raise ValueError(f"目标大小 {format_size(target_size)} 超过 xlsx {XLSX_MAX_ROWS} 行的上限")
+                rows = []
+                for start in range(0, len(lines), XLSX_COLUMNS):
+                    row_number += 1
+                    rows.append(f'<row r="{row_number}">')
+                    for column, line in zip(columns, lines[start : start + XLSX_COLUMNS]):
+                        text = texts.get(line) or texts.setdefault(line, escape_xml(line))
+                        rows.append(
+                            f'<c r="{column}{row_number}" t="inlineStr"><is>'
+                            f'<t xml:space="preserve">{text}</t></is></c>'
+                        )
+                    rows.append("</row>")
+                stream.write("".join(rows).encode("utf-8"))
+            stream.write(XLSX_TEMPLATE.dynamic_suffix)
+
+
+_WRITERS = {
+    ".txt": _write_txt,
+    ".csv": _write_csv,
+    ".xlsx": _write_xlsx,
+    ".docx": _write_docx,
+}
+
+
+class LargeFileGenerator:
+    """按数据标签的 file_data 生成指定大小的大文件, 并写出期望命中数"""
+
+    def __init__(self, file_asset_data_labels: List[Dict[str, Any]], density: float = 0.01, seed: int = 0):
+        if not 0 < density <= 1:
+            raise ValueError(f"样本占比 density 须在 (0, 1] 之间: {density}")
+        self.density = density
+        self.seed = seed
+        self.label_names: Dict[str, str] = {}
+        self.samples: List[Tuple[str, List[str]]] = []
+        for file_asset_data_label in file_asset_data_labels:
+            values = [value for value in file_asset_data_label.get("file_data") or [] if value]
+            if values:
+                label_id = file_asset_data_label["id"]
+                self.label_names[label_id] = file_asset_data_label["name"]
+                self.samples.append((label_id, values))
+        if not self.samples:
+            raise ValueError("数据标签中没有可用的 file_data 样本")
+
+    def generate(self, file_path: str, target_size: int) -> LargeFileSidecar:
+        """写出不小于 target_size 字节的文件及其期望命中数"""
+        file_path = Path(file_path)
+        ext = file_path.suffix.lower()
+        writer = _WRITERS.get(ext)
+        if writer is None:
+            raise ValueError(f"不支持的大文件格式: {ext}, 可选: {LARGE_FILE_FORMATS}")
+
+        started = time.perf_counter()
+        source = _LineSource(self.samples, self.density, self.seed)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = file_path.with_name(f".{file_path.name}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                writer(f, source.blocks(), target_size)
+            os.replace(temp_path, file_path)
+        finally:
+            if temp_path.exists():
+                os.unlink(temp_path)
+
+        sidecar = LargeFileSidecar(
+            file_name=file_path.name,
+            ext=ext,
+            target_size=target_size,
+            size=os.path.getsize(file_path),
+            line_count=source.line_count,
+            sample_count=source.sample_count,
+            density=self.density,
+            seed=self.seed,
+            elapsed=round(time.perf_counter() - started, 3),
+            expected={
+                label_id: ExpectedHits(self.label_names[label_id], count)
+                for label_id, count in source.counts.items()
+            },
+        )
+        save_sidecar(sidecar_path_of(file_path), sidecar)
+        log.info(
+            f"{file_path.name} 生成完成: {sidecar.size / (1 << 20):.1f} MB, {sidecar.line_count} 行, "
+            f"样本 {sidecar.sample_count} 个, 耗时 {sidecar.elapsed:.2f}s"
+        )
+        return sidecar
+
+    def generate_series(
+        self,
+        output_dir: str,
+        sizes: Sequence[int],
+        formats: Sequence[str] = LARGE_FILE_FORMATS,
+        name_prefix: Optional[str] = None,
+    ) -> List[LargeFileSidecar]:
+        """为每个 (大小, 格式) 生成一个文件, 如 大文件测试_100MB.csv"""
+        prefix = LARGE_FILE_NAME_PREFIX if name_prefix is None else name_prefix
+        return [
+            self.generate(os.path.join(output_dir, f"{prefix}{format_size(size)}{ext}"), size)
+            for size in sizes
+            for ext in formats
+        ]
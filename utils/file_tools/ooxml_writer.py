@@ -0,0 +1,333 @@
+"""基于模板的 OOXML(docx / xlsx / pptx)纯文本文件写入
+
+每种格式由一组固定的静态部件和一个承载正文的动态部件组成:
+    - 静态部件在模块加载时压缩一次, 本地文件头与中央目录项一并预先生成
+    - 每次生成只对转义后的正文 XML 做一次 deflate, 再拼接成完整的 zip 包
+生成结果不包含时间戳, 相同正文得到完全相同的字节
+"""
+
+import re
+import struct
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+_NS_RELATIONSHIPS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_NS_S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+_CT_PREFIX = "application/vnd.openxmlformats-officedocument."
+
+# XML 1.0 不允许的字符
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# zip 条目统一使用 1980-01-01 00:00
+_DOS_TIME, _DOS_DATE = 0, (0 << 9) | (1 << 5) | 1
+
+
+def escape_xml(text: str) -> str:
+    text = _INVALID_XML_CHARS.sub("", text)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def split_lines(text: str) -> List[str]:
+    """按行拆分, 忽略结尾的换行"""
+    lines = text.replace("\r\n", "\n").split("\n")
+    if len(lines) > 1 and lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _zip_entry(name: str, data: bytes, offset: int) -> Tuple[bytes, bytes]:
+    """返回 (本地文件头 + 压缩数据, 中央目录项)"""
+    encoded_name = name.encode("utf-8")
+    compressed = _deflate(data)
+    crc = zlib.crc32(data)
+    local = struct.pack(
+        "<IHHHHHIIIHH",
+        0x04034B50, 20, 0, 8, _DOS_TIME, _DOS_DATE,
+        crc, len(compressed), len(data), len(encoded_name), 0,
+    ) + encoded_name + compressed
+    central = struct.pack(
+        "<IHHHHHHIIIHHHHHII",
+        0x02014B50, 20, 20, 0, 8, _DOS_TIME, _DOS_DATE,
+        crc, len(compressed), len(data), len(encoded_name), 0, 0, 0, 0, 0, offset,
+    ) + encoded_name
+    return local, central
+
+
+class PackageTemplate:
+    """静态部件已预先压缩的 OOXML 包模板, 动态部件固定写在最后"""
+
+    def __init__(self, static_parts: Dict[str, str], dynamic_part: str, dynamic_template: str):
+        self.dynamic_part = dynamic_part
+        self.dynamic_prefix, self.dynamic_suffix = (
+            (_XML_DECLARATION + dynamic_template).encode("utf-8").split(b"{content}")
+        )
+        self.static_parts = {
+            name: (_XML_DECLARATION + xml).encode("utf-8") for name, xml in static_parts.items()
+        }
+        locals_, centrals = [], []
+        offset = 0
+        for name, data in self.static_parts.items():
+            local, central = _zip_entry(name, data, offset)
+            locals_.append(local)
+            centrals.append(central)
+            offset += len(local)
+        self.static_locals = b"".join(locals_)
+        self.static_centrals = b"".join(centrals)
+        self.entry_count = len(static_parts) + 1
+
+    def render(self, content_xml: str) -> bytes:
+        data = self.dynamic_prefix + content_xml.encode("utf-8") + self.dynamic_suffix
+        local, central = _zip_entry(self.dynamic_part, data, len(self.static_locals))
+        central_offset = len(self.static_locals) + len(local)
+        central_directory = self.static_centrals + central
+        end = struct.pack(
+            "<IHHHHIIH",
+            0x06054B50, 0, 0, self.entry_count, self.entry_count,
+            len(central_directory), central_offset, 0,
+        )
+        return self.static_locals + local + central_directory + end
+
+
+def _content_types(overrides: Sequence[Tuple[str, str]]) -> str:
+    return (
+        f'<Types xmlns="{_NS_CONTENT_TYPES}">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        + "".join(f'<Override PartName="{part}" ContentType="{ct}"/>' for part, ct in overrides)
+        + "</Types>"
+    )
+
+
+def _relationships(relationships: Sequence[Tuple[str, str]]) -> str:
+    return (
+        f'<Relationships xmlns="{_NS_RELATIONSHIPS}">'
+        + "".join(
+            f'<Relationship Id="rId{i}" Type="{_REL_TYPE}{rel_type}" Target="{target}"/>'
+            for i, (rel_type, target) in enumerate(relationships, start=1)
+        )
+        + "</Relationships>"
+    )
+
+
+# ---------- docx ----------
+
+DOCX_TEMPLATE = PackageTemplate(
+    {
+        "[Content_Types].xml": _content_types(
+            [
+                ("/word/document.xml", _CT_PREFIX + "wordprocessingml.document.main+xml"),
+                ("/word/styles.xml", _CT_PREFIX + "wordprocessingml.styles+xml"),
+            ]
+        ),
+        "_rels/.rels": _relationships([("officeDocument", "word/document.xml")]),
+        "word/_rels/document.xml.rels": _relationships([("styles", "styles.xml")]),
+        "word/styles.xml": (
+            f'<w:styles xmlns:w="{_NS_W}"><w:docDefaults><w:rPrDefault><w:rPr>'
+            '<w:rFonts w:ascii="Times New Roman" w:eastAsia="SimSun" w:hAnsi="Times New Roman"/>'
+            '<w:sz w:val="21"/><w:lang w:val="en-US" w:eastAsia="zh-CN"/>'
+            "</w:rPr></w:rPrDefault></w:docDefaults>"
+            '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+            "</w:styles>"
+        ),
+    },
+    "word/document.xml",
+    f'<w:document xmlns:w="{_NS_W}"><w:body>{{content}}'
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800" w:header="851" w:footer="992" w:gutter="0"/>'
+    "</w:sectPr></w:body></w:document>",
+)
+
+
+def docx_paragraph(line: str) -> str:
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape_xml(line)}</w:t></w:r></w:p>' if line else "<w:p/>"
+
+
+def build_docx(text: str) -> bytes:
+    """每行一个段落的 docx"""
+    return DOCX_TEMPLATE.render("".join(docx_paragraph(line) for line in split_lines(text)))
+
+
+# ---------- xlsx ----------
+
+XLSX_TEMPLATE = PackageTemplate(
+    {
+        "[Content_Types].xml": _content_types(
+            [
+                ("/xl/workbook.xml", _CT_PREFIX + "spreadsheetml.sheet.main+xml"),
+                ("/xl/worksheets/sheet1.xml", _CT_PREFIX + "spreadsheetml.worksheet+xml"),
+                ("/xl/styles.xml", _CT_PREFIX + "spreadsheetml.styles+xml"),
+            ]
+        ),
+        "_rels/.rels": _relationships([("officeDocument", "xl/workbook.xml")]),
+        "xl/workbook.xml": (
+            f'<workbook xmlns="{_NS_S}" xmlns:r="{_NS_R}">'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ),
+        "xl/_rels/workbook.xml.rels": _relationships(
+            [("worksheet", "worksheets/sheet1.xml"), ("styles", "styles.xml")]
+        ),
+        "xl/styles.xml": (
+            f'<styleSheet xmlns="{_NS_S}">'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            "</styleSheet>"
+        ),
+    },
+    "xl/worksheets/sheet1.xml",
+    f'<worksheet xmlns="{_NS_S}"><sheetData>{{content}}</sheetData></worksheet>',
+)
+
+
+def column_letter(index: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def xlsx_row(r: int, row: Sequence[str]) -> str:
+    """第 r 行(从 1 开始), 单元格均为内联字符串"""
+    cells = "".join(
+        f'<c r="{column_letter(c)}{r}" t="inlineStr"><is>'
+        f'<t xml:space="preserve">{escape_xml(str(value))}</t></is></c>'
+        for c, value in enumerate(row)
+    )
+    return f'<row r="{r}">{cells}</row>'
+
+
+def build_xlsx(rows: Sequence[Sequence[str]]) -> bytes:
+    """单个工作表的 xlsx, 单元格均为内联字符串"""
+    return XLSX_TEMPLATE.render("".join(xlsx_row(r, row) for r, row in enumerate(rows, start=1)))
+
+
+# ---------- pptx ----------
+
+_EMPTY_SP_TREE = (
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+)
+_P_NAMESPACES = f'xmlns:a="{_NS_A}" xmlns:r="{_NS_R}" xmlns:p="{_NS_P}"'
+
+
+def _theme() -> str:
+    colors = [
+        ("dk1", '<a:sysClr val="windowText" lastClr="000000"/>'),
+        ("lt1", '<a:sysClr val="window" lastClr="FFFFFF"/>'),
+        ("dk2", '<a:srgbClr val="1F497D"/>'),
+        ("lt2", '<a:srgbClr val="EEECE1"/>'),
+        ("accent1", '<a:srgbClr val="4F81BD"/>'),
+        ("accent2", '<a:srgbClr val="C0504D"/>'),
+        ("accent3", '<a:srgbClr val="9BBB59"/>'),
+        ("accent4", '<a:srgbClr val="8064A2"/>'),
+        ("accent5", '<a:srgbClr val="4BACC6"/>'),
+        ("accent6", '<a:srgbClr val="F79646"/>'),
+        ("hlink", '<a:srgbClr val="0000FF"/>'),
+        ("folHlink", '<a:srgbClr val="800080"/>'),
+    ]
+    font = '<a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/>'
+    fill = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    line = f'<a:ln w="9525">{fill}</a:ln>'
+    effect = "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    return (
+        f'<a:theme xmlns:a="{_NS_A}" name="Office Theme"><a:themeElements>'
+        '<a:clrScheme name="Office">'
+        + "".join(f"<a:{name}>{value}</a:{name}>" for name, value in colors)
+        + "</a:clrScheme>"
+        f'<a:fontScheme name="Office"><a:majorFont>{font}</a:majorFont><a:minorFont>{font}</a:minorFont></a:fontScheme>'
+        '<a:fmtScheme name="Office">'
+        f"<a:fillStyleLst>{fill * 3}</a:fillStyleLst>"
+        f"<a:lnStyleLst>{line * 3}</a:lnStyleLst>"
+        f"<a:effectStyleLst>{effect * 3}</a:effectStyleLst>"
+        f"<a:bgFillStyleLst>{fill * 3}</a:bgFillStyleLst>"
+        "</a:fmtScheme></a:themeElements></a:theme>"
+    )
+
+
+PPTX_TEMPLATE = PackageTemplate(
+    {
+        "[Content_Types].xml": _content_types(
+            [
+                ("/ppt/presentation.xml", _CT_PREFIX + "presentationml.presentation.main+xml"),
+                ("/ppt/slideMasters/slideMaster1.xml", _CT_PREFIX + "presentationml.slideMaster+xml"),
+                ("/ppt/slideLayouts/slideLayout1.xml", _CT_PREFIX + "presentationml.slideLayout+xml"),
+                ("/ppt/slides/slide1.xml", _CT_PREFIX + "presentationml.slide+xml"),
+                ("/ppt/theme/theme1.xml", _CT_PREFIX + "theme+xml"),
+            ]
+        ),
+        "_rels/.rels": _relationships([("officeDocument", "ppt/presentation.xml")]),
+        "ppt/presentation.xml": (
+            f"<p:presentation {_P_NAMESPACES}>"
+            '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+            '<p:sldIdLst><p:sldId id="256" r:id="rId2"/></p:sldIdLst>'
+            '<p:sldSz cx="9144000" cy="6858000" type="screen4x3"/><p:notesSz cx="6858000" cy="9144000"/>'
+            "</p:presentation>"
+        ),
+        "ppt/_rels/presentation.xml.rels": _relationships(
+            [
+                ("slideMaster", "slideMasters/slideMaster1.xml"),
+                ("slide", "slides/slide1.xml"),
+                ("theme", "theme/theme1.xml"),
+            ]
+        ),
+        "ppt/slideMasters/slideMaster1.xml": (
+            f"<p:sldMaster {_P_NAMESPACES}><p:cSld><p:spTree>{_EMPTY_SP_TREE}</p:spTree></p:cSld>"
+            '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" accent2="accent2" '
+            'accent3="accent3" accent4="accent4" accent5="accent5" accent6="accent6" '
+            'hlink="hlink" folHlink="folHlink"/>'
+            '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst>'
+            "</p:sldMaster>"
+        ),
+        "ppt/slideMasters/_rels/slideMaster1.xml.rels": _relationships(
+            [("slideLayout", "../slideLayouts/slideLayout1.xml"), ("theme", "../theme/theme1.xml")]
+        ),
+        "ppt/slideLayouts/slideLayout1.xml": (
+            f'<p:sldLayout {_P_NAMESPACES} type="blank">'
+            f'<p:cSld name="Blank"><p:spTree>{_EMPTY_SP_TREE}</p:spTree></p:cSld>'
+            "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sldLayout>"
+        ),
+        "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _relationships(
+            [("slideMaster", "../slideMasters/slideMaster1.xml")]
+        ),
+        "ppt/theme/theme1.xml": _theme(),
+        "ppt/slides/_rels/slide1.xml.rels": _relationships(
+            [("slideLayout", "../slideLayouts/slideLayout1.xml")]
+        ),
+    },
+    "ppt/slides/slide1.xml",
+    f"<p:sld {_P_NAMESPACES}><p:cSld><p:spTree>{_EMPTY_SP_TREE}"
+    '<p:sp><p:nvSpPr><p:cNvPr id="2" name="TextBox 1"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="457200" y="457200"/><a:ext cx="8229600" cy="5943600"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="square"/><a:lstStyle/>{content}</p:txBody></p:sp>'
+    "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>",
+)
+
+
+def build_pptx(text: str) -> bytes:
+    """单页幻灯片, 文本框中每行一个段落"""
+    paragraphs = "".join(
+        f'<a:p><a:r><a:rPr lang="zh-CN"/><a:t>{escape_xml(line)}</a:t></a:r></a:p>' if line else "<a:p/>"
+        for line in split_lines(text)
+    )
+    return PPTX_TEMPLATE.render(paragraphs)
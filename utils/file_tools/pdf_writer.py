@@ -0,0 +1,411 @@
+"""PDF 纯文本文档写入 (TrueType 字体按进程缓存)
+
+fpdf2 每生成一个文件都要 add_font: 用 fontTools 重新解析整个字体并遍历 cmap 计算字宽,
+输出时再对完整字体做一次子集化, CJK 字体每个文件耗时数百毫秒。
+只在进程内缓存 fpdf2 的字体对象不够: 输出时的 fontTools 子集化会原地修改字体,
+每个文件仍要重新载入字体并完整子集化, 缓存字宽后每个文件仍在 200ms 以上 (SimHei, 见 benchmarks/bench_pdf_writer),
+耗时主要在子集化本身。这里改为:
+    - 每个进程只读取、解析一次字体文件, 缓存 cmap、字宽、loca 偏移等度量数据
+    - 每个文件只截取用到的字形原始字节, 重新编号后拼成子集字体 (复合字形同步改写组件编号)
+    - 以 Type0 / CIDFontType2 + Identity-H 嵌入, CID 按字符分配, ToUnicode 可还原全部正文
+只支持 TrueType(glyf) 轮廓字体, 版式与原 fpdf2 multi_cell 一致: A4、10mm 边距、12 号字、10mm 行高
+"""
+
+import functools
+import hashlib
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+MM = 72 / 25.4
+PAGE_WIDTH = 210 * MM
+PAGE_HEIGHT = 297 * MM
+MARGIN = 10 * MM
+CELL_PADDING = 1 * MM
+BOTTOM_MARGIN = 20 * MM
+FONT_SIZE = 12
+LINE_HEIGHT = 10 * MM
+
+# 复合字形组件标志位
+ARG_1_AND_2_ARE_WORDS = 0x0001
+WE_HAVE_A_SCALE = 0x0008
+MORE_COMPONENTS = 0x0020
+WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+WE_HAVE_A_TWO_BY_TWO = 0x0080
+
+HINTING_TABLES = (b"cvt ", b"fpgm", b"prep")
+CHECKSUM_MAGIC = 0xB1B0AFBA
+
+
+def _checksum(data: bytes) -> int:
+    data = data + b"\x00" * (-len(data) % 4)
+    return sum(struct.unpack(f">{len(data) // 4}I", data)) & 0xFFFFFFFF
+
+
+class TrueTypeFont:
+    """解析后的 TrueType 字体, 只保留生成 PDF 所需的度量数据与原始表"""
+
+    def __init__(self, data: bytes):
+        if data[:4] not in (b"\x00\x01\x00\x00", b"true"):
+            raise ValueError("仅支持 TrueType(glyf) 轮廓字体")
+        self.data = data
+        table_count = struct.unpack_from(">H", data, 4)[0]
+        self.tables: Dict[bytes, Tuple[int, int]] = {}
+        for i in range(table_count):
+            tag, _, offset, length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+            self.tables[tag] = (offset, length)
+        for tag in (b"head", b"hhea", b"maxp", b"hmtx", b"loca", b"glyf", b"cmap"):
+            if tag not in self.tables:
+                raise ValueError(f"字体缺少 {tag.decode()} 表")
+
+        head = self.table(b"head")
+        self.units_per_em = struct.unpack_from(">H", head, 18)[0]
+        self.bbox = struct.unpack_from(">4h", head, 36)
+        long_loca = struct.unpack_from(">h", head, 50)[0] == 1
+
+        hhea = self.table(b"hhea")
+        self.ascent, self.descent = struct.unpack_from(">hh", hhea, 4)
+        metric_count = struct.unpack_from(">H", hhea, 34)[0]
+        self.glyph_count = struct.unpack_from(">H", self.table(b"maxp"), 4)[0]
+
+        hmtx = self.table(b"hmtx")
+        metrics = struct.unpack_from(f">{2 * metric_count}H", hmtx, 0)
+        self.advances = list(metrics[0::2])
+        self.lsbs = [lsb - 0x10000 if lsb >= 0x8000 else lsb for lsb in metrics[1::2]]
+        extra = self.glyph_count - metric_count
+        if extra > 0:
+            self.advances += [self.advances[-1]] * extra
+            self.lsbs += list(struct.unpack_from(f">{extra}h", hmtx, 4 * metric_count))
+
+        loca = self.table(b"loca")
+        if long_loca:
+            self.loca = struct.unpack_from(f">{self.glyph_count + 1}I", loca, 0)
+        else:
+            self.loca = tuple(2 * o for o in struct.unpack_from(f">{self.glyph_count + 1}H", loca, 0))
+        self.glyf_offset = self.tables[b"glyf"][0]
+
+        self.cmap = self._parse_cmap(self.table(b"cmap"))
+        self.scale = 1000 / self.units_per_em
+        self.widths = [round(advance * self.scale) for advance in self.advances]
+        self.name = self._postscript_name()
+        self.cap_height, self.weight = self._os2_metrics()
+        self.italic_angle, self.fixed_pitch = self._post_metrics()
+
+    def table(self, tag: bytes) -> bytes:
+        offset, length = self.tables[tag]
+        return self.data[offset : offset + length]
+
+    @staticmethod
+    def _parse_cmap(cmap: bytes) -> Dict[int, int]:
+        """优先 Unicode 全平面(format 12), 其次 BMP(format 4)"""
+        table_count = struct.unpack_from(">H", cmap, 2)[0]
+        subtables = {}
+        for i in range(table_count):
+            platform_id, encoding_id, offset = struct.unpack_from(">HHI", cmap, 4 + 8 * i)
+            subtables.setdefault(struct.unpack_from(">H", cmap, offset)[0], []).append(
+                ((platform_id, encoding_id), offset)
+            )
+        for (platform_id, encoding_id), offset in subtables.get(12, []):
+            if (platform_id, encoding_id) in ((3, 10), (0, 4), (0, 6)):
+                group_count = struct.unpack_from(">I", cmap, offset + 12)[0]
+                mapping = {}
+                for i in range(group_count):
+                    start, end, glyph = struct.unpack_from(">III", cmap, offset + 16 + 12 * i)
+                    for code in range(start, end + 1):
+                        mapping[code] = glyph + code - start
+                return mapping
+        for (platform_id, encoding_id), offset in subtables.get(4, []):
+            if (platform_id, encoding_id) in ((3, 1), (0, 3), (0, 4), (0, 6)):
+                seg_count = struct.unpack_from(">H", cmap, offset + 6)[0] // 2
+                ends = struct.unpack_from(f">{seg_count}H", cmap, offset + 14)
+                starts_at = offset + 16 + 2 * seg_count
+                starts = struct.unpack_from(f">{seg_count}H", cmap, starts_at)
+                deltas = struct.unpack_from(f">{seg_count}H", cmap, starts_at + 2 * seg_count)
+                ranges_at = starts_at + 4 * seg_count
+                ranges = struct.unpack_from(f">{seg_count}H", cmap, ranges_at)
+                mapping = {}
+                for i in range(seg_count):
+                    for code in range(starts[i], ends[i] + 1):
+                        if code == 0xFFFF:
+                            continue
+                        if ranges[i] == 0:
+                            glyph = (code + deltas[i]) & 0xFFFF
+                        else:
+                            at = ranges_at + 2 * i + ranges[i] + 2 * (code - starts[i])
+                            glyph = struct.unpack_from(">H", cmap, at)[0]
+                            glyph = (glyph + deltas[i]) & 0xFFFF if glyph else 0
+                        if glyph:
+                            mapping[code] = glyph
+                return mapping
+        raise ValueError("字体缺少 Unicode cmap")
+
+    def _postscript_name(self) -> str:
+        if b"name" in self.tables:
+            name = self.table(b"name")
+            count, string_offset = struct.unpack_from(">2xHH", name, 0)
+            for i in range(count):
+                platform_id, _, _, name_id, length, offset = struct.unpack_from(">6H", name, 6 + 12 * i)
+                if name_id != 6:
+                    continue
+                raw = name[string_offset + offset : string_offset + offset + length]
+                value = raw.decode("utf-16-be" if platform_id in (0, 3) else "latin-1", "ignore")
+                value = "".join(c for c in value if c.isascii() and (c.isalnum() or c == "-"))
+                if value:
+                    return value
+        return "TrueTypeFont"
+
+    def _os2_metrics(self) -> Tuple[int, int]:
+        if b"OS/2" not in self.tables:
+            return self.ascent, 400
+        os2 = self.table(b"OS/2")
+        version, _, weight = struct.unpack_from(">HhH", os2, 0)
+        cap_height = struct.unpack_from(">h", os2, 88)[0] if version >= 2 and len(os2) >= 90 else self.ascent
+        return cap_height, weight
+
+    def _post_metrics(self) -> Tuple[float, bool]:
+        if b"post" not in self.tables:
+            return 0.0, False
+        italic_angle, _, _, fixed_pitch = struct.unpack_from(">ihhI", self.table(b"post"), 4)
+        return italic_angle / 65536, bool(fixed_pitch)
+
+    def glyph_id(self, char: str) -> int:
+        return self.cmap.get(ord(char), 0)
+
+    def glyph_data(self, glyph_id: int) -> bytes:
+        start, end = self.loca[glyph_id], self.loca[glyph_id + 1]
+        return self.data[self.glyf_offset + start : self.glyf_offset + end]
+
+    def text_width(self, text: str, size: float) -> float:
+        return sum(self.widths[self.glyph_id(c)] for c in text) * size / 1000
+
+    def subset(self, glyph_ids: Sequence[int]) -> Tuple[bytes, Dict[int, int]]:
+        """截取字形生成子集字体, 返回 (字体字节, 原字形编号 -> 新编号)"""
+        new_ids = {0: 0}
+        order = [0]
+        pending = list(glyph_ids)
+        glyphs = []
+        while len(glyphs) < len(order) or pending:
+            for glyph_id in pending:
+                if glyph_id not in new_ids:
+                    new_ids[glyph_id] = len(order)
+                    order.append(glyph_id)
+            pending = []
+            while len(glyphs) < len(order):
+                data = self.glyph_data(order[len(glyphs)])
+                if len(data) >= 10 and struct.unpack_from(">h", data, 0)[0] < 0:
+                    pending += self._components(data)
+                glyphs.append(data)
+
+        glyf = bytearray()
+        loca = [0]
+        for data in glyphs:
+            if len(data) >= 10 and struct.unpack_from(">h", data, 0)[0] < 0:
+                data = self._remap_components(data, new_ids)
+            glyf += data + b"\x00" * (-len(data) % 4)
+            loca.append(len(glyf))
+
+        count = len(order)
+        head = bytearray(self.table(b"head"))
+        struct.pack_into(">I", head, 8, 0)
+        struct.pack_into(">h", head, 50, 1)
+        hhea = bytearray(self.table(b"hhea"))
+        struct.pack_into(">H", hhea, 34, count)
+        maxp = bytearray(self.table(b"maxp"))
+        struct.pack_into(">H", maxp, 4, count)
+        hmtx = b"".join(struct.pack(">Hh", self.advances[g], self.lsbs[g]) for g in order)
+
+        tables = {
+            b"head": bytes(head),
+            b"hhea": bytes(hhea),
+            b"maxp": bytes(maxp),
+            b"hmtx": hmtx,
+            b"loca": struct.pack(f">{count + 1}I", *loca),
+            b"glyf": bytes(glyf),
+        }
+        for tag in HINTING_TABLES:
+            if tag in self.tables:
+                tables[tag] = self.table(tag)
+        return _write_sfnt(tables), new_ids
+
+    @staticmethod
+    def _walk_components(data: bytes):
+        """遍历复合字形, 依次产出组件编号在字形数据中的偏移"""
+        offset = 10
+        while True:
+            flags = struct.unpack_from(">H", data, offset)[0]
+            yield offset + 2
+            offset += 4 + (4 if flags & ARG_1_AND_2_ARE_WORDS else 2)
+            if flags & WE_HAVE_A_SCALE:
+                offset += 2
+            elif flags & WE_HAVE_AN_X_AND_Y_SCALE:
+                offset += 4
+            elif flags & WE_HAVE_A_TWO_BY_TWO:
+                offset += 8
+            if not flags & MORE_COMPONENTS:
+                return
+
+    def _components(self, data: bytes) -> List[int]:
+        return [struct.unpack_from(">H", data, at)[0] for at in self._walk_components(data)]
+
+    def _remap_components(self, data: bytes, new_ids: Dict[int, int]) -> bytes:
+        data = bytearray(data)
+        for at in self._walk_components(data):
+            struct.pack_into(">H", data, at, new_ids[struct.unpack_from(">H", data, at)[0]])
+        return bytes(data)
+
+
+def _write_sfnt(tables: Dict[bytes, bytes]) -> bytes:
+    """按表名排序写出字体文件, 并回填 head.checkSumAdjustment"""
+    tags = sorted(tables)
+    entry_selector = len(tags).bit_length() - 1
+    search_range = 16 << entry_selector
+    font = bytearray(
+        struct.pack(">IHHHH", 0x00010000, len(tags), search_range, entry_selector, 16 * len(tags) - search_range)
+    )
+    offsets = {}
+    body = bytearray()
+    for tag in tags:
+        data = tables[tag]
+        offsets[tag] = 12 + 16 * len(tags) + len(body)
+        font += struct.pack(">4sIII", tag, _checksum(data), offsets[tag], len(data))
+        body += data + b"\x00" * (-len(data) % 4)
+    font += body
+    adjustment = (CHECKSUM_MAGIC - _checksum(bytes(font))) & 0xFFFFFFFF
+    struct.pack_into(">I", font, offsets[b"head"] + 8, adjustment)
+    return bytes(font)
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(font_path: str) -> TrueTypeFont:
+    """读取并解析字体, 同一进程内按路径缓存"""
+    return TrueTypeFont(Path(font_path).read_bytes())
+
+
+def wrap_lines(font: TrueTypeFont, text: str, size: float, max_width: float) -> List[str]:
+    """按字宽折行: 优先在空格处断开, 否则按字符断开"""
+    text = text.replace("\r\n", "\n")
+    paragraphs = text.split("\n")
+    if paragraphs and paragraphs[-1] == "":
+        paragraphs.pop()
+    lines = []
+    limit = max_width * 1000 / size
+    for paragraph in paragraphs:
+        start, width, last_space = 0, 0, -1
+        i = 0
+        while i < len(paragraph):
+            char = paragraph[i]
+            if char == " ":
+                last_space = i
+            width += font.widths[font.glyph_id(char)]
+            if width > limit and i > start:
+                end = last_space if last_space > start else i
+                lines.append(paragraph[start:end])
+                start = end + 1 if end == last_space else end
+                i, width, last_space = start, 0, -1
+                continue
+            i += 1
+        lines.append(paragraph[start:])
+    return lines
+
+
+def _stream(dictionary: str, data: bytes) -> bytes:
+    data = zlib.compress(data)
+    return f"<< {dictionary} /Filter /FlateDecode /Length {len(data)} >>\nstream\n".encode("ascii") + data + b"\nendstream"
+
+
+def _to_unicode(chars: List[str]) -> bytes:
+    entries = [f"<{cid:04X}> <{char.encode('utf-16-be').hex().upper()}>" for cid, char in enumerate(chars, 1)]
+    blocks = []
+    for i in range(0, len(entries), 100):
+        chunk = entries[i : i + 100]
+        blocks.append(f"{len(chunk)} beginbfchar\n" + "\n".join(chunk) + "\nendbfchar")
+    return (
+        "/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        + "\n".join(blocks)
+        + "\nendcmap\nCMapName currentdict /CMap defineresource pop\nend\nend"
+    ).encode("ascii")
+
+
+def _write_pdf(objects: List[bytes]) -> bytes:
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("ascii")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+    return bytes(output)
+
+
+def build_pdf(text: str, font_path: str) -> bytes:
+    """生成包含 text 的 PDF 文件字节, 换行视为分行, 超长行自动折行、分页"""
+    font = load_font(str(font_path))
+    lines = wrap_lines(font, text, FONT_SIZE, PAGE_WIDTH - 2 * MARGIN - 2 * CELL_PADDING)
+
+    # 按字符分配 CID(0 保留给 .notdef), 缺字映射到 .notdef 但仍可通过 ToUnicode 还原
+    cids: Dict[str, int] = {}
+    for line in lines:
+        for char in line:
+            if char not in cids:
+                cids[char] = len(cids) + 1
+    chars = list(cids)
+    font_data, new_ids = font.subset([font.glyph_id(c) for c in chars])
+    cid_to_gid = b"\x00\x00" + b"".join(struct.pack(">H", new_ids[font.glyph_id(c)]) for c in chars)
+    widths = " ".join(str(font.widths[font.glyph_id(c)]) for c in chars)
+
+    lines_per_page = max(1, int((PAGE_HEIGHT - MARGIN - BOTTOM_MARGIN) // LINE_HEIGHT))
+    pages = [lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    tag = "".join(chr(65 + b % 26) for b in hashlib.md5(font_data).digest()[:6])
+    bbox = " ".join(str(round(v * font.scale)) for v in font.bbox)
+    flags = 4 | (1 if font.fixed_pitch else 0) | (64 if font.italic_angle else 0)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # 页面树, 页面对象编号确定后再填入
+        f"<< /Type /Font /Subtype /Type0 /BaseFont /{tag}+{font.name} /Encoding /Identity-H "
+        f"/DescendantFonts [4 0 R] /ToUnicode 8 0 R >>".encode("ascii"),
+        f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{tag}+{font.name} "
+        f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        f"/FontDescriptor 5 0 R /DW {font.widths[0]} /W [1 [{widths}]] /CIDToGIDMap 7 0 R >>".encode("ascii"),
+        f"<< /Type /FontDescriptor /FontName /{tag}+{font.name} /Flags {flags} /FontBBox [{bbox}] "
+        f"/ItalicAngle {font.italic_angle:g} /Ascent {round(font.ascent * font.scale)} "
+        f"/Descent {round(font.descent * font.scale)} /CapHeight {round(font.cap_height * font.scale)} "
+        f"/StemV {round(50 + (font.weight / 65) ** 2)} /FontFile2 6 0 R >>".encode("ascii"),
+        _stream(f"/Length1 {len(font_data)}", font_data),
+        _stream("", cid_to_gid),
+        _stream("", _to_unicode(chars)),
+    ]
+
+    x = MARGIN + CELL_PADDING
+    page_refs = []
+    for page_lines in pages:
+        content = []
+        for row, line in enumerate(page_lines):
+            if not line:
+                continue
+            # 与 fpdf2 一致: 文字在行高内垂直居中
+            y = PAGE_HEIGHT - MARGIN - row * LINE_HEIGHT - LINE_HEIGHT / 2 - 0.3 * FONT_SIZE
+            encoded = "".join(f"{cids[c]:04X}" for c in line)
+            content.append(f"BT /F1 {FONT_SIZE} Tf {x:.2f} {y:.2f} Td <{encoded}> Tj ET")
+        page_number = len(objects) + 1
+        page_refs.append(f"{page_number} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH:.2f} {PAGE_HEIGHT:.2f}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode("ascii")
+        )
+        objects.append(_stream("", "\n".join(content).encode("ascii")))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode("ascii")
+    return _write_pdf(objects)
+
+
+def save_pdf_file(text: str, pdf_path: str, font_path: str) -> str:
+    pdf_path = Path(pdf_path)
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    pdf_path.write_bytes(build_pdf(text, font_path))
+    return str(pdf_path)
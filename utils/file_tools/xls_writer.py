@@ -0,0 +1,137 @@
+"""Excel 97-2003 (.xls) 纯文本工作簿写入
+
+按 [MS-XLS] 直接生成 BIFF8 记录, 外层复合文档复用 doc_writer.write_compound_file:
+    - 工作簿全局子流: BOF、代码页、窗口、字体、15 个样式 XF + 1 个单元格 XF、共享字符串表(SST)
+    - 单个工作表子流: 尺寸、LABELSST 单元格、窗口
+单元格 XF 开启自动换行, 多行测试数据与 xlwt 写出的内容一致; 超过单条记录上限的字符串用 CONTINUE 续写
+"""
+
+import struct
+from typing import Dict, List, Sequence
+
+from utils.file_tools.doc_writer import MINI_STREAM_CUTOFF, write_compound_file
+
+# Excel.Sheet.8 的 CLSID {00020820-0000-0000-C000-000000000046}
+EXCEL_SHEET_CLSID = bytes.fromhex("2008020000000000c000000000000046")
+
+# 记录类型
+BOF = 0x0809
+EOF = 0x000A
+CODEPAGE = 0x0042
+WINDOW1 = 0x003D
+FONT = 0x0031
+XF = 0x00E0
+STYLE = 0x0293
+BOUNDSHEET = 0x0085
+SST = 0x00FC
+CONTINUE = 0x003C
+DIMENSIONS = 0x0200
+LABELSST = 0x00FD
+WINDOW2 = 0x023E
+
+MAX_RECORD_DATA = 8224
+MAX_ROWS = 65536
+MAX_COLUMNS = 256
+MAX_CELL_CHARS = 32767
+BIFF8_VERSION = 0x0600
+CODEPAGE_UTF16 = 1200
+FONT_COUNT = 5
+STYLE_XF_COUNT = 15
+CELL_XF = STYLE_XF_COUNT
+SHEET_NAME = "Sheet1"
+
+
+def _record(record_type: int, data: bytes = b"") -> bytes:
+    return struct.pack("<HH", record_type, len(data)) + data
+
+
+def _bof(substream_type: int) -> bytes:
+    return _record(BOF, struct.pack("<HHHHII", BIFF8_VERSION, substream_type, 0x0DBB, 0x07CC, 0, 0x0006))
+
+
+def _xf(parent_flags: int, alignment: int, used: int) -> bytes:
+    # 字体 0、常规格式 0; 边框/填充为空, 前景/背景使用系统颜色 64/65
+    return _record(XF, struct.pack("<HHHBBBBIIH", 0, 0, parent_flags, alignment, 0, 0, used, 0, 0, 0x20C0))
+
+
+def _globals_head() -> bytes:
+    font = struct.pack("<HHHHHBBBB", 200, 0, 0x7FFF, 400, 0, 0, 0, 1, 0) + b"\x05\x00Arial"
+    return b"".join(
+        [
+            _bof(0x0005),
+            _record(CODEPAGE, struct.pack("<H", CODEPAGE_UTF16)),
+            _record(WINDOW1, struct.pack("<hhHHHHHHH", 0x01E0, 0x005A, 0x3FCF, 0x2A4E, 0x0038, 0, 0, 1, 0x0258)),
+            _record(FONT, font) * FONT_COUNT,
+            # 样式 XF: fStyle + 父样式 0xFFF; 单元格 XF: fLocked, 对齐方式为底端 + 自动换行
+            _xf(0xFFF5, 0x20, 0xF4) * STYLE_XF_COUNT,
+            _xf(0x0001, 0x28, 0xF8),
+            # 内置 Normal 样式指向 XF 0
+            _record(STYLE, struct.pack("<HBB", 0x8000, 0, 0xFF)),
+        ]
+    )
+
+
+def _sst(strings: List[str], total: int) -> bytes:
+    """共享字符串表, 全部按 UTF-16LE 存储; 字符串可跨 CONTINUE 记录, 续写部分以选项字节开头"""
+    records = []
+    current = bytearray(struct.pack("<II", total, len(strings)))
+    for value in strings:
+        encoded = value.encode("utf-16-le")
+        # 字符串头 (cch + 选项) 与首个字符不能拆开
+        if len(current) + 5 > MAX_RECORD_DATA:
+            records.append(current)
+            current = bytearray()
+        current += struct.pack("<HB", len(encoded) // 2, 0x01)
+        while encoded:
+            room = (MAX_RECORD_DATA - len(current)) & ~1
+            current += encoded[:room]
+            encoded = encoded[room:]
+            if encoded:
+                records.append(current)
+                current = bytearray(b"\x01")
+    records.append(current)
+    return _record(SST, bytes(records[0])) + b"".join(_record(CONTINUE, bytes(data)) for data in records[1:])
+
+
+def _sheet(cells: List[bytes], row_count: int, column_count: int) -> bytes:
+    return b"".join(
+        [
+            _bof(0x0010),
+            _record(DIMENSIONS, struct.pack("<IIHHH", 0, row_count, 0, column_count, 0)),
+            b"".join(cells),
+            _record(WINDOW2, struct.pack("<HHHHHHHI", 0x02B6, 0, 0, 64, 0, 0, 0, 0)),
+            _record(EOF),
+        ]
+    )
+
+
+def build_workbook_stream(rows: Sequence[Sequence[str]]) -> bytes:
+    """生成 Workbook 流, 单个工作表, 单元格均为共享字符串"""
+    if len(rows) > MAX_ROWS or any(len(row) > MAX_COLUMNS for row in rows):
+        raise ValueError(f"xls 最多 {MAX_ROWS} 行、{MAX_COLUMNS} 列")
+
+    string_ids: Dict[str, int] = {}
+    cells = []
+    for r, row in enumerate(rows):
+        for c, value in enumerate(row):
+            value = str(value)
+            if len(value.encode("utf-16-le")) // 2 > MAX_CELL_CHARS:
+                raise ValueError(f"单元格内容超过 {MAX_CELL_CHARS} 个字符: 第 {r + 1} 行第 {c + 1} 列")
+            isst = string_ids.setdefault(value, len(string_ids))
+            cells.append(_record(LABELSST, struct.pack("<HHHI", r, c, CELL_XF, isst)))
+    column_count = max((len(row) for row in rows), default=0)
+
+    head = _globals_head()
+    sheet_name = SHEET_NAME.encode("latin-1")
+    boundsheet_size = 4 + 6 + 2 + len(sheet_name)
+    tail = _sst(list(string_ids), len(cells)) + _record(EOF)
+    # BOUNDSHEET 记录保存工作表 BOF 在流中的偏移
+    sheet_offset = len(head) + boundsheet_size + len(tail)
+    boundsheet = _record(BOUNDSHEET, struct.pack("<IBBBB", sheet_offset, 0, 0, len(sheet_name), 0) + sheet_name)
+    return head + boundsheet + tail + _sheet(cells, len(rows), column_count)
+
+
+def build_xls(rows: Sequence[Sequence[str]]) -> bytes:
+    """单个工作表的 xls 文件字节"""
+    stream = build_workbook_stream(rows).ljust(MINI_STREAM_CUTOFF, b"\x00")
+    return write_compound_file({"Workbook": stream}, root_clsid=EXCEL_SHEET_CLSID)
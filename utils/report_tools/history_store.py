@@ -0,0 +1,257 @@
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.log_tools.logger_utils import get_logger
+from utils.sr_tools.label_compare import FILE_TYPES, LABEL_PARTS, misidentification_count
+from utils.sr_tools.label_parser import LABEL_LOCATIONS
+
+log = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS label_results (
+    run_id TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    label_id TEXT NOT NULL,
+    label_name TEXT,
+    part TEXT NOT NULL,
+    location TEXT NOT NULL,
+    expected INTEGER NOT NULL,
+    matched INTEGER NOT NULL,
+    misidentified INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    PRIMARY KEY (run_id, spec, kind, label_id, part, location)
+) WITHOUT ROWID;
+"""
+
+_KEY_COLUMNS = ("spec", "kind", "label_id", "part", "location")
+
+
+@dataclass(frozen=True)
+class LabelChange:
+    """两次运行之间, 某个标签在某个位置上的结果变化"""
+
+    spec: str
+    kind: str
+    label_id: str
+    label_name: Optional[str]
+    part: str
+    location: str
+    before_matched: int
+    after_matched: int
+    expected: int
+    before_misidentified: int
+    after_misidentified: int
+
+
+@dataclass
+class RunDiff:
+    """两次运行的差异: regressions 为由通过变为失败, fixes 为由失败变为通过"""
+
+    base_run: str
+    target_run: str
+    regressions: List[LabelChange]
+    fixes: List[LabelChange]
+
+    def summary(self) -> str:
+        return (
+            f"{self.base_run} -> {self.target_run}: "
+            f"回退 {len(self.regressions)} | 修复 {len(self.fixes)}"
+        )
+
+
+class RunHistoryStore:
+    """数据标签测试的运行历史(SQLite)
+
+    每条记录以 (运行, 标准, 类型, 标签, 方向, 位置) 为键, 类型为 api 或 file:
+        - api: 方向为 request/response, 位置为 start_line/headers/body
+        - file: 方向固定为 file, 位置为文件类型
+    写入先进入缓冲区, 满 batch_size 条后批量提交, 校验过程中可逐个标签写入
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending: List[Tuple[Any, ...]] = []
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # ---------- 写入 ----------
+
+    def start_run(self, note: Optional[str] = None) -> str:
+        """登记一次新的运行, 返回 run_id(按时间排序)"""
+        started_at = time.time()
+        run_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(started_at)) + "-" + uuid.uuid4().hex[:6]
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, note) VALUES (?, ?, ?)",
+                (run_id, started_at, note),
+            )
+        log.info(f"开始记录运行历史: {run_id}")
+        return run_id
+
+    def finish_run(self, run_id: str):
+        self.flush()
+        with self._conn:
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), run_id)
+            )
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO label_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending.clear()
+
+    def _append(self, rows: Iterable[Tuple[Any, ...]]):
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def record_api_result(self, run_id: str, spec: str, result: Dict[str, Dict[str, Any]]):
+        """写入单个标签的 API 对比结果(compare_api_label 的返回值)"""
+        rows = []
+        for part in LABEL_PARTS:
+            part_result = result.get(part)
+            if not part_result:
+                continue
+            send_failed = part_result.get("send_failed") or {}
+            for location in LABEL_LOCATIONS:
+                if send_failed.get(location):
+                    # 流量未发送成功的位置没有识别数据, 不写入历史, 以免被当作回退
+                    continue
+                expected = len(part_result["sample"].get(location) or [])
+                unmatched = len(part_result["unmatched"].get(location) or [])
+                misidentified = len(part_result["misidentification"].get(location) or {})
+                over_detected = (part_result.get("over_detected") or {}).get(location)
+                rows.append(
+                    (
+                        run_id,
+                        spec,
+                        "api",
+                        part_result["id"],
+                        part_result["name"],
+                        part,
+                        location,
+                        expected,
+                        expected - unmatched,
+                        misidentified,
+                        int(unmatched == 0 and misidentified == 0 and not over_detected),
+                    )
+                )
+        self._append(rows)
+
+    def record_file_result(
+        self,
+        run_id: str,
+        spec: str,
+        result: Dict[str, Any],
+        file_types: Sequence[str] = FILE_TYPES,
+    ):
+        """写入单个标签的文件对比结果(compare_file_label 的返回值)"""
+        rows = []
+        for file_type in file_types:
+            detail = result.get(file_type)
+            if not detail:
+                continue
+            misidentified = sum(
+                misidentification_count(v) for v in (detail["misidentification"] or {}).values()
+            )
+            rows.append(
+                (
+                    run_id,
+                    spec,
+                    "file",
+                    result["id"],
+                    result["name"],
+                    "file",
+                    file_type,
+                    detail["expected_count"],
+                    detail["matched_count"],
+                    misidentified,
+                    int(detail["expected_count"] == detail["matched_count"] and misidentified == 0),
+                )
+            )
+        self._append(rows)
+
+    def record_api_results(self, run_id: str, spec: str, results: Iterable[Dict[str, Dict[str, Any]]]):
+        for result in results:
+            self.record_api_result(run_id, spec, result)
+
+    def record_file_results(self, run_id: str, spec: str, results: Iterable[Dict[str, Any]]):
+        for result in results:
+            self.record_file_result(run_id, spec, result)
+
+    # ---------- 查询 ----------
+
+    def list_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按开始时间倒序列出运行"""
+        sql = "SELECT run_id, started_at, finished_at, note FROM runs ORDER BY started_at DESC"
+        params: Tuple[Any, ...] = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return [
+            {"run_id": r[0], "started_at": r[1], "finished_at": r[2], "note": r[3]}
+            for r in self._conn.execute(sql, params)
+        ]
+
+    def previous_run(self, run_id: str, spec: Optional[str] = None) -> Optional[str]:
+        """run_id 之前最近一次(包含指定标准结果的)运行"""
+        sql = (
+            "SELECT r.run_id FROM runs r WHERE r.started_at < "
+            "(SELECT started_at FROM runs WHERE run_id = ?)"
+        )
+        params: List[Any] = [run_id]
+        if spec is not None:
+            sql += " AND EXISTS (SELECT 1 FROM label_results l WHERE l.run_id = r.run_id AND l.spec = ?)"
+            params.append(spec)
+        row = self._conn.execute(sql + " ORDER BY r.started_at DESC LIMIT 1", params).fetchone()
+        return row[0] if row else None
+
+    def diff(self, base_run: str, target_run: str, spec: Optional[str] = None) -> RunDiff:
+        """对比两次运行, 只比较两次都存在的 (标准, 类型, 标签, 方向, 位置)"""
+        self.flush()
+        join_on = " AND ".join(f"b.{c} = t.{c}" for c in _KEY_COLUMNS)
+        sql = (
+            "SELECT t.spec, t.kind, t.label_id, t.label_name, t.part, t.location, "
+            "b.matched, t.matched, t.expected, b.misidentified, t.misidentified, b.passed "
+            f"FROM label_results b JOIN label_results t ON {join_on} "
+            "WHERE b.run_id = ? AND t.run_id = ? AND b.passed != t.passed"
+        )
+        params: List[Any] = [base_run, target_run]
+        if spec is not None:
+            sql += " AND t.spec = ?"
+            params.append(spec)
+        sql += " ORDER BY t.spec, t.kind, t.label_id, t.part, t.location"
+
+        regressions, fixes = [], []
+        for row in self._conn.execute(sql, params):
+            change = LabelChange(*row[:11])
+            (regressions if row[11] else fixes).append(change)
+        return RunDiff(base_run, target_run, regressions, fixes)
@@ -0,0 +1,363 @@
+"""数据标签测试结果 Excel 报告: API 请求/响应识别详情与文件识别详情导出到同一个工作簿
+
+openpyxl 导入耗时较长, 只在导出阶段导入本模块
+"""
+
+import json
+from typing import Dict, List
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from utils.log_tools.logger_utils import get_logger
+
+log = get_logger(__name__)
+
+
+def export_label_to_excel(
+    api_asset_data_label_test_result: List[Dict[str, Dict]],
+    file_asset_data_label_test_result: List[Dict],
+    file_path: str,
+):
+    """导出 API 和文件标签测试结果到同一个 Excel 文件，采用一次性覆盖逻辑"""
+
+    def handle_empty(x):
+        if x in (None, 0, "") or (hasattr(x, "__len__") and len(x) == 0):
+            return "-"
+        elif isinstance(x, (list, dict)):
+            try:
+                json_str = json.dumps(x, ensure_ascii=False, indent=2)
+                return (
+                    json_str
+                    if len(json_str) <= 1000
+                    else json.dumps(x, ensure_ascii=False)
+                )
+            except:
+                return str(x)
+        else:
+            return x
+
+    # ===== 样式定义 =====
+    thin_border = Border(
+        left=Side(style="thin"),
+        right=Side(style="thin"),
+        top=Side(style="thin"),
+        bottom=Side(style="thin"),
+    )
+    header_fill = PatternFill("solid", fgColor="FF4F81BD")
+    header_font = Font(bold=True, color="FFFFFFFF", size=12)
+    pass_fill = PatternFill("solid", fgColor="92D050")
+    pass_font = Font(color="006100", bold=True)
+    fail_fill = PatternFill("solid", fgColor="FF0000")
+    fail_font = Font(color="FFFFFF", bold=True)
+    count_blue_font = Font(color="0000FF", bold=True)
+    count_gray_font = Font(color="808080")
+    even_row_fill = PatternFill("solid", fgColor="F2F2F2")
+    odd_row_fill = PatternFill("solid", fgColor="FFFFFF")
+
+    # API 类型颜色
+    api_type_fills = {
+        "样本": PatternFill("solid", fgColor="FFFFCC"),
+        "已匹配": PatternFill("solid", fgColor="E2EFDA"),
+        "未匹配": PatternFill("solid", fgColor="FCE4D6"),
+        "多识别": PatternFill("solid", fgColor="FFF2CC"),
+        "误匹配": PatternFill("solid", fgColor="FFE6E6"),
+        "发送失败": PatternFill("solid", fgColor="D9D9D9"),
+    }
+
+    # 文件类型颜色
+    file_type_fills = {
+        ".doc": PatternFill("solid", fgColor="E2EFDA"),
+        ".docx": PatternFill("solid", fgColor="DDEBF7"),
+        ".xls": PatternFill("solid", fgColor="FFF2CC"),
+        ".xlsx": PatternFill("solid", fgColor="FCE4D6"),
+        ".txt": PatternFill("solid", fgColor="E2EFDA"),
+        ".pptx": PatternFill("solid", fgColor="DDEBF7"),
+        ".pdf": PatternFill("solid", fgColor="FFF2CC"),
+        ".csv": PatternFill("solid", fgColor="FCE4D6"),
+    }
+
+    # ===== 创建全新工作簿，覆盖现有文件 =====
+    wb = Workbook()
+    # 移除默认的Sheet
+    if "Sheet" in wb.sheetnames:
+        wb.remove(wb["Sheet"])
+
+    # ===== API 数据导出 =====
+    for sheet_type in ["request", "response"]:
+        sheet_name = (
+            "请求详情识别结果" if sheet_type == "request" else "响应详情识别结果"
+        )
+        ws = wb.create_sheet(sheet_name)
+
+        # 添加表头
+        headers = [
+            "编号",
+            "名称",
+            "类型",
+            "start_line",
+            "headers",
+            "body",
+            "匹配数量",
+            "状态",
+        ]
+        ws.append(headers)
+
+        # 设置表头样式
+        for col in range(1, len(headers) + 1):
+            cell = ws.cell(1, col)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = thin_border
+
+        for item in api_asset_data_label_test_result:
+            if sheet_type not in item:
+                continue
+            sheet_data = item[sheet_type]
+            types = ["样本", "已匹配", "未匹配", "多识别", "误匹配", "发送失败"]
+            key_map = {
+                "样本": "sample",
+                "已匹配": "matched",
+                "未匹配": "unmatched",
+                "多识别": "over_detected",
+                "误匹配": "misidentification",
+                "发送失败": "send_failed",
+            }
+            start_row = ws.max_row + 1
+
+            for t in types:
+                row_data = sheet_data.get(key_map[t], {})
+                row = [
+                    handle_empty(sheet_data.get("id")),
+                    handle_empty(sheet_data.get("name")),
+                    t,
+                    handle_empty(row_data.get("start_line")),
+                    handle_empty(row_data.get("headers")),
+                    handle_empty(row_data.get("body")),
+                    handle_empty(row_data.get("count", 0)),
+                    handle_empty(sheet_data.get("status")),
+                ]
+                ws.append(row)
+                cur_row = ws.max_row
+
+                # 设置样式
+                for col in range(1, 9):
+                    cell = ws.cell(cur_row, col)
+                    cell.border = thin_border
+                    if col not in [3, 7, 8]:
+                        cell.fill = (
+                            even_row_fill if cur_row % 2 == 0 else odd_row_fill
+                        )
+
+                ws.cell(cur_row, 3).fill = api_type_fills[t]
+                ws.cell(cur_row, 3).alignment = Alignment(
+                    horizontal="center", vertical="center"
+                )
+
+                count_cell = ws.cell(cur_row, 7)
+                try:
+                    if count_cell.value not in ("-", None, ""):
+                        count_cell.font = (
+                            count_blue_font
+                            if int(count_cell.value) > 0
+                            else count_gray_font
+                        )
+                    else:
+                        count_cell.font = count_gray_font
+                except:
+                    count_cell.font = count_gray_font
+                count_cell.alignment = Alignment(
+                    horizontal="center", vertical="center"
+                )
+
+                status_cell = ws.cell(cur_row, 8)
+                if status_cell.value == "PASS":
+                    status_cell.fill, status_cell.font = pass_fill, pass_font
+                elif status_cell.value == "FAILED":
+                    status_cell.fill, status_cell.font = fail_fill, fail_font
+                status_cell.alignment = Alignment(
+                    horizontal="center", vertical="center"
+                )
+
+            # 合并编号、名称、状态
+            end_row = ws.max_row
+            for col in [1, 2, 8]:
+                ws.merge_cells(
+                    start_row=start_row,
+                    start_column=col,
+                    end_row=end_row,
+                    end_column=col,
+                )
+                merged_cell = ws.cell(start_row, col)
+                merged_cell.alignment = Alignment(
+                    horizontal="center", vertical="center"
+                )
+                merged_cell.border = thin_border
+                if col != 8:
+                    merged_cell.fill = (
+                        even_row_fill if start_row % 2 == 0 else odd_row_fill
+                    )
+                else:
+                    if str(merged_cell.value or "").upper() == "PASS":
+                        merged_cell.fill, merged_cell.font = pass_fill, pass_font
+                    elif str(merged_cell.value or "").upper() == "FAILED":
+                        merged_cell.fill, merged_cell.font = fail_fill, fail_font
+
+    # ===== 文件标签数据导出 =====
+    sheet_name = "文件标签识别结果"
+    ws = wb.create_sheet(sheet_name)
+
+    # 添加表头
+    headers = [
+        "编号",
+        "名称",
+        "文件类型",
+        "目标文件",
+        "预期数量",
+        "匹配数量",
+        "误匹配详情",
+        "状态",
+    ]
+    ws.append(headers)
+
+    # 设置表头样式
+    for col in range(1, len(headers) + 1):
+        cell = ws.cell(1, col)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+        cell.border = thin_border
+
+    file_types = list(file_type_fills.keys())
+    for item in file_asset_data_label_test_result:
+        start_row = ws.max_row + 1
+        for ft in file_types:
+            file_data = item.get(ft)
+            row = [
+                handle_empty(item.get("id")),
+                handle_empty(item.get("name")),
+                ft,
+                handle_empty(
+                    f"{file_data['target_file']} (上传失败)"
+                    if file_data and file_data.get("upload_failed")
+                    else file_data.get("target_file") if file_data else None
+                ),
+                handle_empty(
+                    file_data.get("expected_count") if file_data else None
+                ),
+                handle_empty(file_data.get("matched_count") if file_data else None),
+                handle_empty(
+                    file_data.get("misidentification") if file_data else None
+                ),
+                handle_empty(item.get("status")),
+            ]
+            ws.append(row)
+            cur_row = ws.max_row
+
+            for col in range(1, 9):
+                cell = ws.cell(cur_row, col)
+                cell.border = thin_border
+                if col not in [3, 6, 8]:
+                    cell.fill = even_row_fill if cur_row % 2 == 0 else odd_row_fill
+
+            ws.cell(cur_row, 3).fill = file_type_fills.get(ft, odd_row_fill)
+            ws.cell(cur_row, 3).alignment = Alignment(
+                horizontal="center", vertical="center"
+            )
+
+            # count 列
+            count_cell = ws.cell(cur_row, 6)
+            try:
+                if count_cell.value not in ("-", None, ""):
+                    count_cell.font = (
+                        count_blue_font
+                        if int(count_cell.value) > 0
+                        else count_gray_font
+                    )
+                else:
+                    count_cell.font = count_gray_font
+            except:
+                count_cell.font = count_gray_font
+            count_cell.alignment = Alignment(horizontal="right", vertical="center")
+
+            # 状态列
+            status_cell = ws.cell(cur_row, 8)
+            status_value = str(status_cell.value or "").upper()
+            if "PASS" in status_value:
+                status_cell.fill, status_cell.font = pass_fill, pass_font
+            elif "FAILED" in status_value:
+                status_cell.fill, status_cell.font = fail_fill, fail_font
+            status_cell.alignment = Alignment(
+                horizontal="center", vertical="center"
+            )
+
+        end_row = ws.max_row
+        for col in [1, 2, 8]:
+            ws.merge_cells(
+                start_row=start_row,
+                start_column=col,
+                end_row=end_row,
+                end_column=col,
+            )
+            merged_cell = ws.cell(start_row, col)
+            merged_cell.alignment = Alignment(
+                horizontal="center", vertical="center"
+            )
+            merged_cell.border = thin_border
+            if col != 8:
+                merged_cell.fill = (
+                    even_row_fill if start_row % 2 == 0 else odd_row_fill
+                )
+            else:
+                status_value = str(merged_cell.value or "").upper()
+                if "PASS" in status_value:
+                    merged_cell.fill, merged_cell.font = pass_fill, pass_font
+                elif "FAILED" in status_value:
+                    merged_cell.fill, merged_cell.font = fail_fill, fail_font
+
+    # ===== 调整列宽和行高 =====
+    sheet_columns = {
+        "请求详情识别结果": {
+            "A": 15,
+            "B": 20,
+            "C": 10,
+            "D": 12,
+            "E": 25,
+            "F": 25,
+            "G": 10,
+            "H": 12,
+        },
+        "响应详情识别结果": {
+            "A": 15,
+            "B": 20,
+            "C": 10,
+            "D": 12,
+            "E": 25,
+            "F": 25,
+            "G": 10,
+            "H": 12,
+        },
+        "文件标签识别结果": {
+            "A": 15,
+            "B": 20,
+            "C": 12,
+            "D": 30,
+            "E": 12,
+            "F": 12,
+            "G": 25,
+            "H": 12,
+        },
+    }
+
+    for sheet_name, widths in sheet_columns.items():
+        if sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+            for col, width in widths.items():
+                ws.column_dimensions[col].width = width
+            for row in range(2, ws.max_row + 1):
+                ws.row_dimensions[row].height = 25
+
+    # 保存文件（覆盖现有文件）
+    wb.save(file_path)
+    log.success(f"所有测试结果已导出到 {file_path}")
@@ -0,0 +1,260 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.sr_tools.label_compare import FILE_TYPES, LABEL_PARTS, misidentification_count
+from utils.sr_tools.label_parser import LABEL_LOCATIONS
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _f1(precision: np.ndarray, recall: np.ndarray) -> np.ndarray:
+    return _safe_divide(2 * precision * recall, precision + recall)
+
+
+def _confusion_pairs(true_idx: np.ndarray, pred_idx: np.ndarray, counts: np.ndarray, size: int):
+    """聚合 (真实标签, 识别标签) 对, 返回稀疏表示 (true, pred, count), 适用于上万标签的场景"""
+    keys = true_idx * size + pred_idx
+    unique, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+    return unique // size, unique % size, totals
+
+
+class _Vocabulary:
+    """标签名称 -> 列下标, 被误识别出的标准外标签追加在末尾"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names: List[str] = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+    def get(self, name: str) -> int:
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        return self.index[name]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ApiLabelMetrics:
+    """API 标签识别指标
+
+    把 compare_api_label 的结果一次性装入列式数组:
+        expected/matched/unmatched: (标签, 方向, 位置)
+        误识别: (真实标签, 识别标签, 方向, 位置, 次数) 五列
+    之后所有统计均为向量化计算
+    """
+
+    def __init__(self, api_results: List[Dict[str, Dict[str, Any]]]):
+        label_count = len(api_results)
+        shape = (label_count, len(LABEL_PARTS), len(LABEL_LOCATIONS))
+        self.ids = [r[LABEL_PARTS[0]]["id"] for r in api_results]
+        self.vocabulary = _Vocabulary([r[LABEL_PARTS[0]]["name"] for r in api_results])
+        self.expected = np.zeros(shape, dtype=np.int64)
+        self.unmatched = np.zeros(shape, dtype=np.int64)
+        self.passed = np.zeros(shape[:2], dtype=bool)
+        self.has_mis = np.zeros(shape[:2], dtype=bool)
+
+        true_idx, pred_idx, part_idx, loc_idx, mis_counts = [], [], [], [], []
+        for i, result in enumerate(api_results):
+            for p, part in enumerate(LABEL_PARTS):
+                part_result = result.get(part)
+                if not part_result:
+                    continue
+                self.passed[i, p] = part_result.get("status") == "PASS"
+                self.has_mis[i, p] = bool(part_result["misidentification"].get("count"))
+                send_failed = part_result.get("send_failed") or {}
+                for l, location in enumerate(LABEL_LOCATIONS):
+                    if send_failed.get(location):
+                        # 流量未发送成功的位置没有识别数据, 不计入指标
+                        continue
+                    self.expected[i, p, l] = len(part_result["sample"].get(location) or [])
+                    unmatched = part_result["unmatched"].get(location) or []
+                    self.unmatched[i, p, l] = len(unmatched)
+                    for name, value in (part_result["misidentification"].get(location) or {}).items():
+                        true_idx.append(i)
+                        pred_idx.append(self.vocabulary.get(name))
+                        part_idx.append(p)
+                        loc_idx.append(l)
+                        mis_counts.append(misidentification_count(value))
+        self.matched = self.expected - self.unmatched
+
+        self.mis_true = np.asarray(true_idx, dtype=np.int64)
+        self.mis_pred = np.asarray(pred_idx, dtype=np.int64)
+        self.mis_part = np.asarray(part_idx, dtype=np.int64)
+        self.mis_loc = np.asarray(loc_idx, dtype=np.int64)
+        self.mis_count = np.asarray(mis_counts, dtype=np.int64)
+
+    @property
+    def names(self) -> List[str]:
+        return self.vocabulary.names[: len(self.ids)]
+
+    def per_label(self, part: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """每个标签的 tp/fp/fn/precision/recall/f1, part 为 None 时合并两个方向"""
+        part_slice = slice(None) if part is None else LABEL_PARTS.index(part)
+        mask = np.ones(len(self.mis_part), dtype=bool) if part is None else self.mis_part == part_slice
+        tp = self.matched[:, part_slice].reshape(len(self.ids), -1).sum(axis=1)
+        fn = self.unmatched[:, part_slice].reshape(len(self.ids), -1).sum(axis=1)
+        # 标签 X 在标签 Y 的样本上被识别出来, 记为 X 的假阳性
+        fp = np.bincount(
+            self.mis_pred[mask], weights=self.mis_count[mask], minlength=len(self.vocabulary)
+        )[: len(self.ids)]
+        precision = _safe_divide(tp, tp + fp)
+        recall = _safe_divide(tp, tp + fn)
+        return {"tp": tp, "fp": fp, "fn": fn, "precision": precision, "recall": recall, "f1": _f1(precision, recall)}
+
+    def per_location(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """按 (方向, 位置) 统计的 precision/recall/f1, 数组形状为 (方向, 位置)"""
+        tp = self.matched.sum(axis=0)
+        fn = self.unmatched.sum(axis=0)
+        fp = np.zeros_like(tp, dtype=np.float64)
+        np.add.at(fp, (self.mis_part, self.mis_loc), self.mis_count)
+        precision = _safe_divide(tp, tp + fp)
+        recall = _safe_divide(tp, tp + fn)
+        return {"tp": tp, "fp": fp, "fn": fn, "precision": precision, "recall": recall, "f1": _f1(precision, recall)}
+
+    def confusion_pairs(self):
+        """误识别的稀疏表示: (真实标签下标, 识别标签下标, 次数)"""
+        return _confusion_pairs(self.mis_true, self.mis_pred, self.mis_count, len(self.vocabulary))
+
+    def confusion_matrix(self) -> np.ndarray:
+        """标签 x 标签 误识别矩阵: [真实标签, 识别出的标签], 对角线为正确识别条数
+
+        稠密矩阵大小为 标签数^2, 标签数很多时使用 confusion_pairs
+        """
+        size = len(self.vocabulary)
+        matrix = np.zeros((size, size), dtype=np.int64)
+        diagonal = np.arange(len(self.ids))
+        matrix[diagonal, diagonal] = self.matched.reshape(len(self.ids), -1).sum(axis=1)
+        np.add.at(matrix, (self.mis_true, self.mis_pred), self.mis_count)
+        return matrix
+
+    def overall(self) -> Dict[str, float]:
+        tp = self.matched.sum()
+        fn = self.unmatched.sum()
+        fp = self.mis_count.sum()
+        precision = float(_safe_divide(tp, tp + fp))
+        recall = float(_safe_divide(tp, tp + fn))
+        return {"precision": precision, "recall": recall, "f1": float(_f1(np.float64(precision), np.float64(recall)))}
+
+    def summary(self) -> Dict[str, int]:
+        """通过/失败/误识别数量"""
+        passed = self.passed.sum(axis=0)
+        has_mis = self.has_mis.sum(axis=0)
+        total = len(self.ids)
+        request, response = LABEL_PARTS.index("request"), LABEL_PARTS.index("response")
+        return {
+            "total": total,
+            "request_pass": int(passed[request]),
+            "request_fail": int(total - passed[request]),
+            "request_mis": int(has_mis[request]),
+            "response_pass": int(passed[response]),
+            "response_fail": int(total - passed[response]),
+            "response_mis": int(has_mis[response]),
+        }
+
+    def to_frames(self) -> Dict[str, Any]:
+        """导出为 pandas DataFrame(按需导入 pandas, 需安装 frames 可选依赖)"""
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("to_frames 需要 pandas, 请安装 frames 可选依赖: uv sync --extra frames") from e
+
+        per_label = pd.DataFrame({"id": self.ids, "name": self.names, **self.per_label()})
+        per_location = self.per_location()
+        location_frame = pd.DataFrame(
+            [
+                {"part": part, "location": location, **{k: v[p, l] for k, v in per_location.items()}}
+                for p, part in enumerate(LABEL_PARTS)
+                for l, location in enumerate(LABEL_LOCATIONS)
+            ]
+        )
+        true_idx, pred_idx, counts = self.confusion_pairs()
+        names = np.asarray(self.vocabulary.names, dtype=object)
+        confusion = pd.DataFrame(
+            {"label": names[true_idx], "identified_as": names[pred_idx], "count": counts}
+        ).sort_values("count", ascending=False, ignore_index=True)
+        return {"per_label": per_label, "per_location": location_frame, "confusion": confusion}
+
+
+class FileLabelMetrics:
+    """文件标签识别指标, 数组形状为 (标签, 文件类型)"""
+
+    def __init__(self, file_results: List[Dict[str, Any]], file_types: Sequence[str] = FILE_TYPES):
+        self.file_types = tuple(file_types)
+        label_count, type_count = len(file_results), len(self.file_types)
+        self.ids = [r.get("id") for r in file_results]
+        self.vocabulary = _Vocabulary([r.get("name") for r in file_results])
+        self.expected = np.zeros((label_count, type_count), dtype=np.int64)
+        self.matched = np.zeros((label_count, type_count), dtype=np.int64)
+        self.present = np.zeros((label_count, type_count), dtype=bool)
+        self.has_mis = np.zeros((label_count, type_count), dtype=bool)
+        self.passed = np.array([r.get("status") == "PASS" for r in file_results], dtype=bool)
+
+        true_idx, pred_idx, type_idx, mis_counts = [], [], [], []
+        for i, result in enumerate(file_results):
+            for t, file_type in enumerate(self.file_types):
+                detail = result.get(file_type)
+                if not detail:
+                    continue
+                self.present[i, t] = True
+                self.expected[i, t] = detail["expected_count"]
+                self.matched[i, t] = detail["matched_count"]
+                misidentification = detail["misidentification"] or {}
+                self.has_mis[i, t] = bool(misidentification)
+                for name, value in misidentification.items():
+                    true_idx.append(i)
+                    pred_idx.append(self.vocabulary.get(name))
+                    type_idx.append(t)
+                    mis_counts.append(misidentification_count(value))
+
+        self.mis_true = np.asarray(true_idx, dtype=np.int64)
+        self.mis_pred = np.asarray(pred_idx, dtype=np.int64)
+        self.mis_type = np.asarray(type_idx, dtype=np.int64)
+        self.mis_count = np.asarray(mis_counts, dtype=np.int64)
+
+    def per_file_type(self) -> Dict[str, np.ndarray]:
+        tp = np.minimum(self.matched, self.expected).sum(axis=0)
+        fn = np.maximum(self.expected - self.matched, 0).sum(axis=0)
+        fp = np.bincount(self.mis_type, weights=self.mis_count, minlength=len(self.file_types))
+        precision = _safe_divide(tp, tp + fp)
+        recall = _safe_divide(tp, tp + fn)
+        return {"tp": tp, "fp": fp, "fn": fn, "precision": precision, "recall": recall, "f1": _f1(precision, recall)}
+
+    def confusion_pairs(self):
+        """误识别的稀疏表示: (真实标签下标, 识别标签下标, 次数)"""
+        return _confusion_pairs(self.mis_true, self.mis_pred, self.mis_count, len(self.vocabulary))
+
+    def confusion_matrix(self) -> np.ndarray:
+        """标签 x 标签 误识别矩阵: [真实标签, 识别出的标签], 对角线为正确识别条数"""
+        size = len(self.vocabulary)
+        matrix = np.zeros((size, size), dtype=np.int64)
+        diagonal = np.arange(len(self.ids))
+        matrix[diagonal, diagonal] = np.minimum(self.matched, self.expected).sum(axis=1)
+        np.add.at(matrix, (self.mis_true, self.mis_pred), self.mis_count)
+        return matrix
+
+    def summary(self) -> Dict[str, Any]:
+        """总体通过/失败数与每种文件类型的通过/失败/误识别数"""
+        type_pass = (self.present & (self.expected == self.matched)).sum(axis=0)
+        type_mis = self.has_mis.sum(axis=0)
+        total = len(self.ids)
+        total_pass = int(self.passed.sum())
+        return {
+            "total": total,
+            "total_pass": total_pass,
+            "total_fail": total - total_pass,
+            "file_stats": {
+                file_type: {
+                    "pass": int(type_pass[t]),
+                    "fail": int(total - type_pass[t]),
+                    "mis": int(type_mis[t]),
+                }
+                for t, file_type in enumerate(self.file_types)
+            },
+        }
@@ -5,7 +5,7 @@ import os
 import urllib.request
 import aiofiles
 import httpx
-from typing import Callable, Dict, Any, Optional, Union, List
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple, Union, List
 from enum import Enum
 
 import urllib
@@ -193,6 +193,38 @@ class AsyncHttpClient:
                 await asyncio.sleep(1 * retries)  # 重试延迟
                 log.warning(f"第{retries}次重试: {url}, 错误信息: {str(e)}")
 
+    async def send_raw(
+        self,
+        method: Union[str, HttpMethod],
+        url: str,
+        content: bytes,
+        headers: Optional[Union[Dict[str, str], Sequence[Tuple[bytes, bytes]]]] = None,
+    ) -> int:
+        """
+        发送单个请求并返回状态码, 不重试、不检查状态码, 用于高频发送的模糊测试流量
+
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            content: 已编码的请求体
+            headers: 请求头, 为 None 时使用 JSON; 可传已编码的 (name, value) 字节对, 允许重名与非 ASCII 取值,
+                传空元组则不带额外请求头
+        """
+        if self.client is None:
+            await self.start()
+
+        if isinstance(method, HttpMethod):
+            method = method.value
+
+        response = await self.client.request(
+            method=method,
+            url=url,
+            content=content,
+            headers={"content-type": "application/json;charset=utf-8"} if headers is None else headers,
+            timeout=self._timeout,
+        )
+        return response.status_code
+
     def response_to_dict(func: Callable) -> Callable:
         """将响应转换为字典的装饰器"""
 
@@ -320,19 +352,46 @@ class AsyncHttpClient:
         """
         异步上传文件，并自动根据文件后缀设置 Content-Type
         """
-        if self.client is None:
-            await self.start()
-
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
+        async with aiofiles.open(file_path, "rb") as f:
+            content = await f.read()
+        return await self._upload_content(
+            os.path.basename(file_path), content, url, headers, use_multipart, **kwargs
+        )
+
+    @response_to_dict
+    async def upload_bytes(
+        self,
+        filename: str,
+        content: bytes,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        use_multipart: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        上传内存中的文件内容, 不经过磁盘; Content-Type 由 filename 后缀决定
+        """
+        return await self._upload_content(filename, content, url, headers, use_multipart, **kwargs)
+
+    async def _upload_content(
+        self,
+        filename: str,
+        content: bytes,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        use_multipart: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        if self.client is None:
+            await self.start()
+
         headers = headers or {}
-        mime_type = self.get_mime_type(file_path)
+        mime_type = self.get_mime_type(filename)
 
         if use_multipart:
-            async with aiofiles.open(file_path, "rb") as f:
-                content = await f.read()
-            filename = os.path.basename(file_path)
             files = {
                 "file": (filename, content, mime_type),
                 "path": (None, "/yzm"),  # 额外字段
@@ -345,10 +404,8 @@ class AsyncHttpClient:
             return response
         else:
             # PUT 上传
-            async with aiofiles.open(file_path, "rb") as f:
-                content = await f.read()
             headers.update({"Content-Type": mime_type})
-            url = url + "/" + os.path.basename(file_path)
+            url = url + "/" + filename
             response = await self.request(
                 method="PUT",
                 url=url,
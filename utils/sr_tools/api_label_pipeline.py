@@ -0,0 +1,201 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.log_tools.logger_utils import get_logger
+from utils.sr_tools.apione_client import ApioneClient
+
+log = get_logger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """单个流水线阶段的运行统计"""
+
+    name: str
+    concurrency: int
+    processed: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    max_queue_depth: int = 0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: 并发 {self.concurrency} | 处理 {self.processed} | "
+            f"平均耗时 {self.avg_latency * 1000:.1f}ms | 最大耗时 {self.max_latency * 1000:.1f}ms | "
+            f"最大队列深度 {self.max_queue_depth}"
+        )
+
+
+@dataclass
+class PipelineStage:
+    """流水线阶段: handler 接收上一阶段的输出, 返回本阶段的输出"""
+
+    name: str
+    handler: Callable[[Any], Union[Any, Awaitable[Any]]]
+    concurrency: int = 1
+
+
+class StagePipeline:
+    """多阶段异步流水线, 阶段之间通过有界队列衔接, 每个阶段独立限制并发"""
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 64):
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats: List[StageStats] = [
+            StageStats(stage.name, stage.concurrency) for stage in stages
+        ]
+
+    async def _put(self, queue: asyncio.Queue, item: Any, stats: Optional[StageStats]):
+        await queue.put(item)
+        if stats is not None and queue.qsize() > stats.max_queue_depth:
+            stats.max_queue_depth = queue.qsize()
+
+    async def run(self, items: List[Any]) -> List[Any]:
+        """运行流水线, 按输入顺序返回最后一个阶段的输出"""
+        # 统计只反映本次运行
+        self.stats = [StageStats(stage.name, stage.concurrency) for stage in self.stages]
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = [None] * len(items)
+
+        async def feed():
+            for index, item in enumerate(items):
+                await self._put(queues[0], (index, item), self.stats[0])
+            for _ in range(self.stages[0].concurrency):
+                await queues[0].put(_STOP)
+
+        async def worker(stage_index: int):
+            stage = self.stages[stage_index]
+            stats = self.stats[stage_index]
+            is_last = stage_index == len(self.stages) - 1
+            while True:
+                entry = await queues[stage_index].get()
+                if entry is _STOP:
+                    return
+                index, payload = entry
+                started = time.perf_counter()
+                output = stage.handler(payload)
+                if asyncio.iscoroutine(output):
+                    output = await output
+                elapsed = time.perf_counter() - started
+                stats.processed += 1
+                stats.total_latency += elapsed
+                stats.max_latency = max(stats.max_latency, elapsed)
+                if is_last:
+                    results[index] = output
+                else:
+                    await self._put(
+                        queues[stage_index + 1], (index, output), self.stats[stage_index + 1]
+                    )
+
+        async def run_stage(stage_index: int):
+            await asyncio.gather(
+                *(worker(stage_index) for _ in range(self.stages[stage_index].concurrency))
+            )
+            # 本阶段全部完成后, 通知下一阶段的所有 worker 退出
+            if stage_index + 1 < len(self.stages):
+                for _ in range(self.stages[stage_index + 1].concurrency):
+                    await queues[stage_index + 1].put(_STOP)
+
+        tasks = [asyncio.ensure_future(feed())] + [
+            asyncio.ensure_future(run_stage(i)) for i in range(len(self.stages))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            # 等待被取消的阶段真正退出, 避免调用方关闭客户端后仍有 worker 在运行
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results
+
+    def report(self) -> Dict[str, StageStats]:
+        return {stats.name: stats for stats in self.stats}
+
+
+class ApiLabelPipeline:
+    """API 数据标签流水线校验: 资产查询 -> 资产详情 -> unmask 详情 -> 结果对比
+
+    已缓存标签详情的资产直接跳过资产详情与 unmask 两个阶段
+    on_result 在每个标签对比完成时调用, 可用于边校验边落盘
+    """
+
+    def __init__(
+        self,
+        apione: ApioneClient,
+        app: str,
+        compare: Callable[[Dict[str, Any], Optional[ApiAssetLabelDetail]], Dict[str, Any]],
+        lookup_concurrency: int = 8,
+        detail_concurrency: int = 8,
+        unmask_concurrency: int = 8,
+        queue_size: int = 64,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.apione = apione
+        self.app = app
+        self.compare = compare
+        self.on_result = on_result
+        self.pipeline = StagePipeline(
+            [
+                PipelineStage("asset_lookup", self._lookup, lookup_concurrency),
+                PipelineStage("asset_detail", self._detail, detail_concurrency),
+                PipelineStage("unmask_detail", self._unmask, unmask_concurrency),
+                PipelineStage("compare", self._compare, 1),
+            ],
+            queue_size=queue_size,
+        )
+
+    async def _lookup(self, data_label: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[int]]:
+        api_path = self.app + "/data_label_test/" + data_label["id"]
+        api_id = await self.apione.get_api_asset_id(api_path)
+        return data_label, api_id
+
+    async def _detail(self, payload: Tuple[Dict[str, Any], Optional[int]]):
+        data_label, api_id = payload
+        if api_id is None:
+            # 资产始终未出现, 不再查询详情, 对比阶段按未识别处理
+            log.warning(f"未找到 API 资产: {self.app}/data_label_test/{data_label['id']}")
+            return data_label, None, None, None
+        label_detail = self.apione.cached_api_asset_label_detail(api_id)
+        if label_detail is not None:
+            return data_label, api_id, label_detail, None
+        latest_call = await self.apione.get_api_asset_latest_call(api_id)
+        return data_label, api_id, None, latest_call
+
+    async def _unmask(self, payload: Tuple[Dict[str, Any], Optional[int], Optional[ApiAssetLabelDetail], Any]):
+        data_label, api_id, label_detail, latest_call = payload
+        if label_detail is None and api_id is not None:
+            latest_request_id, latest_storage_key = latest_call
+            label_detail = await self.apione.get_call_record_label_detail(
+                api_id, latest_request_id, latest_storage_key
+            )
+        return data_label, label_detail
+
+    def _compare(self, payload: Tuple[Dict[str, Any], Optional[ApiAssetLabelDetail]]):
+        data_label, label_detail = payload
+        result = self.compare(data_label, label_detail)
+        if self.on_result is not None:
+            self.on_result(result)
+        return result
+
+    async def run(self, api_asset_data_labels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按输入顺序返回每个标签的对比结果"""
+        results = await self.pipeline.run(api_asset_data_labels)
+        for stats in self.pipeline.stats:
+            log.info(stats.summary())
+        return results
+
+    def report(self) -> Dict[str, StageStats]:
+        """各阶段的队列深度与耗时统计"""
+        return self.pipeline.report()
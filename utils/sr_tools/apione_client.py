@@ -0,0 +1,215 @@
+import contextlib
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Hashable, Mapping, Optional, Tuple
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail, ApiAssetRecord
+from entity.file_asset.file_asset import FileAssetRecord
+from utils.auth_tools.auth_utils import AuthUtils
+from utils.log_tools.logger_utils import get_logger
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.apione_utils import ApioneUtils
+from utils.sr_tools.label_compare import freeze, freeze_label_detail
+
+log = get_logger(__name__)
+
+_MISSING = object()
+
+
+class BoundedCache:
+    """有容量上限的 LRU 缓存, 记录命中率"""
+
+    def __init__(self, name: str, max_size: int = 4096):
+        self.name = name
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class ApioneClient:
+    """有状态的 Apione 客户端, 持有 https 客户端并缓存已解析过的资产 ID 与标签详情
+
+    缓存:
+        - api_asset_ids: API 路径 -> API 资产 ID
+        - file_asset_ids: (文件名, md5) -> 文件资产 ID
+        - label_details: ("api" | "file", 资产 ID) -> 标签详情
+
+    initial_rule 会重置系统, 调用后所有缓存失效
+    缓存的标签详情均为只读视图, 可在多次对比、离线重新评分之间共享
+    """
+
+    def __init__(self, https_req: AsyncHttpClient, cache_size: int = 4096):
+        self.https_req = https_req
+        self.api_asset_ids = BoundedCache("api_asset_ids", cache_size)
+        self.file_asset_ids = BoundedCache("file_asset_ids", cache_size)
+        self.label_details = BoundedCache("label_details", cache_size)
+
+    @classmethod
+    async def connect(cls, sc_ip: str, username: str, password: str, **kwargs) -> "ApioneClient":
+        """创建 https 客户端并登录"""
+        https_req = AsyncHttpClient(f"https://{sc_ip}")
+        try:
+            https_req.set_token(await AuthUtils.login(https_req, username, password))
+        except Exception:
+            await https_req.close()
+            raise
+        return cls(https_req, **kwargs)
+
+    async def close(self):
+        await self.https_req.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def invalidate(self):
+        """清空全部缓存"""
+        for cache in (self.api_asset_ids, self.file_asset_ids, self.label_details):
+            cache.clear()
+        log.info("ApioneClient 缓存已清空")
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各缓存的命中率统计"""
+        return {
+            cache.name: cache.stats()
+            for cache in (self.api_asset_ids, self.file_asset_ids, self.label_details)
+        }
+
+    async def initial_rule(self, specification_id: int, timeout: int = 15):
+        """初始化系统规则, 系统被重置后缓存一并失效"""
+        try:
+            return await ApioneUtils.initial_rule(self.https_req, specification_id, timeout)
+        finally:
+            self.invalidate()
+
+    async def update_auto_merge_config(self, turn_on: bool = False) -> None:
+        await ApioneUtils.update_auto_merge_config(self.https_req, turn_on)
+
+    @contextlib.asynccontextmanager
+    async def auto_merge_disabled(self) -> AsyncIterator[None]:
+        """关闭资产自动合并, 退出时(包括异常)重新开启"""
+        await self.update_auto_merge_config(False)
+        try:
+            yield
+        finally:
+            await self.update_auto_merge_config(True)
+
+    async def is_file_asset_count_equal_expected(self, expected_file_asset_count: int):
+        return await ApioneUtils.is_file_asset_count_equal_expected(
+            self.https_req, expected_file_asset_count
+        )
+
+    async def get_api_asset_id(self, api: str) -> Optional[int]:
+        """API 路径 -> API 资产 ID"""
+        api_asset_id = self.api_asset_ids.get(api)
+        if api_asset_id is None:
+            api_asset: Optional[ApiAssetRecord] = await ApioneUtils.get_api_asset_record(
+                https_req=self.https_req, api=api
+            )
+            if api_asset is None:
+                return None
+            api_asset_id = api_asset.id
+            self.api_asset_ids.set(api, api_asset_id)
+        return api_asset_id
+
+    async def get_file_asset_id(self, file_name: str, file_md5: Optional[str] = None) -> Optional[int]:
+        """(文件名, md5) -> 文件资产 ID"""
+        file_asset_id = self.file_asset_ids.get((file_name, file_md5))
+        if file_asset_id is None:
+            file_asset: Optional[FileAssetRecord] = await ApioneUtils.get_file_asset_record(
+                self.https_req, file_name, file_md5
+            )
+            if file_asset is None:
+                return None
+            file_asset_id = file_asset.id
+            self.file_asset_ids.set((file_name, file_md5), file_asset_id)
+        return file_asset_id
+
+    async def iter_api_assets(self, **kwargs) -> AsyncIterator[ApiAssetRecord]:
+        """遍历 API 资产, 顺带填充路径 -> ID 缓存"""
+        async for api_asset in ApioneUtils.iter_api_assets(self.https_req, **kwargs):
+            self.api_asset_ids.set(api_asset.http_authority + api_asset.http_path, api_asset.id)
+            yield api_asset
+
+    async def iter_file_assets(self, **kwargs) -> AsyncIterator[FileAssetRecord]:
+        """遍历文件资产, 顺带填充 (文件名, md5) -> ID 缓存"""
+        async for file_asset in ApioneUtils.iter_file_assets(self.https_req, **kwargs):
+            self.file_asset_ids.set((file_asset.name, file_asset.md5), file_asset.id)
+            yield file_asset
+
+    def cached_api_asset_label_detail(self, api_id: int) -> Optional[ApiAssetLabelDetail]:
+        return self.label_details.get(("api", api_id))
+
+    async def get_api_asset_latest_call(self, api_id: int) -> Tuple[Any, Any]:
+        return await ApioneUtils.get_api_asset_latest_call(self.https_req, api_id)
+
+    async def get_call_record_label_detail(
+        self, api_id: int, latest_request_id: Any, latest_storage_key: Any
+    ) -> Optional[ApiAssetLabelDetail]:
+        label_detail = freeze_label_detail(
+            await ApioneUtils.get_call_record_label_detail(
+                self.https_req, latest_request_id, latest_storage_key
+            )
+        )
+        if label_detail is not None:
+            self.label_details.set(("api", api_id), label_detail)
+        return label_detail
+
+    async def get_api_asset_label_detail(self, api_id: int) -> Optional[ApiAssetLabelDetail]:
+        """API 资产 ID -> 标签详情"""
+        label_detail = self.cached_api_asset_label_detail(api_id)
+        if label_detail is None:
+            latest_request_id, latest_storage_key = await self.get_api_asset_latest_call(api_id)
+            label_detail = await self.get_call_record_label_detail(
+                api_id, latest_request_id, latest_storage_key
+            )
+        return label_detail
+
+    async def get_file_asset_label_detail(self, file_id: int) -> Mapping[str, int]:
+        """文件资产 ID -> 标签详情"""
+        label_detail = self.label_details.get(("file", file_id))
+        if label_detail is None:
+            label_detail = freeze(
+                await ApioneUtils.get_file_asset_label_detail(self.https_req, file_id)
+            )
+            self.label_details.set(("file", file_id), label_detail)
+        return label_detail
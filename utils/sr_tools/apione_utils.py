@@ -1,14 +1,14 @@
 import asyncio
 import json
-import re
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from xmlrpc.client import Boolean
 
 import test
 from entity.api_asset.api_asset import ApiAssetLabelDetail, ApiAssetRecord
 from entity.file_asset.file_asset import FileAssetRecord
-from utils.decorator_tools.decorator_utils import async_retry_on_empty, transform_to_data_class
+from utils.decorator_tools.decorator_utils import async_retry_on_empty, build_decoder, transform_to_data_class
 from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.label_parser import parse_contents, parse_label_locations
 from utils.log_tools.logger_utils import get_logger
 log = get_logger(__name__)
 
@@ -115,81 +115,120 @@ class ApioneUtils:
         api_asset = response.get("data", {}).get("results")
         return api_asset and api_asset[0]
     
-    def convert_to_dict_list_old(contents: List[str]) -> List[Dict[str, Any]]:
-        """
-        将 ["\"key\": \"value\"", ...] 转换为 [ {"key": "value"}, {"key": "value"}, ... ]
-        - 每条都保留，不做 key 合并
-        - 其他内容（如 IPv6 地址）放成 ["原始内容"]
-        """
-        result = []
+    @staticmethod
+    async def iter_list_pages(
+        https_req: AsyncHttpClient,
+        url: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 500,
+        prefetch: int = 1,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """逐页遍历 Apione 列表接口，消费第 N 页时预取后续页
 
-        # 严格匹配 "key": "value"
-        pattern = re.compile(r'^"\s*([^"]+)\s*"\s*:\s*"\s*([^"]+)\s*"$')
+        内存中最多只保留当前页 + prefetch 个预取页
 
-        for item in contents:
-            item = item.strip()
-            if not item:
-                continue
+        Args:
+            https_req (AsyncHttpClient): _description_
+            url (str): 列表接口，例如 /apione/v2/assets/list
+            filters (Optional[Dict[str, Any]]): 额外的查询条件
+            page_size (int, optional): 每页条数. Defaults to 500.
+            prefetch (int, optional): 预取页数. Defaults to 1.
+        """
+        payload = {"time_layout": "2006-01-02 15:04:05", **(filters or {})}
+
+        async def fetch_page(page_num: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+            response = await https_req.post(
+                url, json={**payload, "page_num": page_num, "page_size": page_size}
+            )
+            if response.get("code") != 200:
+                raise RuntimeError(
+                    f"获取 {url} 第 {page_num} 页失败: {response.get('message', '未知错误')}"
+                )
+            data = response.get("data") or {}
+            return data.get("results") or [], data.get("row_count")
+
+        def has_page(page_num: int, row_count: Optional[int]) -> bool:
+            return row_count is None or (page_num - 1) * page_size < row_count
+
+        async def cancel_pending():
+            # 取消后等待结束并取回异常, 避免 "Task was destroyed but it is pending"
+            for task in pending.values():
+                task.cancel()
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            pending.clear()
+
+        pending: Dict[int, asyncio.Task] = {1: asyncio.ensure_future(fetch_page(1))}
+        page_num = 1
+        try:
+            while page_num in pending:
+                results, row_count = await pending.pop(page_num)
+                if len(results) < page_size:
+                    # 最后一页，后续预取作废
+                    await cancel_pending()
+                    row_count = 0
+                for next_page in range(page_num + 1, page_num + prefetch + 1):
+                    if next_page not in pending and has_page(next_page, row_count):
+                        pending[next_page] = asyncio.ensure_future(fetch_page(next_page))
+                if results:
+                    yield results
+                page_num += 1
+        finally:
+            await cancel_pending()
 
-            match = pattern.match(item)
-            if match:
-                key, value = match.groups()
-                result.append({key: value})
-            else:
-                # 非 key:value 格式，比如 IPv6
-                result.append(item)
+    @staticmethod
+    async def iter_api_assets(
+        https_req: AsyncHttpClient, page_size: int = 500, prefetch: int = 1, **filters
+    ) -> AsyncIterator[ApiAssetRecord]:
+        """遍历全部 API 资产记录"""
+        async for page in ApioneUtils.iter_list_pages(
+            https_req, "/apione/v2/assets/list", filters, page_size, prefetch
+        ):
+            for record in build_decoder(ApiAssetRecord)[1](page):
+                yield record
 
-        return result
+    @staticmethod
+    async def iter_file_assets(
+        https_req: AsyncHttpClient, page_size: int = 500, prefetch: int = 1, **filters
+    ) -> AsyncIterator[FileAssetRecord]:
+        """遍历全部文件资产记录"""
+        async for page in ApioneUtils.iter_list_pages(
+            https_req, "/apione/v2/file-assets", filters, page_size, prefetch
+        ):
+            for record in build_decoder(FileAssetRecord)[1](page):
+                yield record
 
+    @staticmethod
     def convert_to_dict_list(contents: List[str]) -> List[Dict[str, Any]]:
         """
         将混合格式数据转换为字典列表
         - key:value 格式转换为 {key: value}
         - 其他（如 IPv6）保留原始字符串
         """
-        result = []
-
-        # 匹配 key:value，key 可以是字母、下划线、中文，value 任意内容
-        kv_pattern = re.compile(r'^\s*([\w\u4e00-\u9fff_]+)"?\s*:\s*"?\s*(.+?)\s*"?$')
-
-        for item in contents:
-            item = item.strip()
-            # 去掉外层单/双引号
-            if (item.startswith("'") and item.endswith("'")) or (item.startswith('"') and item.endswith('"')):
-                item = item[1:-1]
-
-            if not item:
-                continue
-
-            # 判断冒号数量，如果多于1个，认为是 IPv6 或非 key:value
-            if item.count(':') > 1:
-                result.append(item)
-                continue
-
-            # 尝试匹配 key:value
-            match = kv_pattern.match(item)
-            if match:
-                key, value = match.groups()
-                result.append({key: value})
-            else:
-                result.append(item)
-
-        return result
+        return parse_contents(contents)
     
     @staticmethod
-    @transform_to_data_class(ApiAssetLabelDetail)
-    async def get_api_asset_label_detail(https_req: AsyncHttpClient, api_id: int) -> Dict[str, Any]:
+    async def get_api_asset_label_detail(https_req: AsyncHttpClient, api_id: int) -> Optional[ApiAssetLabelDetail]:
         """获取 API 资产详情 + 原始请求响应细节"""
+        latest_request_id, latest_storage_key = await ApioneUtils.get_api_asset_latest_call(https_req, api_id)
+        return await ApioneUtils.get_call_record_label_detail(https_req, latest_request_id, latest_storage_key)
 
-        # 1. 获取 API 资产详情
+    @staticmethod
+    async def get_api_asset_latest_call(https_req: AsyncHttpClient, api_id: int) -> Tuple[Any, Any]:
+        """获取 API 资产详情中最近一次调用的 (request_id, storage_key)"""
         detail_resp = await https_req.get(f"/apione/v2/assets/{api_id}/detail")
         if detail_resp.get("code") != 200:
             raise RuntimeError("获取API资产详情失败")
 
         latest_request_id = detail_resp.get("data", {}).get("latest_request_id")
         latest_storage_key = detail_resp.get("data", {}).get("latest_storage_key")
+        return latest_request_id, latest_storage_key
 
-        # 2. 获取原始调用详情
+    @staticmethod
+    @transform_to_data_class(ApiAssetLabelDetail)
+    async def get_call_record_label_detail(
+        https_req: AsyncHttpClient, latest_request_id: Any, latest_storage_key: Any
+    ) -> Dict[str, Any]:
+        """获取原始调用详情中 request/response 的数据标签"""
         raw_detail_resp = await https_req.get(
             f"/apione/v2/call/records/{latest_request_id}/unmask?storage_key={latest_storage_key}"
         )
@@ -198,52 +237,10 @@ class ApioneUtils:
 
         raw_data = raw_detail_resp.get("data", {})
 
-        # 3. 处理 request/response label
-        request_label_resp = raw_data.get("request", {}).get("label", {})
-        response_label_resp = raw_data.get("response", {}).get("label", {})
-        request_label = {
-            "start_line": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in request_label_resp.get("start_line")
-            }
-            if request_label_resp.get("start_line")
-            else None,
-            "headers": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in request_label_resp.get("headers")
-            }
-            if request_label_resp.get("headers")
-            else None,
-            "body": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in request_label_resp.get("body")
-            }
-            if request_label_resp.get("body")
-            else None,
-        }
-
-        response_label = {
-            "start_line": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in response_label_resp.get("start_line")
-            }
-            if response_label_resp.get("start_line")
-            else None,
-            "headers": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in response_label_resp.get("headers")
-            }
-            if response_label_resp.get("headers")
-            else None,
-            "body": {
-                item.get("name"): {"count": item.get("count"), "contents": ApioneUtils.convert_to_dict_list(item.get("contents"))}
-                for item in response_label_resp.get("body")
-            }
-            if response_label_resp.get("body")
-            else None,
-        }
+        # 处理 request/response label
+        request_label = parse_label_locations(raw_data.get("request", {}).get("label", {}))
+        response_label = parse_label_locations(raw_data.get("response", {}).get("label", {}))
 
-        # 4. 返回结果
         return {
             "storage_state": raw_data.get("storage_state"),
             "request": request_label,
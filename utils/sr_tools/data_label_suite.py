@@ -0,0 +1,487 @@
+"""数据标签测试流程, pytest 用例与命令行入口共用
+
+每个标准依次执行:
+    - reset: 清理系统、按标准初始化规则并等待 apione/ata 进程就绪(需要 SSH)
+    - traffic: 关闭资产自动合并, 发送 API 流量计划, 边生成边上传测试文件
+    - verify: 查询 API/文件资产的识别结果并与样本对比, 写入运行历史
+    - export: 统计指标、与上一次运行对比, 按输出格式导出 xlsx/md/json
+全部标准完成后执行 notify: 企微推送 Markdown 汇总并上传测试数据与结果
+
+SSH、openpyxl、numpy 等较重的依赖只在对应阶段中导入
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.file_tools.file_utils import FileUtils
+from utils.log_tools.logger_utils import get_logger
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.apione_client import ApioneClient
+from utils.sr_tools.label_compare import compare_api_label, compare_file_label
+from utils.sr_tools.traffic_plan import TrafficPlan, send_traffic_plan
+
+if TYPE_CHECKING:
+    from utils.notice_tools.webcom_utils import WeComRobot
+    from utils.report_tools.history_store import RunHistoryStore
+    from utils.ssh_tools.ssh_connect import AsyncSSHClient
+
+log = get_logger(__name__)
+
+PHASES = ("reset", "traffic", "verify", "export", "notify")
+OUTPUT_FORMATS = ("xlsx", "md", "json")
+# API 测试流量与文件上传使用的代理应用
+DEFAULT_PROXY_APPS = {"data_label": ("192.192.101.220:20010", "192.192.101.220:20011")}
+REPORT_SERVER = "http://192.192.101.156:5004"
+REPORT_MENTIONED_LIST = ["tangning", "yangquan"]
+
+TEST_DATA_DIR = "files/data_label_file/test_data"
+TEST_RESULT_DIR = "files/data_label_file/test_result"
+STORE_DIR = "files/data_label_file/store"
+
+
+def spec_dir_name(specification_name: str) -> str:
+    return specification_name.replace("/", "_")
+
+
+def split_data_labels(data_labels: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """按 scope 拆分为 (API 标签, 文件标签): scope < 2 参与 API 测试, scope 为偶数参与文件测试"""
+    return (
+        [d for d in data_labels if d["scope"] < 2],
+        [d for d in data_labels if d["scope"] % 2 == 0],
+    )
+
+
+@dataclass
+class SpecResult:
+    """单个标准的运行结果"""
+
+    specification_name: str
+    specification_id: Any
+    data_labels: List[Dict[str, Any]]
+    api_data_labels: List[Dict[str, Any]] = field(default_factory=list)
+    file_data_labels: List[Dict[str, Any]] = field(default_factory=list)
+    api_results: List[Dict[str, Dict[str, Any]]] = field(default_factory=list)
+    file_results: List[Dict[str, Any]] = field(default_factory=list)
+    summary: Optional[Dict[str, Any]] = None
+
+
+class DataLabelSuite:
+    """数据标签测试流程
+
+    Args:
+        apione: 已登录的 ApioneClient
+        http: 发送测试流量与上传文件的 http 客户端, 会按阶段切换 base_url
+        ssh: 总控 SSH 客户端, 仅 reset 阶段需要
+        history: 运行历史, 为空时不记录也不与上一次运行对比
+        run_id: 运行历史中的运行 ID
+        proxy_apps: {"data_label": (API 流量地址, 文件上传地址)}
+        traffic_mix: API 流量计划的放置位置与重复次数, 见 TrafficPlan
+        concurrency: API 流量发送并发数
+        rate: API 流量目标速率(请求/秒), 为空时不限速
+        verify_concurrency: API 识别结果查询流水线各阶段的并发数
+        output_formats: export 阶段的输出格式, 可选 xlsx/md/json
+        result_dir: export 阶段的输出目录, 默认 files/data_label_file/test_result
+        archive: 上传的同时把测试文件保存到本地标准目录, notify 打包的测试数据与跳过 traffic 阶段重新校验都依赖它
+    """
+
+    def __init__(
+        self,
+        apione: ApioneClient,
+        http: AsyncHttpClient,
+        ssh: Optional["AsyncSSHClient"] = None,
+        history: Optional["RunHistoryStore"] = None,
+        run_id: Optional[str] = None,
+        proxy_apps: Mapping[str, Sequence[str]] = DEFAULT_PROXY_APPS,
+        traffic_mix: Optional[Mapping[str, int]] = None,
+        concurrency: int = 5,
+        rate: Optional[float] = None,
+        verify_concurrency: int = 8,
+        output_formats: Sequence[str] = ("xlsx",),
+        result_dir: Optional[str] = None,
+        archive: bool = True,
+    ):
+        unknown = set(output_formats) - set(OUTPUT_FORMATS)
+        if unknown:
+            raise ValueError(f"未知的输出格式: {sorted(unknown)}, 可选 {OUTPUT_FORMATS}")
+        self.apione = apione
+        self.http = http
+        self.ssh = ssh
+        self.history = history
+        self.run_id = run_id
+        self.api_app, self.file_app = proxy_apps["data_label"]
+        self.traffic_mix = traffic_mix
+        self.concurrency = concurrency
+        self.rate = rate
+        self.verify_concurrency = verify_concurrency
+        self.output_formats = tuple(output_formats)
+        self.result_dir = result_dir
+        self.archive = archive
+
+    # ---------- reset ----------
+
+    async def reset(self, specification_name: str, specification_id: Any):
+        """清理系统并按标准初始化规则"""
+        from utils.ssh_tools.ssh_operation import SSHOperation
+
+        if self.ssh is None:
+            raise RuntimeError("reset 阶段需要 SSH 客户端")
+        try:
+            # 1. 清理系统
+            await SSHOperation.exec_single_command(self.ssh, "cd /opt/apione && ./bin/apione --clean")
+            log.success("清理脚本执行成功")
+
+            # 2. 检查 apione 启动
+            await SSHOperation.check_process_log(
+                ssh_client=self.ssh,
+                process_name="apione",
+                keyword='"http server listening at" address=127.0.0.1:29300',
+            )
+            log.success("apione 进程已成功启动")
+
+            # 3. 初始化规则
+            await self.apione.initial_rule(specification_id)
+            log.success(
+                f"规则初始化完成 (specification_name={specification_name}, spec_id={specification_id})"
+            )
+
+            # 4、检查 ata 启动
+            await SSHOperation.check_process_log(
+                ssh_client=self.ssh,
+                process_name="ata",
+                keyword="connect to nsqd server: 127.0.0.1:7150 completed",
+            )
+            log.success("ata 进程已成功启动")
+        except Exception:
+            log.error("初始化规则失败")
+            raise
+
+    # ---------- traffic ----------
+
+    def traffic_plan(self, api_data_labels: List[Dict[str, Any]]) -> TrafficPlan:
+        return TrafficPlan(api_data_labels, mix=self.traffic_mix)
+
+    async def send_api_traffic(self, api_data_labels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按流量计划把样本放到查询串、请求头、请求体中发送
+
+        Returns:
+            List[Dict[str, Any]]: 补全了 start_line/headers/body 期望样本的数据标签, 供校验阶段评分;
+                重试后仍发送失败的位置记入 send_failed, 校验时报告为发送失败而不是未识别
+        """
+        await self.http.set_url(f"http://{self.api_app}")
+        plan = self.traffic_plan(api_data_labels)
+        log.debug(f"流量计划: {dict(plan.counts())}")
+        sent = await send_traffic_plan(self.http, plan, concurrency=self.concurrency, rate=self.rate)
+        if sent.failed:
+            log.warning(f"{len({key[0] for key in sent.failed})} 个标签的部分位置发送失败, 将在结果中标记为发送失败")
+        return plan.expected_data_labels(sent.failed)
+
+    async def send_file_traffic(self, file_data_labels: List[Dict[str, Any]], specification_name: str):
+        """边生成边上传数据标签测试文件
+
+        Returns:
+            Tuple[List[ManifestEntry], List[ManifestEntry]]: (已上传文件, 最终上传失败文件) 的清单条目(含 md5), 供校验阶段使用
+        """
+        from utils.file_tools.label_file_generator import LabelFileGenerator
+        from utils.sr_tools.file_upload_pipeline import FileUploadPipeline
+
+        await self.http.set_url(f"http://{self.file_app}")
+        file_data_label_path = FileUtils.find_file_from_root(
+            f"{TEST_DATA_DIR}/{spec_dir_name(specification_name)}", create_if_not_exists=True
+        )
+        store_dir = FileUtils.find_file_from_root(STORE_DIR, create_if_not_exists=True)
+        pipeline = FileUploadPipeline(
+            self.http,
+            url="/api/upload",
+            generator=LabelFileGenerator(file_data_label_path, store_dir=store_dir),
+            archive=self.archive,
+            use_multipart=True,
+        )
+        uploaded_files = await pipeline.run(file_data_labels)
+        return uploaded_files, pipeline.failed
+
+    # ---------- verify ----------
+
+    async def verify_api(
+        self, api_data_labels: List[Dict[str, Any]], specification_name: str
+    ) -> List[Dict[str, Dict[str, Any]]]:
+        """验证API识别的数据标签"""
+        from utils.sr_tools.api_label_pipeline import ApiLabelPipeline
+
+        def on_result(result: Dict[str, Dict[str, Any]]):
+            if self.history is not None:
+                self.history.record_api_result(self.run_id, specification_name, result)
+
+        # 资产查询、资产详情、unmask 详情、结果对比 四个阶段流水线并发执行
+        pipeline = ApiLabelPipeline(
+            self.apione,
+            self.api_app,
+            compare_api_label,
+            lookup_concurrency=self.verify_concurrency,
+            detail_concurrency=self.verify_concurrency,
+            unmask_concurrency=self.verify_concurrency,
+            on_result=on_result,
+        )
+        return await pipeline.run(api_data_labels)
+
+    async def verify_file(
+        self,
+        file_data_labels: List[Dict[str, Any]],
+        specification_name: str,
+        uploaded_files=None,
+        failed_uploads=(),
+    ) -> List[Dict[str, Any]]:
+        """验证文件资产中数据标签的识别结果
+
+        Args:
+            uploaded_files: 上传流水线返回的清单条目, 为空时扫描本地标准目录
+            failed_uploads: 最终上传失败的清单条目, 对应文件类型记为上传失败
+        """
+        from utils.file_tools.label_file_generator import DEFAULT_FORMATS
+        from utils.sr_tools.file_label_verifier import FileLabelVerifier
+
+        # 由于文件详情数据存在延迟; 跳过 traffic 时按生成器默认格式推算每个标签的文件数
+        expected_count = (
+            len(file_data_labels) * len(DEFAULT_FORMATS) if uploaded_files is None else len(uploaded_files)
+        )
+        await self.apione.is_file_asset_count_equal_expected(expected_count)
+        await asyncio.sleep(3)
+        log.info("文件资产条目无误")
+
+        # 一次扫描本地文件、一次遍历文件资产列表、并发获取标签详情
+        file_label_details = await FileLabelVerifier(self.apione).verify(
+            FileUtils.find_file_from_root(
+                f"{TEST_DATA_DIR}/{spec_dir_name(specification_name)}", create_if_not_exists=True
+            ),
+            [file_data_label["name"] for file_data_label in file_data_labels],
+            entries=uploaded_files,
+        )
+        results = []
+        for file_data_label in file_data_labels:
+            result = compare_file_label(
+                file_data_label, file_label_details[file_data_label["name"]], upload_failed=failed_uploads
+            )
+            if self.history is not None:
+                self.history.record_file_result(self.run_id, specification_name, result)
+            results.append(result)
+        return results
+
+    # ---------- export ----------
+
+    def diff_with_previous_run(self, specification_name: str) -> Optional[Dict[str, Any]]:
+        """与同一标准的上一次运行对比, 返回回退与修复的数量"""
+        if self.history is None:
+            return None
+        previous_run_id = self.history.previous_run(self.run_id, specification_name)
+        if previous_run_id is None:
+            return None
+        run_diff = self.history.diff(previous_run_id, self.run_id, specification_name)
+        log.info(f"{specification_name} 运行对比 {run_diff.summary()}")
+        for change in run_diff.regressions:
+            log.warning(
+                f"回退: {change.kind} {change.label_name}({change.label_id}) "
+                f"{change.part}/{change.location} 识别 {change.before_matched} -> {change.after_matched}/{change.expected}, "
+                f"误识别 {change.before_misidentified} -> {change.after_misidentified}"
+            )
+        return {
+            "base_run": previous_run_id,
+            "regressions": len(run_diff.regressions),
+            "fixes": len(run_diff.fixes),
+        }
+
+    def summarize(self, result: SpecResult) -> Dict[str, Any]:
+        """统计指标并与上一次运行对比, 结构即 export_summary_markdown 的输入"""
+        from utils.report_tools.metrics_utils import ApiLabelMetrics, FileLabelMetrics
+
+        api_metrics = ApiLabelMetrics(result.api_results)
+        file_metrics = FileLabelMetrics(result.file_results)
+        return {
+            "specification": result.specification_name,
+            "total_labels": len(result.data_labels),
+            "api": {
+                **api_metrics.summary(),
+                "total": len(result.api_data_labels),
+                "overall": api_metrics.overall(),
+            },
+            "file": {
+                **file_metrics.summary(),
+                "total": len(result.file_data_labels),
+            },
+            "history": self.diff_with_previous_run(result.specification_name),
+        }
+
+    def export(self, result: SpecResult) -> List[str]:
+        """按输出格式导出, 返回写出的文件路径"""
+        result_dir = self.result_dir or FileUtils.find_file_from_root(TEST_RESULT_DIR, create_if_not_exists=True)
+        os.makedirs(result_dir, exist_ok=True)
+        base_path = os.path.join(result_dir, spec_dir_name(result.specification_name))
+        written = []
+        if "xlsx" in self.output_formats:
+            from utils.report_tools.label_excel_report import export_label_to_excel
+
+            export_label_to_excel(result.api_results, result.file_results, base_path + ".xlsx")
+            written.append(base_path + ".xlsx")
+        if "md" in self.output_formats:
+            with open(base_path + ".md", "w", encoding="utf-8") as f:
+                f.write(export_summary_markdown(result.summary))
+            written.append(base_path + ".md")
+        if "json" in self.output_formats:
+            with open(base_path + ".json", "w", encoding="utf-8") as f:
+                json.dump(
+                    {"summary": result.summary, "api": result.api_results, "file": result.file_results},
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            written.append(base_path + ".json")
+        return written
+
+    # ---------- 单个标准 ----------
+
+    async def run_specification(
+        self,
+        specification_name: str,
+        specification_id: Any,
+        data_labels: List[Dict[str, Any]],
+        skip: Sequence[str] = (),
+    ) -> SpecResult:
+        """对单个标准执行 reset/traffic/verify/export 阶段, skip 中的阶段跳过
+
+        跳过 traffic 时按当前的流量计划推算期望样本、扫描本地标准目录中的测试文件(需上一次开启 archive),
+        用于重新校验上一次发送的流量;
+        跳过 verify 时没有识别结果, export 阶段随之跳过
+        """
+        unknown = set(skip) - set(PHASES)
+        if unknown:
+            raise ValueError(f"未知的阶段: {sorted(unknown)}, 可选 {PHASES}")
+        result = SpecResult(specification_name, specification_id, data_labels)
+        api_data_labels, result.file_data_labels = split_data_labels(data_labels)
+
+        if "reset" not in skip:
+            await self.reset(specification_name, specification_id)
+
+        uploaded_files, failed_uploads = None, []
+        if "traffic" not in skip:
+            # 禁用自动合并, 资产按路径一一对应标签
+            await self.apione.update_auto_merge_config()
+            result.api_data_labels = await self.send_api_traffic(api_data_labels)
+            uploaded_files, failed_uploads = await self.send_file_traffic(result.file_data_labels, specification_name)
+        else:
+            result.api_data_labels = self.traffic_plan(api_data_labels).expected_data_labels()
+
+        if "verify" in skip:
+            log.info(f"{specification_name}: 跳过 verify 阶段, 不导出结果")
+            return result
+        result.api_results = await self.verify_api(result.api_data_labels, specification_name)
+        result.file_results = await self.verify_file(
+            result.file_data_labels, specification_name, uploaded_files=uploaded_files, failed_uploads=failed_uploads
+        )
+        result.summary = self.summarize(result)
+
+        if "export" not in skip:
+            for path in self.export(result):
+                log.success(f"{specification_name}: 已导出 {path}")
+        return result
+
+
+def export_summary_markdown(test_result: Dict[str, Any]) -> str:
+    """
+    导出简洁美观的 Markdown 报告
+    返回格式示例：
+    # 📊 数据标签测试汇总结果
+
+    ## 🎯 标准名称
+    - 总标签数: 15
+    - API 标签:
+    ✓ 请求位置: 通过 12 | 失败 2 | 误识别 1
+    ✓ 响应位置: 通过 10 | 失败 3 | 误识别 2
+    - 文件标签: 通过 8 | 失败 2
+    - 文件类型明细:
+        • .pdf: 通过 3 | 误识别 0
+        • .docx: 通过 5 | 误识别 1
+    ---
+    """
+    lines = []
+
+    # 标准标题
+    lines.append(f"## 🎯 {test_result['specification']} 标准数据标签测试报告")
+    lines.append("")
+
+    # 基础信息
+    lines.append(f"- **总标签数**: {test_result['total_labels']}")
+    lines.append("")
+
+    # API 部分
+    lines.append("- **API 标签**:")
+    req_pass = test_result["api"]["request_pass"]
+    req_fail = test_result["api"]["request_fail"]
+    req_mis = test_result["api"]["request_mis"]
+
+    res_pass = test_result["api"]["response_pass"]
+    res_fail = test_result["api"]["response_fail"]
+    res_mis = test_result["api"]["response_mis"]
+
+    lines.append(f"  - 请求位置: ✓ 通过 {req_pass} | ✗ 失败 {req_fail} | ❓ 误识别 {req_mis}")
+    lines.append(f"  - 响应位置: ✓ 通过 {res_pass} | ✗ 失败 {res_fail} | ❓ 误识别 {res_mis}")
+    overall = test_result["api"].get("overall")
+    if overall:
+        lines.append(
+            f"  - 准确率 {overall['precision']:.2%} | 召回率 {overall['recall']:.2%} | F1 {overall['f1']:.2%}"
+        )
+    lines.append("")
+
+    # 文件部分
+    file_pass = test_result["file"]["total_pass"]
+    file_fail = test_result["file"]["total_fail"]
+    lines.append(f"- **文件标签**: ✓ 通过 {file_pass} | ✗ 失败 {file_fail}")
+
+    # 文件类型明细
+    if test_result["file"]["file_stats"]:
+        lines.append("  - 文件类型明细:")
+        for ft, stats in test_result["file"]["file_stats"].items():
+            lines.append(
+                f"    • {ft}: ✓ 通过 {stats['pass']} | ✗ 失败 {stats['fail']} | ❓ 误识别 {stats['mis']}"
+            )
+
+    # 与上一次运行对比
+    history = test_result.get("history")
+    if history:
+        lines.append(f"- **与上次运行对比**: ⬇ 回退 {history['regressions']} | ⬆ 修复 {history['fixes']}")
+
+    lines.append("")
+    lines.append("---")
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+async def notify(
+    robot: "WeComRobot",
+    http: AsyncHttpClient,
+    summaries: List[Dict[str, Any]],
+    report_server: str = REPORT_SERVER,
+    mentioned_list: Optional[List[str]] = None,
+):
+    """企微推送每个标准的 Markdown 汇总, 并把测试数据与测试结果打包上传到报告服务器"""
+    from utils.file_tools.zip_utils import ZipUtils
+
+    test_data_path = FileUtils.find_file_from_root(TEST_DATA_DIR)
+    test_result_path = FileUtils.find_file_from_root(TEST_RESULT_DIR)
+    test_data_target_path = ZipUtils.zip_files(test_data_path, "文件测试数据.zip")
+    test_results_target_path = ZipUtils.zip_files(test_result_path, "数据标签测试结果.zip")
+
+    for summary in summaries:
+        await robot.send_markdown(export_summary_markdown(summary))
+
+    await http.set_url(report_server)
+    await http.upload_files(
+        files=[test_results_target_path, test_data_target_path],
+        url="/data_label_test",
+    )
+
+    await robot.send_text(
+        content=f"测试文件&测试结果地址: {report_server}/data_label_test",
+        mentioned_list=REPORT_MENTIONED_LIST if mentioned_list is None else mentioned_list,
+    )
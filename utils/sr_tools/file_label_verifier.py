@@ -0,0 +1,165 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from utils.file_tools.file_utils import FileUtils
+from utils.file_tools.label_file_manifest import ManifestEntry, load_manifest, manifest_path_of
+from utils.log_tools.logger_utils import get_logger
+from utils.sr_tools.apione_client import ApioneClient
+
+log = get_logger(__name__)
+
+
+@dataclass
+class LocalTestFile:
+    """本地测试文件"""
+
+    path: str
+    name: str
+    ext: str
+    md5: str
+    label_name: str
+
+
+@dataclass
+class FileLabelDetail:
+    """单个测试文件在服务端的数据标签识别详情"""
+
+    file: LocalTestFile
+    file_asset_id: Optional[int]
+    label_detail: Mapping[str, int]
+
+
+class FileLabelVerifier:
+    """文件资产数据标签校验: 一次列出全部文件资产, 按 md5 与本地文件匹配, 并发获取标签详情"""
+
+    def __init__(
+        self,
+        apione: ApioneClient,
+        max_concurrent: int = 16,
+        page_size: int = 500,
+    ):
+        self.apione = apione
+        self.max_concurrent = max_concurrent
+        self.page_size = page_size
+
+    @staticmethod
+    def index_local_files(folder_path: str) -> Dict[str, List[LocalTestFile]]:
+        """按数据标签名称归类测试数据目录中的文件
+
+        优先使用生成阶段写出的清单(大小、修改时间一致时直接采用其中的 md5),
+        清单中没有或已被改动的文件才读取内容计算 md5
+        文件名格式: 数据标签识别_{数据标签名称}.{后缀}
+        """
+        manifest = load_manifest(manifest_path_of(folder_path))
+        files_by_label: Dict[str, List[LocalTestFile]] = {}
+        hashed = 0
+        for entry in sorted(os.scandir(folder_path), key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+            stem, file_ext = os.path.splitext(entry.name)
+            manifest_entry = manifest.get(entry.name)
+            stat = entry.stat()
+            if (
+                manifest_entry is not None
+                and manifest_entry.size == stat.st_size
+                and manifest_entry.mtime_ns == stat.st_mtime_ns
+            ):
+                label_name, md5 = manifest_entry.label_name, manifest_entry.md5
+            else:
+                label_name, md5 = stem.partition("_")[2], FileUtils.calculate_file_md5(entry.path)
+                hashed += 1
+            files_by_label.setdefault(label_name, []).append(
+                LocalTestFile(
+                    path=entry.path,
+                    name=entry.name,
+                    ext=file_ext,
+                    md5=md5,
+                    label_name=label_name,
+                )
+            )
+        if hashed:
+            log.warning(f"{hashed} 个文件不在生成清单中或已被修改, 已重新计算 md5")
+        return files_by_label
+
+    @staticmethod
+    def index_manifest_entries(
+        folder_path: str, entries: List[ManifestEntry]
+    ) -> Dict[str, List[LocalTestFile]]:
+        """按数据标签名称归类清单条目, 用于未落盘(边生成边上传)的测试文件"""
+        files_by_label: Dict[str, List[LocalTestFile]] = {}
+        for entry in entries:
+            files_by_label.setdefault(entry.label_name, []).append(
+                LocalTestFile(
+                    path=os.path.join(folder_path, entry.file_name),
+                    name=entry.file_name,
+                    ext=entry.ext,
+                    md5=entry.md5,
+                    label_name=entry.label_name,
+                )
+            )
+        return files_by_label
+
+    async def list_file_assets(self) -> Dict[Tuple[str, str], int]:
+        """分页遍历全部文件资产, 以 (文件名, md5) 建立 ID 索引"""
+        file_asset_ids: Dict[Tuple[str, str], int] = {}
+        async for file_asset in self.apione.iter_file_assets(page_size=self.page_size):
+            file_asset_ids[(file_asset.name, file_asset.md5)] = file_asset.id
+        return file_asset_ids
+
+    async def fetch_label_details(
+        self, local_files: List[LocalTestFile]
+    ) -> Dict[str, FileLabelDetail]:
+        """获取本地文件对应的服务端标签详情, 以文件路径为键"""
+        file_asset_ids = await self.list_file_assets()
+        log.info(f"文件资产列表获取完成, 共 {len(file_asset_ids)} 条")
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def fetch(local_file: LocalTestFile) -> FileLabelDetail:
+            async with semaphore:
+                file_asset_id = file_asset_ids.get((local_file.name, local_file.md5))
+                if file_asset_id is None:
+                    # 列表中未出现的文件(入库延迟), 退回到按名称轮询
+                    log.warning(f"{local_file.name} 未出现在文件资产列表中, 单独查询")
+                    file_asset_id = await self.apione.get_file_asset_id(
+                        local_file.name, local_file.md5
+                    )
+                    if file_asset_id is None:
+                        # 文件资产不存在, 不用空 ID 查询详情, 对比时按未识别处理
+                        log.error(f"{local_file.name} 未找到对应的文件资产")
+                        return FileLabelDetail(local_file, None, MappingProxyType({}))
+                label_detail = await self.apione.get_file_asset_label_detail(file_asset_id)
+                return FileLabelDetail(local_file, file_asset_id, label_detail)
+
+        details = await asyncio.gather(*(fetch(f) for f in local_files))
+        return {detail.file.path: detail for detail in details}
+
+    async def verify(
+        self,
+        folder_path: str,
+        label_names: List[str],
+        entries: Optional[List[ManifestEntry]] = None,
+    ) -> Dict[str, List[FileLabelDetail]]:
+        """返回每个数据标签名称对应的全部文件识别详情
+
+        传入 entries(上传流水线返回的清单条目)时直接使用, 不再扫描目录
+        """
+        if entries is not None:
+            files_by_label = self.index_manifest_entries(folder_path, entries)
+        else:
+            files_by_label = self.index_local_files(folder_path)
+        local_files = [
+            local_file
+            for label_name in label_names
+            for local_file in files_by_label.get(label_name, [])
+        ]
+        details = await self.fetch_label_details(local_files)
+        return {
+            label_name: [
+                details[local_file.path]
+                for local_file in files_by_label.get(label_name, [])
+            ]
+            for label_name in label_names
+        }
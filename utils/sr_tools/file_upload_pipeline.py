@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.file_tools.label_file_generator import GenerationJob, LabelFileGenerator, render_with_md5
+from utils.file_tools.label_file_manifest import ManifestEntry
+from utils.log_tools.logger_utils import get_logger
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.api_label_pipeline import PipelineStage, StagePipeline, StageStats
+
+log = get_logger(__name__)
+
+
+class FileUploadPipeline:
+    """测试文件边生成边上传: 渲染 -> (归档) -> 上传
+
+    渲染在进程池中进行, 产出的 (文件名, 字节) 经有界队列直接交给上传协程, 不经过磁盘;
+    archive=True 时才把文件写入生成器的输出目录(及内容寻址存储)并写出清单
+    返回的清单条目带有内存中计算的 md5, 可直接交给 FileLabelVerifier 校验;
+    重试后仍上传失败的文件不在返回值中, 其清单条目记录在 failed
+    """
+
+    def __init__(
+        self,
+        http: AsyncHttpClient,
+        url: str,
+        generator: LabelFileGenerator,
+        upload_concurrency: int = 4,
+        queue_size: int = 32,
+        archive: bool = False,
+        use_multipart: bool = True,
+        max_retries: int = 3,
+        interval: float = 0.2,
+    ):
+        self.http = http
+        self.url = url.rstrip("/")
+        self.generator = generator
+        self.archive = archive
+        self.use_multipart = use_multipart
+        self.max_retries = max_retries
+        self.interval = interval
+        self.failed: List[ManifestEntry] = []
+        self._executor = None
+        stages = [PipelineStage("render", self._render, generator.max_workers)]
+        if archive:
+            stages.append(PipelineStage("archive", self._archive, 1))
+        stages.append(PipelineStage("upload", self._upload, upload_concurrency))
+        self.pipeline = StagePipeline(stages, queue_size=queue_size)
+
+    async def _render(self, job: GenerationJob) -> Tuple[GenerationJob, bytes, ManifestEntry]:
+        loop = asyncio.get_running_loop()
+        content, md5 = await loop.run_in_executor(
+            self._executor, render_with_md5, (job.ext, job.record_text)
+        )
+        return job, content, job.manifest_entry(len(content), md5)
+
+    def _archive(self, payload: Tuple[GenerationJob, bytes, ManifestEntry]):
+        job, content, entry = payload
+        return job, content, self.generator.archive(job, content, entry.md5)
+
+    async def _upload(self, payload: Tuple[GenerationJob, bytes, ManifestEntry]) -> Optional[ManifestEntry]:
+        job, content, entry = payload
+        uploaded = False
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self.http.upload_bytes(
+                    job.file_name, content, self.url, use_multipart=self.use_multipart
+                )
+                log.success(f"{job.file_name} 上传成功")
+                uploaded = True
+                break
+            except Exception as e:
+                log.error(f"{job.file_name} 上传失败，第 {attempt} 次重试: {e}")
+                if attempt == self.max_retries:
+                    log.error(f"{job.file_name} 最终上传失败")
+                    self.failed.append(entry)
+                else:
+                    await asyncio.sleep(self.interval)
+        if self.interval > 0:
+            await asyncio.sleep(self.interval)
+        return entry if uploaded else None
+
+    async def run(self, file_asset_data_labels: List[Dict[str, Any]]) -> List[ManifestEntry]:
+        """生成并上传全部测试文件, 按任务顺序返回上传成功的清单条目"""
+        jobs = self.generator.build_jobs(file_asset_data_labels)
+        self.failed = []
+        with self.generator.render_executor(jobs) as executor:
+            self._executor = executor
+            try:
+                results = await self.pipeline.run(jobs)
+            finally:
+                self._executor = None
+        entries = [entry for entry in results if entry is not None]
+        if self.archive:
+            # 上传失败的文件同样已归档, 保留在本地目录与清单中
+            self.generator.finalize(jobs, {entry.file_name: entry for entry in entries + self.failed})
+        for stats in self.pipeline.stats:
+            log.info(stats.summary())
+        if self.failed:
+            log.error(f"{len(self.failed)} 个文件最终上传失败: {[entry.file_name for entry in self.failed]}")
+        return entries
+
+    def report(self) -> Dict[str, StageStats]:
+        """各阶段的队列深度与耗时统计"""
+        return self.pipeline.report()
@@ -0,0 +1,277 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from entity.api_asset.api_asset import ApiAssetLabelDetail
+from utils.sr_tools.label_parser import LABEL_LOCATIONS
+
+if TYPE_CHECKING:
+    from utils.file_tools.label_file_manifest import ManifestEntry
+    from utils.sr_tools.file_label_verifier import FileLabelDetail
+
+LABEL_PARTS = ("request", "response")
+FILE_TYPES = (".doc", ".docx", ".xls", ".xlsx", ".txt", ".pptx", ".pdf", ".csv")
+
+
+@dataclass(frozen=True)
+class CompareRules:
+    """评分规则, 同一份识别详情可按不同规则重复评分
+
+    Args:
+        parts: 参与评分的方向
+        locations: 参与评分的位置
+        count_misidentification: 误识别是否判定为失败
+        allowed_labels: 允许同时出现、不计为误识别的标签名称
+    """
+
+    parts: Tuple[str, ...] = LABEL_PARTS
+    locations: Tuple[str, ...] = LABEL_LOCATIONS
+    count_misidentification: bool = True
+    allowed_labels: FrozenSet[str] = field(default_factory=frozenset)
+
+
+DEFAULT_RULES = CompareRules()
+
+
+def freeze(value: Any) -> Any:
+    """递归转换为只读视图: dict -> MappingProxyType, list -> tuple"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """freeze 的逆操作, 返回可修改、可 json 序列化的普通副本"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+def freeze_label_detail(label_detail: Optional[ApiAssetLabelDetail]) -> Optional[ApiAssetLabelDetail]:
+    """返回 request/response 均为只读视图的标签详情, 可安全缓存与共享"""
+    if label_detail is None:
+        return None
+    return ApiAssetLabelDetail(
+        request=freeze(label_detail.request),
+        response=freeze(label_detail.response),
+        storage_state=label_detail.storage_state,
+    )
+
+
+def canonicalize(item: Any) -> Hashable:
+    """把标签内容转换为可哈希的规范化 key
+
+    字典按键排序后转为 tuple, 与键顺序无关; 字符串去除首尾空白
+    """
+    item_type = type(item)
+    if item_type is str:
+        return item.strip()
+    if item_type is dict or item_type is MappingProxyType:
+        # 常见情况: {"key": "value"}, 值均为字符串时无需递归
+        if len(item) == 1:
+            ((key, value),) = item.items()
+            if type(value) is str:
+                return ("dict", ((str(key), value.strip()),))
+        elif all(type(v) is str for v in item.values()):
+            return ("dict", tuple(sorted((str(k), v.strip()) for k, v in item.items())))
+        return ("dict", tuple(sorted((str(k), canonicalize(v)) for k, v in item.items())))
+    if isinstance(item, (list, tuple)):
+        return ("list", tuple(canonicalize(v) for v in item))
+    if isinstance(item, Mapping):
+        return canonicalize(dict(item))
+    return item
+
+
+def misidentification_count(value: Any) -> int:
+    """误识别条目的次数: API 为 {"count": n, "contents": [...]}, 文件为 n"""
+    if isinstance(value, dict):
+        return value.get("count") or len(value.get("contents") or []) or 1
+    return int(value or 1)
+
+
+def to_multiset(items: Optional[Iterable[Any]]) -> Counter:
+    return Counter(map(canonicalize, items or ()))
+
+
+def _pick(items: List[Any], keys: List[Hashable], wanted: Counter) -> List[Any]:
+    """按多重集 wanted 从 items 中挑出对应的原始内容(保持原顺序), keys 为 items 对应的规范化 key"""
+    remaining = Counter(wanted)
+    picked = []
+    for item, key in zip(items, keys):
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            picked.append(item)
+    return picked
+
+
+def _empty_section() -> Dict[str, Any]:
+    return {"start_line": None, "headers": None, "body": None, "count": None}
+
+
+def compare_api_label(
+    api_asset_data_label: Dict[str, Any],
+    api_asset_label_detail: Optional[ApiAssetLabelDetail],
+    rules: CompareRules = DEFAULT_RULES,
+) -> Dict[str, Dict[str, Any]]:
+    """对比单个数据标签的测试样本与服务端识别结果(request、response 两个方向, 全部位置)
+
+    - matched: 服务端在该位置识别为本标签的内容, count 为与样本匹配上的条数
+    - unmatched: 样本多重集 - 识别结果多重集
+    - over_detected: 识别结果多重集 - 样本多重集, 即样本之外多识别出的本标签内容;
+      服务端 count 大于匹配条数时(contents 可能被截断), 多出的次数同样计入 count
+    - misidentification: 同一位置上被识别出的其他标签
+    - send_failed: 测试流量重试后仍未发送成功的位置(样本中的 send_failed), 其样本不参与匹配
+    有未匹配、多识别、发送失败或(按规则)误识别时判定为 FAILED
+
+    只读取 api_asset_label_detail, 结果中的内容均为独立副本
+    """
+    data_label_id = api_asset_data_label.get("id")
+    data_label_name = api_asset_data_label.get("name")
+    expected = {
+        location: list(api_asset_data_label.get(location, None) or [])
+        for location in rules.locations
+    }
+    expected_keys = {
+        location: [canonicalize(item) for item in items] for location, items in expected.items()
+    }
+    expected_sets = {location: Counter(keys) for location, keys in expected_keys.items()}
+    expected_count = sum(len(items) for items in expected.values())
+    failed_locations = set(api_asset_data_label.get("send_failed") or ())
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for part in rules.parts:
+        real_data_label_value = getattr(api_asset_label_detail, part, None) or {}
+        matched, unmatched, misidentification = _empty_section(), _empty_section(), _empty_section()
+        over_detected, send_failed = _empty_section(), _empty_section()
+        matched_count = unmatched_count = over_detected_count = misidentification_count = send_failed_count = 0
+
+        for location in rules.locations:
+            if location in failed_locations:
+                # 服务端没有收到该位置的流量, 识别结果不代表识别能力
+                send_failed[location] = list(expected[location])
+                send_failed_count += len(expected[location])
+                continue
+            location_labels = real_data_label_value.get(location, None) or {}
+            specified = location_labels.get(data_label_name) or {}
+            actual_contents = list(specified.get("contents") or [])
+            actual_keys = [canonicalize(item) for item in actual_contents]
+            actual_set = Counter(actual_keys)
+            expected_set = expected_sets[location]
+
+            missing = expected_set - actual_set if actual_set else expected_set
+            if specified:
+                matched[location] = thaw(actual_contents)
+            if missing:
+                unmatched[location] = (
+                    _pick(expected[location], expected_keys[location], missing)
+                    if actual_set
+                    else list(expected[location])
+                )
+            missing_count = sum(missing.values())
+            location_matched = sum(expected_set.values()) - missing_count
+            matched_count += location_matched
+            unmatched_count += missing_count
+
+            extra = actual_set - expected_set
+            location_over = max(sum(extra.values()), (specified.get("count") or 0) - location_matched)
+            if location_over > 0:
+                over_detected[location] = thaw(_pick(actual_contents, actual_keys, extra))
+                over_detected_count += location_over
+
+            others = {
+                name: thaw(value)
+                for name, value in location_labels.items()
+                if name != data_label_name and name not in rules.allowed_labels
+            }
+            if others:
+                misidentification[location] = others
+                misidentification_count += len(others)
+
+        matched["count"] = matched_count
+        unmatched["count"] = unmatched_count
+        over_detected["count"] = over_detected_count
+        misidentification["count"] = misidentification_count
+        send_failed["count"] = send_failed_count
+        results[part] = {
+            "id": data_label_id,
+            "name": data_label_name,
+            "sample": {**expected, "count": expected_count},
+            "matched": matched,
+            "unmatched": unmatched,
+            "over_detected": over_detected,
+            "misidentification": misidentification,
+            "send_failed": send_failed,
+            "status": (
+                "PASS"
+                if matched_count == expected_count
+                and unmatched_count == 0
+                and over_detected_count == 0
+                and send_failed_count == 0
+                and (misidentification_count == 0 or not rules.count_misidentification)
+                else "FAILED"
+            ),
+        }
+    return results
+
+
+def compare_api_labels(
+    pairs: Iterable[Tuple[Dict[str, Any], Optional[ApiAssetLabelDetail]]],
+    rules: CompareRules = DEFAULT_RULES,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """批量对比 (样本, 识别详情), 可用于对已缓存的识别详情按新规则离线重新评分"""
+    return [compare_api_label(data_label, label_detail, rules) for data_label, label_detail in pairs]
+
+
+def compare_file_label(
+    file_asset_data_label: Dict[str, Any],
+    file_label_details: List["FileLabelDetail"],
+    rules: CompareRules = DEFAULT_RULES,
+    upload_failed: Iterable["ManifestEntry"] = (),
+) -> Dict[str, Any]:
+    """对比单个数据标签在各类型测试文件中的识别结果, 不修改 file_label_details
+
+    upload_failed 中属于该标签的文件最终未上传, 记为匹配 0 条并标记 upload_failed, 标签判定为失败
+    """
+    data_label_name = file_asset_data_label.get("name")
+    expected_count = len(file_asset_data_label.get("file_data", None) or [])
+    file_data_label_result: Dict[str, Any] = {
+        "id": file_asset_data_label.get("id"),
+        "name": data_label_name,
+        **{file_type: None for file_type in FILE_TYPES},
+        "status": None,
+    }
+    all_passed = True
+    for file_label_detail in file_label_details:
+        label_detail = file_label_detail.label_detail
+        matched_count = label_detail.get(data_label_name, 0)
+        misidentification = {
+            name: count
+            for name, count in label_detail.items()
+            if name != data_label_name and name not in rules.allowed_labels
+        }
+        file_data_label_result[file_label_detail.file.ext] = {
+            "target_file": file_label_detail.file.name,
+            "expected_count": expected_count,
+            "matched_count": matched_count,
+            "misidentification": misidentification,
+        }
+        if expected_count != matched_count or (misidentification and rules.count_misidentification):
+            all_passed = False
+    for entry in upload_failed:
+        if entry.label_name != data_label_name:
+            continue
+        file_data_label_result[entry.ext] = {
+            "target_file": entry.file_name,
+            "expected_count": expected_count,
+            "matched_count": 0,
+            "misidentification": {},
+            "upload_failed": True,
+        }
+        all_passed = False
+    file_data_label_result["status"] = "PASS" if all_passed else "FAILED"
+    return file_data_label_result
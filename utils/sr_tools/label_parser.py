@@ -0,0 +1,75 @@
+import functools
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# 匹配 key:value，key 可以是字母、下划线、中文，value 任意内容
+_KV_PATTERN = re.compile(r'^\s*([\w\u4e00-\u9fff_]+)"?\s*:\s*"?\s*(.+?)\s*"?$')
+
+LABEL_LOCATIONS = ("start_line", "headers", "body")
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_content(item: str) -> Union[Tuple[str, str], str, None]:
+    """解析单条标签内容, 结果按原始字符串缓存
+
+    Returns:
+        (key, value): key:value 格式
+        str: 其他内容（如 IPv6）保留去引号后的原始字符串
+        None: 空内容
+    """
+    item = item.strip()
+    # 去掉外层单/双引号
+    if len(item) >= 2 and item[0] == item[-1] and item[0] in "'\"":
+        item = item[1:-1]
+    elif item in ("'", '"'):
+        item = ""
+
+    if not item:
+        return None
+
+    # 判断冒号数量，如果多于1个，认为是 IPv6 或非 key:value
+    if item.count(":") > 1:
+        return item
+
+    match = _KV_PATTERN.match(item)
+    return match.groups() if match else item
+
+
+def parse_contents(contents: Optional[List[str]]) -> List[Union[Dict[str, str], str]]:
+    """
+    将混合格式数据转换为字典列表
+    - key:value 格式转换为 {key: value}
+    - 其他（如 IPv6）保留原始字符串
+    """
+    result = []
+    for item in contents or ():
+        parsed = parse_content(item)
+        if parsed is None:
+            continue
+        # 缓存中保存不可变的 tuple, 每次返回新的 dict, 避免调用方修改影响缓存
+        result.append({parsed[0]: parsed[1]} if isinstance(parsed, tuple) else parsed)
+    return result
+
+
+def parse_label_locations(label_resp: Optional[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """一次性解析 unmask 详情中 request/response 的 label 字段
+
+    Returns:
+        {"start_line": {标签名: {"count": int, "contents": [...]}} | None, "headers": ..., "body": ...}
+    """
+    label_resp = label_resp or {}
+    parsed: Dict[str, Optional[Dict[str, Any]]] = {}
+    for location in LABEL_LOCATIONS:
+        items = label_resp.get(location)
+        parsed[location] = (
+            {
+                item.get("name"): {
+                    "count": item.get("count"),
+                    "contents": parse_contents(item.get("contents")),
+                }
+                for item in items
+            }
+            if items
+            else None
+        )
+    return parsed
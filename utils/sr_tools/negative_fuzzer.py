@@ -0,0 +1,363 @@
+"""负样本模糊测试: 按目标速率发送大量近似样本与无标签流量, 统计数据标签的误识别
+
+流量分两类, 每类落在各自的 API 路径上, 便于之后按资产归因:
+    - near_miss: 由 PiiGenerator 生成的合法取值经一次变异得到(改校验位、截断、追加、改首位数字),
+      大多数变异使校验位、号段、长度等不再合法, 少数仍可能合法(如改首位后仍是有效的手机号段),
+      这部分被识别不算误识别, 报告中的 near_miss 误识别数因此偏高, 路径为 /fuzz_test/<run_id>/near_miss/<标签 ID>/<分桶>
+    - label_free: 只含中性词的文本, 路径为 /fuzz_test/<run_id>/label_free/<分桶>
+发送结束后遍历这些路径对应的 API 资产, 资产上出现的任何数据标签都视为误识别,
+按资产收到的请求数折算为每百万请求的误识别次数(同一资产内无法区分具体请求, 为上限估计)
+资产按路径归因, run_negative_fuzz 在运行期间关闭资产自动合并, 结束后(包括异常)重新开启
+"""
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.data_tools.pii_generator import DIGITS, PiiGenerator
+from utils.file_tools.large_file_generator import FILLER_WORDS
+from utils.log_tools.logger_utils import get_logger
+from utils.request_tools.async_http_client import AsyncHttpClient
+from utils.sr_tools.apione_client import ApioneClient
+
+log = get_logger(__name__)
+
+FUZZ_PATH_PREFIX = "/fuzz_test"
+NEAR_MISS = "near_miss"
+LABEL_FREE = "label_free"
+NEAR_MISS_MUTATIONS = ("check_digit", "truncate", "extend", "first_digit")
+BODY_KEYS = ("data", "value", "text", "content", "remark", "info", "note", "message")
+# 近似样本默认只取唯一取值数不少于该值的标签(证件号、手机号、卡号等结构化取值), 枚举类标签变异后意义不大
+MIN_NEAR_MISS_CAPACITY = 10_000
+# 每个标签预先生成的取值数; 小批量逐次生成的固定开销远大于取值本身
+VALUE_BUFFER_SIZE = 512
+
+_DIGIT_CODES = np.frombuffer(DIGITS.encode("utf-32-le"), dtype=np.uint32)
+_STOP = object()
+
+
+def near_miss(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """对每个取值做一次随机变异, 返回新的字符串数组
+
+    - check_digit: 末位换成另一个数字
+    - truncate: 去掉末位
+    - extend: 末尾追加一位数字
+    - first_digit: 第一个数字换成另一个数字(改变号段、地区码等)
+    """
+    count = len(values)
+    width = values.dtype.itemsize // 4
+    codes = np.zeros((count, width + 1), dtype=np.uint32)
+    codes[:, :width] = np.ascontiguousarray(values).view(np.uint32).reshape(count, width)
+    lengths = (codes != 0).sum(axis=1)
+    rows = np.arange(count)
+    mutations = rng.integers(0, len(NEAR_MISS_MUTATIONS), count)
+    offsets = rng.integers(1, 10, count)
+
+    def shift_digit(row_index: np.ndarray, column: np.ndarray):
+        current = codes[row_index, column].astype(np.int64) - ord("0")
+        is_digit = (current >= 0) & (current <= 9)
+        replaced = np.where(is_digit, (current + offsets[row_index]) % 10, offsets[row_index])
+        codes[row_index, column] = _DIGIT_CODES[replaced]
+
+    selected = rows[mutations == 0]
+    shift_digit(selected, lengths[selected] - 1)
+    selected = rows[(mutations == 1) & (lengths > 1)]
+    codes[selected, lengths[selected] - 1] = 0
+    selected = rows[mutations == 2]
+    codes[selected, lengths[selected]] = _DIGIT_CODES[offsets[selected]]
+    selected = rows[mutations == 3]
+    is_digit = (codes[selected] >= ord("0")) & (codes[selected] <= ord("9"))
+    has_digit = is_digit.any(axis=1)
+    shift_digit(selected[has_digit], is_digit[has_digit].argmax(axis=1))
+    return codes.view(f"<U{width + 1}").ravel()
+
+
+class NegativePayloadFactory:
+    """批量构造负样本请求 (路径, 请求体)
+
+    取值与变异均为数组运算, 每个请求只做一次字符串拼接, 构造速度远高于发送速度
+    """
+
+    def __init__(
+        self,
+        pii: PiiGenerator,
+        seed: int = 0,
+        label_ids: Optional[Sequence[str]] = None,
+        label_free_ratio: float = 0.5,
+        fields_per_request: int = 4,
+        buckets: int = 100,
+        run_id: Optional[str] = None,
+    ):
+        if not 0 <= label_free_ratio <= 1:
+            raise ValueError(f"label_free_ratio 须在 [0, 1] 之间: {label_free_ratio}")
+        if label_ids is None:
+            label_ids = [
+                label_id
+                for label_id, generator in pii.generators.items()
+                if generator.capacity >= MIN_NEAR_MISS_CAPACITY
+            ]
+        if not label_ids and label_free_ratio < 1:
+            raise ValueError("没有可用于构造近似样本的数据标签")
+        self.pii = pii
+        self.label_ids = list(label_ids)
+        self.label_free_ratio = label_free_ratio
+        self.fields_per_request = fields_per_request
+        self.buckets = buckets
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.rng = np.random.default_rng(seed)
+        filler_rng = random.Random(seed)
+        self.filler = np.array(
+            [" ".join(filler_rng.choices(FILLER_WORDS, k=filler_rng.randint(2, 8))) for _ in range(4096)]
+        )
+        self._encode = json.encoder.encode_basestring
+        self._keys = [self._encode(key) for key in BODY_KEYS]
+        self._buffers: Dict[str, Tuple[np.ndarray, int]] = {}
+
+    @property
+    def path_prefix(self) -> str:
+        return f"{FUZZ_PATH_PREFIX}/{self.run_id}/"
+
+    def _bodies(self, values: np.ndarray) -> List[bytes]:
+        encode, keys = self._encode, self._keys
+        fields = self.fields_per_request
+        rows = values.reshape(-1, fields).tolist()
+        return [
+            ("{" + ", ".join(f"{keys[i]}: {encode(value)}" for i, value in enumerate(row)) + "}").encode("utf-8")
+            for row in rows
+        ]
+
+    def _take(self, label_id: str, count: int) -> np.ndarray:
+        """从标签的取值缓冲中按顺序取出 count 个取值, 用尽时整块补充"""
+        buffer, position = self._buffers.get(label_id, (None, 0))
+        parts = []
+        while count:
+            if buffer is None or position == len(buffer):
+                buffer, position = self.pii[label_id].generate(max(count, VALUE_BUFFER_SIZE)), 0
+            take = min(count, len(buffer) - position)
+            parts.append(buffer[position : position + take])
+            position += take
+            count -= take
+        self._buffers[label_id] = (buffer, position)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def batch(self, count: int) -> List[Tuple[str, bytes]]:
+        """构造 count 个请求, 返回 [(路径, 请求体)]"""
+        label_free = int(self.rng.binomial(count, self.label_free_ratio)) if self.label_ids else count
+        requests: List[Tuple[str, bytes]] = []
+        fields = self.fields_per_request
+
+        if label_free:
+            values = self.filler[self.rng.integers(0, len(self.filler), label_free * fields)]
+            buckets = self.rng.integers(0, self.buckets, label_free).tolist()
+            paths = [f"{self.path_prefix}{LABEL_FREE}/{bucket}" for bucket in buckets]
+            requests.extend(zip(paths, self._bodies(values)))
+
+        near = count - label_free
+        if near:
+            chosen = np.sort(self.rng.integers(0, len(self.label_ids), near))
+            counts = np.bincount(chosen, minlength=len(self.label_ids))
+            values = np.concatenate(
+                [self._take(self.label_ids[index], int(counts[index]) * fields) for index in np.flatnonzero(counts)]
+            )
+            buckets = self.rng.integers(0, self.buckets, near).tolist()
+            paths = [
+                f"{self.path_prefix}{NEAR_MISS}/{self.label_ids[index]}/{bucket}"
+                for index, bucket in zip(chosen.tolist(), buckets)
+            ]
+            requests.extend(zip(paths, self._bodies(near_miss(values, self.rng))))
+
+        order = self.rng.permutation(len(requests))
+        return [requests[i] for i in order]
+
+
+@dataclass
+class FuzzTrafficStats:
+    """发送阶段的统计"""
+
+    run_id: str
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    status_codes: Counter = field(default_factory=Counter)
+    path_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"模糊测试 {self.run_id}: 发送 {self.sent} 个请求, 失败 {self.failed} 个, "
+            f"耗时 {self.elapsed:.1f}s, 实际速率 {self.rate:.0f} 请求/s, 状态码 {dict(self.status_codes)}"
+        )
+
+
+class NegativeFuzzer:
+    """按目标速率通过 AsyncHttpClient 发送负样本流量
+
+    生产者按批构造请求并按 rate 节拍放入有界队列, concurrency 个协程并发发送;
+    不重试、不检查状态码, 只统计发送结果
+    """
+
+    def __init__(
+        self,
+        http: AsyncHttpClient,
+        factory: NegativePayloadFactory,
+        rate: float = 500.0,
+        concurrency: int = 64,
+        batch_size: int = 1000,
+    ):
+        if rate <= 0:
+            raise ValueError(f"目标速率须大于 0: {rate}")
+        self.http = http
+        self.factory = factory
+        self.rate = rate
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    async def run(self, total_requests: int) -> FuzzTrafficStats:
+        stats = FuzzTrafficStats(self.factory.run_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        started = time.perf_counter()
+
+        async def produce():
+            queued = 0
+            while queued < total_requests:
+                for request in self.factory.batch(min(self.batch_size, total_requests - queued)):
+                    # 领先节拍 1ms 以上才休眠, 避免每个请求都切换一次
+                    delay = started + queued / self.rate - time.perf_counter()
+                    if delay > 0.001:
+                        await asyncio.sleep(delay)
+                    await queue.put(request)
+                    queued += 1
+            for _ in range(self.concurrency):
+                await queue.put(_STOP)
+
+        async def send():
+            while True:
+                request = await queue.get()
+                if request is _STOP:
+                    return
+                path, body = request
+                try:
+                    stats.status_codes[await self.http.send_raw("POST", path, body)] += 1
+                    stats.path_counts[path] += 1
+                    stats.sent += 1
+                except Exception as e:
+                    stats.failed += 1
+                    log.debug(f"{path} 发送失败: {e}")
+
+        await asyncio.gather(produce(), *(send() for _ in range(self.concurrency)))
+        stats.elapsed = time.perf_counter() - started
+        log.info(stats.summary())
+        return stats
+
+
+@dataclass
+class FalsePositive:
+    """单个数据标签在负样本流量上的误识别"""
+
+    label_name: str
+    assets: int = 0
+    requests: int = 0
+    by_category: Counter = field(default_factory=Counter)
+    per_million: float = 0.0
+
+
+@dataclass
+class FuzzReport:
+    """误识别汇总, 按每百万请求的误识别次数从高到低排列"""
+
+    run_id: str
+    total_requests: int
+    assets_swept: int
+    false_positives: List[FalsePositive]
+
+    def summary(self) -> str:
+        lines = [
+            f"模糊测试 {self.run_id}: {self.total_requests} 个请求, 扫描资产 {self.assets_swept} 个, "
+            f"误识别标签 {len(self.false_positives)} 个"
+        ]
+        for fp in self.false_positives:
+            lines.append(
+                f"  {fp.label_name}: {fp.per_million:.1f} 次/百万请求 | 资产 {fp.assets} 个 | "
+                f"涉及请求 {fp.requests} 个 | {dict(fp.by_category)}"
+            )
+        return "\n".join(lines)
+
+
+def asset_label_names(data_labels: Any) -> List[str]:
+    """资产记录中的 data_labels: 标签名列表, 或带 name 字段的字典列表"""
+    names = []
+    for item in data_labels or ():
+        name = item.get("name") if isinstance(item, dict) else item
+        if name:
+            names.append(str(name))
+    return names
+
+
+def build_fuzz_report(
+    stats: FuzzTrafficStats, assets: Iterable[Tuple[str, Any]]
+) -> FuzzReport:
+    """assets 为 (资产路径, data_labels); 只统计本次运行路径下的资产"""
+    prefix = f"{FUZZ_PATH_PREFIX}/{stats.run_id}/"
+    false_positives: Dict[str, FalsePositive] = {}
+    swept = 0
+    for path, data_labels in assets:
+        index = path.find(prefix)
+        if index < 0:
+            continue
+        path = path[index:]
+        swept += 1
+        requests = stats.path_counts.get(path, 0)
+        category = path[len(prefix) :].split("/", 1)[0]
+        for name in set(asset_label_names(data_labels)):
+            fp = false_positives.setdefault(name, FalsePositive(name))
+            fp.assets += 1
+            fp.requests += requests
+            fp.by_category[category] += requests
+    for fp in false_positives.values():
+        fp.per_million = fp.requests / stats.sent * 1_000_000 if stats.sent else 0.0
+    return FuzzReport(
+        run_id=stats.run_id,
+        total_requests=stats.sent,
+        assets_swept=swept,
+        false_positives=sorted(false_positives.values(), key=lambda fp: fp.per_million, reverse=True),
+    )
+
+
+async def sweep_fuzz_assets(apione: ApioneClient, stats: FuzzTrafficStats, **filters) -> FuzzReport:
+    """分页遍历本次运行路径下的 API 资产, 汇总误识别"""
+    assets = []
+    async for api_asset in apione.iter_api_assets(api=f"{FUZZ_PATH_PREFIX}/{stats.run_id}/", **filters):
+        assets.append((api_asset.http_path, api_asset.data_labels))
+    report = build_fuzz_report(stats, assets)
+    log.info(report.summary())
+    return report
+
+
+async def run_negative_fuzz(
+    apione: ApioneClient,
+    http: AsyncHttpClient,
+    factory: NegativePayloadFactory,
+    total_requests: int,
+    rate: float = 500.0,
+    concurrency: int = 64,
+    settle: float = 10.0,
+) -> FuzzReport:
+    """关闭资产自动合并后发送负样本流量, 等待资产入库再遍历资产汇总误识别
+
+    Args:
+        settle: 发送结束后等待资产入库的秒数
+    """
+    async with apione.auto_merge_disabled():
+        stats = await NegativeFuzzer(http, factory, rate=rate, concurrency=concurrency).run(total_requests)
+        await asyncio.sleep(settle)
+        return await sweep_fuzz_assets(apione, stats)
@@ -0,0 +1,288 @@
+"""API 数据标签测试流量计划: 把每个标签的样本按配置的比例放到查询串、请求头、请求体三个位置
+
+每个标签对应一个 API 路径 /data_label_test/<标签 ID>, 同一路径上:
+    - query: 样本 {key: value} 编码为查询参数, 服务端在 start_line 中识别
+    - header: 样本 {key: value} 作为请求头, 服务端在 headers 中识别
+    - body: 全部样本 JSON 序列化后作为 POST 请求体(与原有发送方式一致)
+query/header 每 fields_per_request 个样本一个请求, 避免 URL 与请求头超长;
+只有取值为字符串的 {key: value} 样本能放入 query/header, 请求头还要求 key 是合法的头部名称
+
+默认只发送 body, 与原有发送方式一致; query/header 需通过 mix 显式开启.
+query 样本经 URL 编码后发送, 期望样本是解码后的原值, 开启前须先用探测流量确认
+服务端在 start_line 中返回的是解码后的内容, 否则 query 位置会全部判为未识别
+
+计划按标签惰性生成已编码的请求, 同一请求的重复发送复用同一个对象,
+百万级条目的计划只占用单个标签的内存
+
+发送异常或非 2xx 响应的请求会重试, 重试后仍失败的 (标签, 位置) 记为发送失败,
+expected_data_labels 据此在期望样本中标记 send_failed, 校验时不再计为未识别
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from utils.log_tools.logger_utils import get_logger
+from utils.request_tools.async_http_client import AsyncHttpClient
+
+log = get_logger(__name__)
+
+API_LABEL_PATH_PREFIX = "/data_label_test/"
+PLACEMENTS = ("query", "header", "body")
+# 放置位置与识别结果中位置的对应关系
+PLACEMENT_LOCATIONS = {"query": "start_line", "header": "headers", "body": "body"}
+# 每个位置上单个请求的重复发送次数, 默认只发 body, 沿用原来每个 url 发 5 次
+DEFAULT_PLACEMENT_MIX = {"query": 0, "header": 0, "body": 5}
+FIELDS_PER_REQUEST = 20
+
+JSON_HEADERS = ((b"content-type", b"application/json;charset=utf-8"),)
+_HEADER_NAME = re.compile(r"^[!#$%&'*+\-.^_`|~0-9A-Za-z]+$")
+
+
+class PlannedRequest(NamedTuple):
+    """已编码的单个请求"""
+
+    data_label_id: str
+    placement: str
+    method: str
+    url: str
+    headers: Tuple[Tuple[bytes, bytes], ...]
+    content: bytes
+
+
+def _pairs(body: Optional[List[Any]]) -> List[Tuple[str, str]]:
+    """样本中取值为字符串的 (key, value)"""
+    return [
+        (str(key), value)
+        for item in body or ()
+        if isinstance(item, dict)
+        for key, value in item.items()
+        if isinstance(value, str)
+    ]
+
+
+def placement_pairs(data_label: Dict[str, Any], placement: str) -> List[Tuple[str, str]]:
+    """可放入 query/header 的样本"""
+    pairs = _pairs(data_label.get("body"))
+    if placement == "header":
+        return [(key, value) for key, value in pairs if _HEADER_NAME.match(key)]
+    return pairs
+
+
+class TrafficPlan:
+    """惰性生成的 API 测试流量计划
+
+    Args:
+        data_labels: LabelDataset.spec_data_labels 选出的 API 数据标签, 计划可多次遍历
+        mix: {放置位置: 重复次数}, 位置为 query/header/body, 次数为 0 或缺省表示不使用该位置
+        fields_per_request: query/header 单个请求携带的样本数
+        path_prefix: API 路径前缀, 校验阶段按 前缀 + 标签 ID 查询资产
+    """
+
+    def __init__(
+        self,
+        data_labels: Sequence[Dict[str, Any]],
+        mix: Optional[Mapping[str, int]] = None,
+        fields_per_request: int = FIELDS_PER_REQUEST,
+        path_prefix: str = API_LABEL_PATH_PREFIX,
+    ):
+        mix = dict(DEFAULT_PLACEMENT_MIX if mix is None else mix)
+        unknown = set(mix) - set(PLACEMENTS)
+        if unknown:
+            raise ValueError(f"未知的放置位置: {sorted(unknown)}, 可选 {PLACEMENTS}")
+        if any(weight < 0 for weight in mix.values()):
+            raise ValueError(f"重复次数不能为负数: {mix}")
+        if fields_per_request < 1:
+            raise ValueError(f"fields_per_request 须大于 0: {fields_per_request}")
+        self.data_labels = data_labels
+        self.mix = {placement: mix.get(placement, 0) for placement in PLACEMENTS}
+        self.fields_per_request = fields_per_request
+        self.path_prefix = path_prefix
+
+    def _chunks(self, pairs: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        size = self.fields_per_request
+        return [pairs[start : start + size] for start in range(0, len(pairs), size)]
+
+    def _encode(self, data_label: Dict[str, Any]) -> Dict[str, List[PlannedRequest]]:
+        """单个标签在各位置上的去重请求"""
+        data_label_id = data_label["id"]
+        path = self.path_prefix + data_label_id
+        requests: Dict[str, List[PlannedRequest]] = {}
+        if self.mix["query"]:
+            requests["query"] = [
+                PlannedRequest(data_label_id, "query", "GET", f"{path}?{urlencode(chunk)}", (), b"")
+                for chunk in self._chunks(placement_pairs(data_label, "query"))
+            ]
+        if self.mix["header"]:
+            requests["header"] = [
+                PlannedRequest(
+                    data_label_id,
+                    "header",
+                    "GET",
+                    path,
+                    tuple((key.encode("ascii"), value.encode("utf-8")) for key, value in chunk),
+                    b"",
+                )
+                for chunk in self._chunks(placement_pairs(data_label, "header"))
+            ]
+        if self.mix["body"] and data_label.get("body"):
+            requests["body"] = [
+                PlannedRequest(
+                    data_label_id,
+                    "body",
+                    "POST",
+                    path,
+                    JSON_HEADERS,
+                    json.dumps(data_label["body"], ensure_ascii=False).encode("utf-8"),
+                )
+            ]
+        return requests
+
+    def __iter__(self) -> Iterator[PlannedRequest]:
+        """逐个标签编码, 同一标签的各位置轮流重复, 直到各自的重复次数用完"""
+        rounds = max(self.mix.values(), default=0)
+        for data_label in self.data_labels:
+            requests = self._encode(data_label)
+            for round_index in range(rounds):
+                for placement, placed in requests.items():
+                    if round_index < self.mix[placement]:
+                        yield from placed
+
+    def counts(self) -> Counter:
+        """各位置的请求总数(含重复), 只统计样本数不编码请求"""
+        counts: Counter = Counter()
+        for data_label in self.data_labels:
+            for placement in ("query", "header"):
+                if self.mix[placement]:
+                    chunks = -(-len(placement_pairs(data_label, placement)) // self.fields_per_request)
+                    counts[placement] += chunks * self.mix[placement]
+            if self.mix["body"] and data_label.get("body"):
+                counts["body"] += self.mix["body"]
+        return counts
+
+    def __len__(self) -> int:
+        return sum(self.counts().values())
+
+    def expected_data_label(
+        self, data_label: Dict[str, Any], failed_placements: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """按计划补全各位置的期望样本, 供 compare_api_label 在 start_line/headers/body 上评分
+
+        failed_placements 中的位置发送失败, 对应的识别位置记入 send_failed
+        """
+        expected = dict(data_label)
+        for placement in ("query", "header"):
+            expected[PLACEMENT_LOCATIONS[placement]] = (
+                [{key: value} for key, value in placement_pairs(data_label, placement)]
+                if self.mix[placement]
+                else []
+            )
+        expected["body"] = list(data_label.get("body") or []) if self.mix["body"] else []
+        send_failed = [PLACEMENT_LOCATIONS[placement] for placement in PLACEMENTS if placement in failed_placements]
+        if send_failed:
+            expected["send_failed"] = send_failed
+        return expected
+
+    def expected_data_labels(self, failed: Optional[Mapping[Tuple[str, str], int]] = None) -> List[Dict[str, Any]]:
+        """
+        Args:
+            failed: send_traffic_plan 返回的 {(标签 ID, 放置位置): 失败请求数}
+        """
+        failed = failed or {}
+        return [
+            self.expected_data_label(
+                data_label, [placement for placement in PLACEMENTS if (data_label["id"], placement) in failed]
+            )
+            for data_label in self.data_labels
+        ]
+
+
+class TrafficSendResult(NamedTuple):
+    """流量计划的发送结果"""
+
+    # {最终状态码: 请求数}, 重试后仍异常的计为 "error"
+    status_codes: Counter
+    # {(标签 ID, 放置位置): 重试后仍失败的请求数}
+    failed: Counter
+
+
+async def send_traffic_plan(
+    http: AsyncHttpClient,
+    plan: Iterable[PlannedRequest],
+    concurrency: int = 32,
+    rate: Optional[float] = None,
+    max_retries: int = 3,
+    retry_interval: float = 1.0,
+) -> TrafficSendResult:
+    """并发发送流量计划, concurrency 个协程共享同一个惰性迭代器, 不预先展开计划
+
+    与 AsyncHttpClient.request 一致, 发送异常与非 2xx 响应按 retry_interval 线性退避重试 max_retries 次
+
+    Args:
+        rate: 目标速率(请求/秒), 为空时不限速, 重试不占用速率配额
+
+    Returns:
+        TrafficSendResult: 各最终状态码的请求数, 以及重试后仍失败的 (标签, 位置)
+    """
+    if rate is not None and rate <= 0:
+        raise ValueError(f"目标速率须大于 0: {rate}")
+    requests = iter(plan)
+    status_codes: Counter = Counter()
+    failed: Counter = Counter()
+    started = time.perf_counter()
+    scheduled = 0
+
+    async def send():
+        nonlocal scheduled
+        for request in requests:
+            if rate is not None:
+                # 按发送序号计算计划发送时间, 领先节拍 1ms 以上才休眠
+                delay = started + scheduled / rate - time.perf_counter()
+                scheduled += 1
+                if delay > 0.001:
+                    await asyncio.sleep(delay)
+            status = await _send_with_retry(http, request, max_retries, retry_interval)
+            status_codes[status] += 1
+            if not _is_success(status):
+                failed[(request.data_label_id, request.placement)] += 1
+
+    await asyncio.gather(*(send() for _ in range(concurrency)))
+    total = sum(status_codes.values())
+    elapsed = time.perf_counter() - started
+    log.info(f"流量计划发送完成: {total} 个请求, 耗时 {elapsed:.2f}s, 状态码 {dict(status_codes)}")
+    if failed:
+        log.error(
+            f"{sum(failed.values())} 个请求重试后仍发送失败, 涉及 {len({key[0] for key in failed})} 个标签: "
+            f"{dict(failed.most_common(10))}"
+        )
+    return TrafficSendResult(status_codes, failed)
+
+
+def _is_success(status: Any) -> bool:
+    return isinstance(status, int) and 200 <= status < 300
+
+
+async def _send_with_retry(
+    http: AsyncHttpClient, request: PlannedRequest, max_retries: int, retry_interval: float
+) -> Any:
+    """发送单个请求并返回最终状态码, 重试后仍异常时为 "error", 仍为非 2xx 时为最后一次的状态码"""
+    status: Any = None
+    for attempt in range(max_retries + 1):
+        try:
+            # query/header 请求的 headers 为空元组, 不带 JSON content-type
+            status = await http.send_raw(request.method, request.url, request.content, headers=request.headers)
+            error = f"状态码 {status}"
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+        if _is_success(status):
+            return status
+        if attempt < max_retries:
+            log.warning(f"{request.method} {request.url} 发送失败({error}), 第 {attempt + 1} 次重试")
+            await asyncio.sleep(retry_interval * (attempt + 1))
+        else:
+            log.error(f"{request.method} {request.url} 重试 {max_retries} 次后仍发送失败: {error}")
+    return status
@@ -1,5 +1,3 @@
-import asyncssh
-
 class AsyncSSHClient:
     def __init__(self, host, username, password):
         self.host = host
@@ -9,6 +7,9 @@ class AsyncSSHClient:
 
     async def connect(self):
         """异步连接SSH"""
+        # asyncssh 导入耗时约 0.1s, 只在真正连接时导入
+        import asyncssh
+
         self.client = await asyncssh.connect(
             host=self.host,
             username=self.username,